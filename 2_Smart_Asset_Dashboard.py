@@ -2,27 +2,41 @@
 
 import streamlit as st
 import pandas as pd
-from pathlib import Path
+
+import asset_data
+import jobs
+import perf
+from auth import current_user
+from table_view import render_export, render_table
+from asset_picker import render_picker
+from asset_summary import render_summary
+from build_pages_and_qr import OUTPUT_PAGES, asset_codes, qr_url
+from qr_render import qr_image
+from build_labels_pdf import LABELS_PER_PAGE
 
 # =========================
 # การตั้งค่าไฟล์หลัก
 # =========================
-BASE_DIR = Path(__file__).resolve().parent.parent  # โฟลเดอร์ SmartAsset_QR_App_ready
-EXCEL_PATH = BASE_DIR / "Smart Asset Lab.xlsx"
+BASE_DIR = asset_data.BASE_DIR  # โฟลเดอร์ SmartAsset_QR_App_ready
+EXCEL_PATH = asset_data.EXCEL_PATH
 QRCODE_DIR = BASE_DIR / "qrcodes"                 # โฟลเดอร์เก็บรูป QR (.png)
+PAGES_OUT_DIR = BASE_DIR / OUTPUT_PAGES           # หน้า HTML ต่อรายการ (เหมือนรัน build_pages_and_qr.py)
 
 st.set_page_config(page_title="Smart Asset Dashboard", page_icon="📊", layout="wide")
+perf.begin("dashboard")
+perf.render_panel()
 
 st.markdown("## 📊 Dashboard ครุภัณฑ์ & แบบฟอร์มแก้ไขข้อมูล")
 
 # =========================
-# โหลดข้อมูลจาก Excel
+# โหลดข้อมูล (ฐานข้อมูลกลาง นำเข้าจาก Excel อัตโนมัติครั้งแรก)
 # =========================
-if not EXCEL_PATH.exists():
-    st.error(f"ไม่พบไฟล์ Excel: {EXCEL_PATH.name}")
-    st.stop()
-
-df = pd.read_excel(EXCEL_PATH).dropna(how="all").reset_index(drop=True)
+try:
+    with perf.timer("load"):
+        df = asset_data.load_data()
+except FileNotFoundError as e:
+    st.error(str(e))
+    perf.stop()
 
 # คอลัมน์ที่ใช้หลัก ๆ
 COL_NAME = "ชื่อ"
@@ -30,21 +44,109 @@ COL_CODE = "รหัสเครื่องมือห้องปฏิบ
 COL_ASSET = "AssetID"
 COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
 COL_OWNER = "ผู้รับผิดชอบ (ปัจจุบัน)"
+COL_STATUS = "สถานะ"
+
+BULK_MAX_ROWS = 2000   # จำนวนแถวสูงสุดในตารางแก้ไขหลายรายการ
+
+# =========================
+# สรุปภาพรวม (นับไว้ต่อ snapshot ของข้อมูล ปรับทีละแถวเมื่อบันทึก)
+# =========================
+with st.expander("📈 สรุปภาพรวม", expanded=True):
+    with perf.timer("summary"):
+        render_summary(asset_data.load_summary(), QRCODE_DIR)
 
 # =========================
 # ตารางข้อมูลทั้งหมด
 # =========================
 with st.expander("📋 ตารางข้อมูลครุภัณฑ์ทั้งหมด", expanded=True):
     search = st.text_input("🔍 ค้นหาจากชื่อ / รหัส / AssetID", "")
+    hits = None
     if search:
-        mask = (
-            df[COL_NAME].astype(str).str.contains(search, case=False, na=False) |
-            df[COL_CODE].astype(str).str.contains(search, case=False, na=False) |
-            df[COL_ASSET].astype(str).str.contains(search, case=False, na=False)
+        # ดัชนี n-gram (ชื่อ / รหัส / AssetID) คืนตำแหน่งแถวเรียงตามความตรง
+        with perf.timer("search"):
+            hits = asset_data.load_search().search(search)
+    # ส่งเฉพาะหน้าปัจจุบัน + คอลัมน์ที่เลือกไปเบราว์เซอร์
+    with perf.timer("table"):
+        render_table(
+            df, hits, key="dash_table", filter_key=search, height=300,
+            columns=[COL_CODE, COL_ASSET, COL_NAME, COL_LOC, COL_OWNER],
         )
-        st.dataframe(df[mask], use_container_width=True, height=300)
-    else:
-        st.dataframe(df, use_container_width=True, height=300)
+    # ส่งออกผลค้นหา (ตามคอลัมน์/ลำดับของตาราง) สร้างไฟล์ตอนกดปุ่มเท่านั้น
+    render_export(df, hits, key="dash_table", file_stem="smart_asset_search" if search else "smart_asset_all")
+
+# =========================
+# แก้ไขหลายรายการพร้อมกัน (ตาราง)
+# =========================
+with st.expander("🧮 แก้ไขหลายรายการพร้อมกัน (ตาราง)"):
+    bulk_pos = list(range(len(df))) if hits is None else list(hits)
+    st.caption(
+        "แก้ในตารางได้หลายช่อง แล้วกดบันทึกครั้งเดียว (ใช้รายการจากผลการค้นหาด้านบน ถ้าไม่ได้ค้นหาจะใช้ทั้งหมด)"
+    )
+    bulk_cols = st.multiselect(
+        "คอลัมน์ที่จะแก้",
+        list(df.columns),
+        default=[c for c in (COL_LOC, COL_OWNER, COL_STATUS) if c in df.columns],
+        key="bulk_cols",
+    )
+    if len(bulk_pos) > BULK_MAX_ROWS:
+        st.warning(f"มี {len(bulk_pos):,} รายการ แสดงในตารางได้ {BULK_MAX_ROWS:,} รายการแรก (ค้นหาเพื่อกรองให้แคบลง)")
+        bulk_pos = bulk_pos[:BULK_MAX_ROWS]
+
+    if st.button(f"📥 เปิดตารางแก้ไข ({len(bulk_pos):,} รายการ)", disabled=not bulk_cols):
+        # เก็บค่าเดิม + _version ตอนเปิดตาราง ไว้เทียบตอนบันทึก
+        show_cols = list(dict.fromkeys([COL_CODE, COL_NAME] + bulk_cols))
+        st.session_state["bulk_base"] = asset_data.editable_frame(df.iloc[bulk_pos][show_cols])
+        st.session_state["bulk_versions"] = asset_data.row_versions(df.index[bulk_pos])
+        st.session_state["bulk_editable"] = list(bulk_cols)
+        st.session_state.pop("bulk_editor", None)
+
+    bulk_base = st.session_state.get("bulk_base")
+    if bulk_base is not None:
+        editable = st.session_state["bulk_editable"]
+        edited = st.data_editor(
+            bulk_base,
+            key="bulk_editor",
+            disabled=[c for c in bulk_base.columns if c not in editable],
+            num_rows="fixed",
+            use_container_width=True,
+        )
+        with perf.timer("diff"):
+            changes = asset_data.diff_frames(bulk_base[editable], edited[editable])
+        n_cells = sum(len(v) for v in changes.values())
+
+        m1, m2 = st.columns(2)
+        m1.metric("แถวที่เปลี่ยน", f"{len(changes):,}")
+        m2.metric("ช่องที่เปลี่ยน", f"{n_cells:,}")
+        if changes:
+            preview = pd.DataFrame(
+                [
+                    {"รหัส": bulk_base.at[rowid, COL_CODE], "คอลัมน์": col,
+                     "เดิม": bulk_base.at[rowid, col], "ใหม่": new}
+                    for rowid, values in changes.items() for col, new in values.items()
+                ][:500]
+            ).astype(str)
+            st.dataframe(preview, hide_index=True, use_container_width=True, height=200)
+
+        b1, b2 = st.columns(2)
+        with b1:
+            bulk_save = st.button(f"💾 บันทึก {len(changes):,} แถว", disabled=not changes, type="primary")
+        with b2:
+            bulk_close = st.button("ปิดตาราง (ไม่บันทึก)")
+
+        if bulk_save:
+            # ทุกแถวเขียนใน transaction เดียวผ่าน writer
+            with perf.timer("save"):
+                result = asset_data.save_rows(
+                    changes, bulk_base[editable], st.session_state["bulk_versions"], user=current_user()
+                )
+                df = asset_data.load_data()   # ข้อมูลกลางชุดใหม่หลังบันทึก
+            if result["saved"]:
+                st.success(f"บันทึก {len(result['saved']):,} แถวเรียบร้อยแล้ว ✅")
+            for rowid, message in result["conflicts"].items():
+                st.error(f"{bulk_base.at[rowid, COL_CODE]}: {message}")
+        if bulk_save or bulk_close:
+            for k in ("bulk_base", "bulk_versions", "bulk_editable", "bulk_editor"):
+                st.session_state.pop(k, None)
 
 # =========================
 # เลือกอุปกรณ์สำหรับแก้ไข
@@ -53,20 +155,22 @@ st.markdown("### เลือกอุปกรณ์เพื่อแก้ไ
 
 if df.empty:
     st.warning("ยังไม่มีข้อมูลในไฟล์ Excel")
-    st.stop()
+    perf.stop()
 
-# list ให้เลือก: "LAB-AS-001 - ชื่ออุปกรณ์"
-options = [
-    f"{row[COL_CODE]} - {row[COL_NAME]}"
-    for _, row in df.iterrows()
-]
+# พิมพ์ต้นรหัส/ชื่อ แล้วเลือกจากรายการที่ตรงที่สุด (ส่งไปเบราว์เซอร์แค่ไม่กี่ตัวเลือก ไม่ใช่ทุกแถว)
+with perf.timer("picker"):
+    row_idx = render_picker(
+        df, asset_data.load_picker(), asset_data.load_search(), "เลือกจากรหัส/ชื่อ", key="dash_pick"
+    )
 
-selected = st.selectbox("เลือกจากรหัส/ชื่อ", options)
+with perf.timer("lookup"):
+    dup_codes = asset_data.load_index().duplicates()
+if dup_codes:
+    st.warning("พบรหัสซ้ำในไฟล์ Excel: " + ", ".join(f"`{c}`" for c in dup_codes))
 
-# หา index ของแถวที่เลือก
-selected_code = selected.split(" - ")[0]
-row_idx = df[df[COL_CODE] == selected_code].index[0]
-row = df.loc[row_idx]
+if row_idx is None:
+    perf.stop()
+row = df.iloc[row_idx]
 
 # =========================
 # ฟอร์มแก้ไขข้อมูล
@@ -87,21 +191,28 @@ with st.form("edit_form"):
 
     submitted = st.form_submit_button("💾 บันทึกข้อมูล")
 
+# ภาพของแถวตอนที่ผู้ใช้เปิดฟอร์มครั้งก่อน (ใช้ตรวจว่ามีคนอื่นแก้แถวนี้ไปก่อนหรือไม่)
+base_key = f"dash_edit_base_{df.index[row_idx]}"
+prev_base = st.session_state.get(base_key)
+
 if submitted:
-    # อัปเดตค่าลง DataFrame
-    df.at[row_idx, COL_NAME] = new_name
-    df.at[row_idx, COL_ASSET] = new_asset
-    df.at[row_idx, COL_CODE] = new_code
-    df.at[row_idx, COL_LOC] = new_loc
-    df.at[row_idx, COL_OWNER] = new_owner
-
-    # เขียนกลับลง Excel (เขียนทั้งชีต)
+    # อัปเดตค่าลง DataFrame แล้ว UPDATE เฉพาะแถวนี้ในฐานข้อมูล
     try:
-        df.to_excel(EXCEL_PATH, index=False)
+        with perf.timer("save"):
+            asset_data.save_row(df, row_idx, {
+                COL_NAME: new_name,
+                COL_ASSET: new_asset,
+                COL_CODE: new_code,
+                COL_LOC: new_loc,
+                COL_OWNER: new_owner,
+            }, base=prev_base, user=current_user())
+            df = asset_data.load_data()   # ข้อมูลกลางชุดใหม่หลังบันทึก
         st.success("บันทึกข้อมูลเรียบร้อยแล้ว ✅")
     except Exception as e:
         st.error(f"บันทึกไม่สำเร็จ: {e}")
 
+st.session_state[base_key] = asset_data.edit_base(df, row_idx)
+
 # ใช้ code ล่าสุด (เผื่อผู้ใช้แก้ในฟอร์ม)
 current_code = new_code if submitted else str(row.get(COL_CODE, ""))
 
@@ -111,25 +222,120 @@ current_code = new_code if submitted else str(row.get(COL_CODE, ""))
 st.markdown("---")
 st.markdown("### 📇 QR Code ที่ใช้ในการแสดงข้อมูล")
 
-qr_path = QRCODE_DIR / f"{current_code}.png"
+# ลิงก์เดียวกับที่ build_pages_and_qr.py / ป้ายพิมพ์ใช้ (QR บนจอตรงกับ QR ที่ติดเครื่อง)
+detail_url = qr_url(current_code)
 
 col_qr, col_info = st.columns([1, 2])
 
 with col_qr:
-    if qr_path.exists():
-        st.image(str(qr_path), caption=f"QR ของรหัส {current_code}", use_column_width=True)
+    if current_code:
+        # ใช้ไฟล์ใน qrcodes/ ถ้ายังตรงกับลิงก์ ไม่งั้นสร้างใหม่ในหน่วยความจำ
+        with perf.timer("image"):
+            qr_img, qr_source = qr_image(current_code, detail_url, QRCODE_DIR,
+                                         write_back=st.session_state.get("qr_write_back", False))
+        st.image(qr_img, caption=f"QR ของรหัส {current_code}", use_column_width=True)
+        if qr_source == "memory":
+            st.caption("สร้าง QR จากลิงก์ปัจจุบัน (ไฟล์ใน qrcodes ไม่มีหรือไม่ตรงกับลิงก์)")
+        st.checkbox("บันทึกไฟล์ QR ลงโฟลเดอร์ qrcodes ด้วย", key="qr_write_back")
     else:
-        st.warning(f"ไม่พบไฟล์ QR: {qr_path.name} ในโฟลเดอร์ qrcodes")
+        st.warning("รายการนี้ยังไม่มีรหัสเครื่องมือ")
 
 with col_info:
     st.markdown("#### 🔗 ลิงก์สำหรับสแกนดูข้อมูลครุภัณฑ์")
 
-    # 👉 TODO: เปลี่ยน BASE_URL เป็น URL จริงหลังจาก deploy
-    BASE_URL = "https://gpqgy3cvkjoblhckidqhaf.streamlit.app/"  # แก้เป็น URL ที่ใช้จริง
-    detail_url = f"{BASE_URL}/?code={current_code}"
-
     st.code(detail_url, language="text")
     st.caption(
-        "เวลาสร้าง QR ใหม่ สามารถใช้ลิงก์นี้เป็นเนื้อหาใน QR ได้ "
-        "(เปลี่ยน BASE_URL ให้ตรงกับ URL ของระบบที่ deploy จริง)"
+        "ลิงก์นี้คือเนื้อหาใน QR "
+        "(แก้ STREAMLIT_URL / BASE_URL ใน build_pages_and_qr.py ให้ตรงกับ URL ของระบบที่ deploy จริง)"
     )
+
+# =========================
+# 🖨 ป้าย QR สำหรับพิมพ์ (A4 3×8)
+# =========================
+st.markdown("---")
+st.markdown("### 🖨 ป้าย QR สำหรับพิมพ์ (A4 3×8)")
+
+locations = sorted(df[COL_LOC].dropna().astype(str).str.strip().unique())
+col_scope, col_loc, col_start = st.columns(3)
+with col_scope:
+    label_scope = st.radio("พิมพ์รายการ", ["ทั้งหมด", "ตามสถานที่ใช้งาน", "ผลการค้นหาด้านบน"])
+with col_loc:
+    label_loc = st.selectbox("สถานที่ใช้งาน", locations, disabled=label_scope != "ตามสถานที่ใช้งาน")
+with col_start:
+    label_start = st.number_input(
+        f"เริ่มที่ช่อง (0–{LABELS_PER_PAGE - 1}) สำหรับแผ่นที่ใช้ไปแล้วบางส่วน",
+        min_value=0, max_value=LABELS_PER_PAGE - 1, value=0,
+    )
+
+if st.button("สร้าง PDF ป้าย QR"):
+    label_codes, label_location = None, None
+    if label_scope == "ตามสถานที่ใช้งาน":
+        label_location = label_loc
+    elif label_scope == "ผลการค้นหาด้านบน":
+        label_codes = df.iloc[hits][COL_CODE].tolist() if hits is not None else []
+
+    # สร้าง PDF เป็นงานเบื้องหลัง (ไม่บล็อกหน้า) ดาวน์โหลดได้จากแผงงานด้านล่างเมื่อเสร็จ
+    scope = label_location or ("ผลการค้นหา" if label_codes is not None else "ทั้งหมด")
+    jobs.track(jobs.submit(
+        "labels", jobs.labels_job, label_codes, label_location, label_start,
+        label=f"PDF ป้าย QR ({scope})", user=current_user(),
+    ))
+
+# =========================
+# ⚙️ สร้าง QR / หน้า HTML (งานเบื้องหลัง)
+# =========================
+st.markdown("---")
+st.markdown("### ⚙️ สร้างไฟล์ QR / หน้า HTML")
+st.caption("งานทำเบื้องหลัง เปลี่ยนหน้าหรือรีเฟรชได้ งานยังทำต่อ (กลับมาดูสถานะได้ที่นี่)")
+
+col_qr_scope, col_qr_btn, col_pages_btn = st.columns([2, 1, 1])
+with col_qr_scope:
+    qr_scope = st.radio("สร้าง QR ของ", ["ผลการค้นหาด้านบน", "ทั้งหมด"], horizontal=True,
+                        disabled=hits is None, index=0 if hits is not None else 1)
+with col_qr_btn:
+    if st.button("🔳 สร้าง QR"):
+        qr_codes = asset_codes(df.iloc[hits] if hits is not None and qr_scope == "ผลการค้นหาด้านบน" else df)
+        jobs.track(jobs.submit("qr", jobs.qr_job, qr_codes, QRCODE_DIR, label=f"QR {len(qr_codes):,} รายการ",
+                               user=current_user()))
+with col_pages_btn:
+    if st.button("🌐 สร้างหน้า HTML"):
+        jobs.track(jobs.submit("pages", jobs.pages_job, PAGES_OUT_DIR, label="หน้า HTML ทั้งหมด",
+                               user=current_user()))
+
+jobs.render_jobs()
+
+# =========================
+# 🕘 ข้อมูล ณ วันที่ย้อนหลัง (จากประวัติการแก้ไข)
+# =========================
+st.markdown("---")
+with st.expander("🕘 ข้อมูล ณ วันที่ย้อนหลัง"):
+    as_of = st.date_input("สภาพข้อมูล ณ สิ้นวันที่", value=None, key="as_of_date")
+    if as_of is not None:
+        try:
+            # ย้อนเฉพาะรายการในประวัติหลังวันที่เลือก ไม่อ่านประวัติทั้งหมด
+            with perf.timer("history"):
+                past = asset_data.state_as_of(as_of)
+        except ValueError as e:
+            st.warning(str(e))
+        else:
+            common = past.index.intersection(df.index)
+            changed = asset_data.diff_frames(past.loc[common], df.loc[common])
+            added = df.index.difference(past.index)
+            removed = past.index.difference(df.index)
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("จำนวนรายการ ณ วันนั้น", f"{len(past):,}")
+            m2.metric("ถูกแก้หลังจากนั้น", f"{len(changed):,}")
+            m3.metric("เพิ่มหลังจากนั้น", f"{len(added):,}")
+            m4.metric("ลบหลังจากนั้น", f"{len(removed):,}")
+            differs = past.loc[past.index.isin(list(changed)) | past.index.isin(removed)]
+            if len(differs):
+                st.caption("ค่าของรายการที่ต่างจากปัจจุบัน ณ วันที่เลือก")
+                st.dataframe(differs.head(BULK_MAX_ROWS), hide_index=True, use_container_width=True)
+            st.download_button(
+                f"⬇️ ดาวน์โหลดข้อมูล ณ {as_of:%Y-%m-%d} (CSV)",
+                data=past.to_csv(index=False).encode("utf-8-sig"),
+                file_name=f"smart_asset_{as_of:%Y%m%d}.csv",
+                mime="text/csv",
+            )
+
+perf.end()
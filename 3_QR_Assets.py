@@ -1,39 +1,51 @@
 import streamlit as st
-import pandas as pd
-import os
 
-EXCEL_PATH = "Smart Asset Lab.xlsx"
+import asset_data
+import perf
+from auth import current_user
+from asset_search import SEARCH_COLUMNS_ALL
+from table_view import render_table
+from asset_picker import render_picker
 
 st.set_page_config(page_title="QR Assets", page_icon="📁", layout="wide")
 st.title("📁 จัดการข้อมูลครุภัณฑ์ (QR Assets)")
+perf.begin("qr_assets")
+perf.render_panel()
 
-# โหลดข้อมูล
-@st.cache_data
+# โหลดข้อมูล (ชุดเดียวกับหน้าอื่นและทุก session ไม่คัดลอก ห้ามแก้ในที่)
+@perf.timed("load")
 def load_data():
-    df = pd.read_excel(EXCEL_PATH).fillna("")
-    return df
+    return asset_data.load_data()
 
 df = load_data()
 
 # ค้นหา
 search = st.text_input("🔍 ค้นหารหัสเครื่องมือ / AssetID / ชื่ออุปกรณ์")
+hits = None
 if search:
-    results = df[
-        df.apply(lambda row: search.lower() in str(row).lower(), axis=1)
-    ]
-else:
-    results = df.copy()
+    # ดัชนี n-gram ของทุกช่องข้อมูลหลัก คืนตำแหน่งแถวเรียงตามความตรง
+    with perf.timer("search"):
+        hits = asset_data.load_search(SEARCH_COLUMNS_ALL).search(search)
 
-st.dataframe(results, use_container_width=True)
+# ตารางแบบแบ่งหน้า (ไม่คัดลอก/ส่งทั้งตาราง)
+with perf.timer("table"):
+    render_table(df, hits, key="qr_table", filter_key=search, columns=SEARCH_COLUMNS_ALL)
 
-# เลือกอุปกรณ์เพื่อแก้ไข
-selected = st.selectbox(
-    "เลือกอุปกรณ์เพื่อแก้ไข",
-    options=results.index,
-    format_func=lambda x: f"{df.at[x, 'รหัสเครื่องมือห้องปฏิบัติการ']} - {df.at[x, 'ชื่อ']}"
-)
+if hits is not None and not len(hits):
+    st.info("ไม่พบข้อมูลที่ตรงกับคำค้น")
+    perf.stop()
 
-item = df.loc[selected]
+# เลือกอุปกรณ์เพื่อแก้ไข (พิมพ์ต้นรหัส/ชื่อ เลือกได้เฉพาะในผลค้นหาด้านบน ถ้ามี)
+with perf.timer("picker"):
+    pos = render_picker(
+        df, asset_data.load_picker(), asset_data.load_search(SEARCH_COLUMNS_ALL),
+        "เลือกอุปกรณ์เพื่อแก้ไข", key="qr_pick", within=hits,
+    )
+if pos is None:
+    perf.stop()
+selected = df.index[pos]
+
+item = df.iloc[pos].fillna("")   # สำเนาเฉพาะแถวที่กำลังแก้
 
 st.subheader("✏️ แบบฟอร์มแก้ไขข้อมูล")
 col1, col2 = st.columns(2)
@@ -47,13 +59,28 @@ with col2:
     location = st.text_input("สถานที่ใช้งาน (ปัจจุบัน)", item["สถานที่ใช้งาน (ปัจจุบัน)"])
     owner = st.text_input("ผู้รับผิดชอบ (ปัจจุบัน)", item["ผู้รับผิดชอบ (ปัจจุบัน)"])
 
+# ภาพของแถวตอนที่ผู้ใช้เปิดฟอร์มครั้งก่อน (ใช้ตรวจว่ามีคนอื่นแก้แถวนี้ไปก่อนหรือไม่)
+base_key = f"qr_edit_base_{selected}"
+prev_base = st.session_state.get(base_key)
+
 # ปุ่มบันทึก
 if st.button("💾 บันทึกข้อมูล"):
-    df.at[selected, "ชื่อ"] = name
-    df.at[selected, "AssetID"] = asset_id
-    df.at[selected, "รหัสเครื่องมือห้องปฏิบัติการ"] = code
-    df.at[selected, "สถานที่ใช้งาน (ปัจจุบัน)"] = location
-    df.at[selected, "ผู้รับผิดชอบ (ปัจจุบัน)"] = owner
-
-    df.to_excel(EXCEL_PATH, index=False)
-    st.success("บันทึกข้อมูลสำเร็จแล้ว 🎉")
+    try:
+        with perf.timer("save"):
+            asset_data.save_row(df, pos, {
+                "ชื่อ": name,
+                "AssetID": asset_id,
+                "รหัสเครื่องมือห้องปฏิบัติการ": code,
+                "สถานที่ใช้งาน (ปัจจุบัน)": location,
+                "ผู้รับผิดชอบ (ปัจจุบัน)": owner,
+            }, base=prev_base, user=current_user())
+            df = load_data()   # ข้อมูลกลางชุดใหม่หลังบันทึก
+        st.success("บันทึกข้อมูลสำเร็จแล้ว 🎉")
+    except asset_data.ConflictError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"บันทึกไม่สำเร็จ: {e}")
+
+st.session_state[base_key] = asset_data.edit_base(df, pos)
+
+perf.end()
@@ -0,0 +1,120 @@
+# pages/4_Inventory_Audit.py
+
+import streamlit as st
+
+import asset_audit
+import asset_data
+import perf
+from auth import current_user
+from asset_audit import COL_LOC, FOUND, STATUS_LABELS, WRONG_LOCATION
+
+st.set_page_config(page_title="Inventory Audit", page_icon="🧾", layout="wide")
+perf.begin("audit")
+perf.render_panel()
+
+st.markdown("## 🧾 ตรวจนับครุภัณฑ์ (สแกนทั้งห้องแล้วเทียบในครั้งเดียว)")
+
+try:
+    with perf.timer("load"):
+        df = asset_data.load_data()
+except FileNotFoundError as e:
+    st.error(str(e))
+    perf.stop()
+
+SCANS_KEY = "audit_scans"   # รหัสที่สแกนใน session นี้ (ตามลำดับ มีตัวซ้ำได้)
+scans = st.session_state.setdefault(SCANS_KEY, [])
+
+# =========================
+# ห้องที่ตรวจ
+# =========================
+locations = sorted(loc for loc in asset_data.load_summary().counts.get(COL_LOC, {}) if loc)
+location = st.selectbox(
+    "ห้อง / สถานที่ที่ตรวจ", [""] + locations,
+    format_func=lambda x: x or "— ไม่ตรวจสถานที่ (ดูแค่ว่ามีในระบบไหม) —", key="audit_location",
+)
+
+# =========================
+# รับรหัส: สแกนทีละรายการ / วางหลายรายการ / อัปโหลดไฟล์
+# =========================
+col_scan, col_bulk = st.columns(2)
+with col_scan:
+    # เครื่องสแกนพิมพ์รหัสแล้วกด Enter ให้เอง → ส่งฟอร์ม แล้วช่องว่างพร้อมรับรายการถัดไป
+    with st.form("audit_scan_form", clear_on_submit=True):
+        scanned = st.text_input("สแกน / พิมพ์รหัส (หรือ URL ใน QR)")
+        if st.form_submit_button("➕ เพิ่ม") and scanned.strip():
+            scans.extend(asset_audit.parse_codes(scanned))
+with col_bulk:
+    with st.form("audit_bulk_form", clear_on_submit=True):
+        pasted = st.text_area("วางหลายรหัส (บรรทัดละรหัส หรือคั่นด้วยจุลภาค)", height=100)
+        uploaded = st.file_uploader("หรืออัปโหลดไฟล์ .txt / .csv / .xlsx", type=["txt", "csv", "xlsx"])
+        if st.form_submit_button("➕ เพิ่มทั้งหมด"):
+            scans.extend(asset_audit.parse_codes(pasted))
+            if uploaded is not None:
+                try:
+                    scans.extend(asset_audit.read_codes(uploaded, uploaded.name))
+                except ValueError as e:
+                    st.error(f"อ่านไฟล์ {uploaded.name} ไม่ได้: {e}")
+
+c1, c2 = st.columns([3, 1])
+c1.caption(f"สแกนแล้ว {len(scans):,} ครั้ง" + (f" · ล่าสุด: `{scans[-1]}`" if scans else ""))
+if c2.button("🗑️ ล้างรายการสแกน", disabled=not scans):
+    scans.clear()
+    perf.rerun()
+
+if not scans and not location:
+    st.info("เลือกห้องแล้วเริ่มสแกน หรือวาง/อัปโหลดรายการรหัส")
+    perf.stop()
+
+# =========================
+# ผลการตรวจ (merge ทั้งรายการครั้งเดียว)
+# =========================
+with perf.timer("reconcile"):
+    report = asset_audit.reconcile(df, scans, location)
+totals = asset_audit.counts(report)
+
+flash = st.session_state.pop("audit_flash", None)
+if flash:
+    st.success(flash)
+
+cols = st.columns(len(STATUS_LABELS))
+for box, (status, label) in zip(cols, STATUS_LABELS.items()):
+    box.metric(label, f"{totals.get(status, 0):,}")
+
+show = st.multiselect(
+    "แสดงผล", list(STATUS_LABELS), default=[s for s in STATUS_LABELS if s != FOUND],
+    format_func=STATUS_LABELS.get, key="audit_show",
+)
+view = report[report["status"].isin(show)].assign(status=lambda r: r["status"].map(STATUS_LABELS))
+st.dataframe(
+    view.drop(columns="rowid").rename(columns={
+        "code": "รหัส", "status": "ผล", "name": "ชื่อ", "location": "สถานที่ตามระบบ", "scans": "สแกน (ครั้ง)",
+    }),
+    hide_index=True, use_container_width=True, height=min(600, 36 + 35 * max(1, len(view))),
+)
+st.download_button(
+    "⬇️ รายงานการตรวจ (CSV)",
+    data=lambda: report.assign(status=report["status"].map(STATUS_LABELS))
+    .to_csv(index=False).encode("utf-8-sig"),
+    file_name=f"audit_{location or 'all'}.csv",
+    mime="text/csv",
+)
+
+# =========================
+# ย้ายสถานที่ของรายการที่ผิดห้อง (บันทึกครั้งเดียว)
+# =========================
+wrong = totals.get(WRONG_LOCATION, 0)
+if location and wrong:
+    st.markdown("### 📍 ปรับสถานที่")
+    if st.button(f"ย้าย {wrong:,} รายการที่ผิดสถานที่มาที่ “{location}”", type="primary"):
+        with perf.timer("save"):
+            result = asset_audit.relocate(df, report, location, user=current_user())
+        codes = dict(zip(report["rowid"], report["code"]))
+        for rowid, message in result["conflicts"].items():
+            st.error(f"{codes.get(rowid, rowid)}: {message}")
+        if result["saved"] and not result["conflicts"]:
+            st.session_state["audit_flash"] = f"ย้าย {len(result['saved']):,} รายการมาที่ {location} แล้ว ✅"
+            perf.rerun()   # ตรวจใหม่กับข้อมูลชุดหลังบันทึก
+        elif result["saved"]:
+            st.success(f"ย้าย {len(result['saved']):,} รายการมาที่ {location} แล้ว ✅")
+
+perf.end()
@@ -2,6 +2,12 @@ import streamlit as st
 from pathlib import Path
 import pandas as pd
 
+import asset_data
+import image_store
+import perf
+from asset_summary import render_summary
+from auth import current_user
+
 # ==============================
 # ตั้งค่าหน้าแอป
 # ==============================
@@ -14,22 +20,19 @@ st.set_page_config(
 BASE_DIR = Path(__file__).resolve().parent
 PAGES_DIR = BASE_DIR / "pages"
 EXCEL_PATH = BASE_DIR / "Smart Asset Lab.xlsx"
+QRCODE_DIR = BASE_DIR / "qrcodes"
 
 # คอลัมน์หลัก
 COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
-COL_IMAGE = "รูปภาพ"  # คอลัมน์เก็บ path รูปภาพ
-IMAGE_FOLDER = BASE_DIR / "asset_images"  # โฟลเดอร์เก็บรูปใหม่ที่อัปโหลด
+COL_IMAGE = "รูปภาพ"  # คอลัมน์เก็บ path รูปภาพ (รูปใหม่เก็บผ่าน image_store.py ใน asset_images/)
 
 
 # ==============================
-# โหลดข้อมูลจาก Excel (cache ไว้ แต่เคลียร์เมื่อบันทึก)
+# โหลดข้อมูล (จากฐานข้อมูลกลางที่ใช้ร่วมกันทุกหน้า)
 # ==============================
-@st.cache_data
+@perf.timed("load")
 def load_data():
-    if not EXCEL_PATH.exists():
-        raise FileNotFoundError(f"ไม่พบไฟล์ Excel: {EXCEL_PATH.name}")
-    df = pd.read_excel(EXCEL_PATH).dropna(how="all").reset_index(drop=True)
-    return df
+    return asset_data.load_data()
 
 
 # ==============================
@@ -67,6 +70,9 @@ def render_sidebar():
         st.markdown("---")
         st.caption("📂 โฟลเดอร์: SmartAsset_QR_App_ready")
 
+    # เวลาของ rerun ล่าสุด (เฉพาะ admin)
+    perf.render_panel()
+
 
 # ==============================
 # แสดง + แก้ไขรายละเอียดจาก ?code=
@@ -97,14 +103,19 @@ def render_asset_from_query() -> bool:
         st.error(f"ไม่พบคอลัมน์ `{COL_CODE}` ในไฟล์ Excel")
         return True
 
-    # หา row ที่ตรงกับ code
-    match_idx = df[df[COL_CODE].astype(str) == str(code)].index
-    if len(match_idx) == 0:
+    # หา row ที่ตรงกับ code ผ่านดัชนี (ไม่ต้องเทียบทั้งคอลัมน์ทุกครั้งที่สแกน)
+    with perf.timer("lookup"):
+        index = asset_data.load_index()
+        row_idx = index.find_code(code)
+    if row_idx is None:
         st.warning(f"ไม่พบข้อมูลสำหรับรหัส `{code}` ในไฟล์ Excel")
         return True
 
-    row_idx = match_idx[0]
-    row = df.loc[row_idx]
+    dup_rows = index.duplicates().get(str(code).strip())
+    if dup_rows:
+        st.warning(f"รหัส `{code}` ซ้ำกัน {len(dup_rows)} แถวในไฟล์ Excel (แสดงแถวแรก)")
+
+    row = df.iloc[row_idx]
 
     st.markdown("### ข้อมูลจาก Google Sheet / Excel")
 
@@ -133,15 +144,15 @@ def render_asset_from_query() -> bool:
                         key=f"txt_{col_name1}_left",
                     )
 
-                    # แสดงรูปเดิมถ้า path ถูกและไฟล์มีอยู่
-                    if str(val1).strip():
-                        img_path = BASE_DIR / str(val1)
-                        if img_path.exists():
-                            st.image(str(img_path), caption="รูปภาพปัจจุบัน", use_container_width=True)
+                    # แสดงรูปย่อของรูปเดิมถ้า path ถูกและไฟล์มีอยู่ (รูปเต็มกดดูใต้ฟอร์ม)
+                    with perf.timer("image"):
+                        thumb = image_store.thumbnail(val1)
+                    if thumb is not None:
+                        st.image(str(thumb), caption="รูปภาพปัจจุบัน")
 
                     uploaded = st.file_uploader(
                         "อัปโหลดรูปภาพใหม่",
-                        type=["png", "jpg", "jpeg"],
+                        type=["png", "jpg", "jpeg", "webp"],
                         key="upload_image_left",
                     )
                     if uploaded is not None:
@@ -170,14 +181,14 @@ def render_asset_from_query() -> bool:
                             key=f"txt_{col_name2}_right",
                         )
 
-                        if str(val2).strip():
-                            img_path = BASE_DIR / str(val2)
-                            if img_path.exists():
-                                st.image(str(img_path), caption="รูปภาพปัจจุบัน", use_container_width=True)
+                        with perf.timer("image"):
+                            thumb = image_store.thumbnail(val2)
+                        if thumb is not None:
+                            st.image(str(thumb), caption="รูปภาพปัจจุบัน")
 
                         uploaded = st.file_uploader(
                             "อัปโหลดรูปภาพใหม่",
-                            type=["png", "jpg", "jpeg"],
+                            type=["png", "jpg", "jpeg", "webp"],
                             key="upload_image_right",
                         )
                         if uploaded is not None:
@@ -193,37 +204,54 @@ def render_asset_from_query() -> bool:
 
         submitted = st.form_submit_button("💾 บันทึกข้อมูล")
 
-    # ถ้ากดบันทึก → อัปเดต DataFrame แล้วเขียนกลับลง Excel
+    # ภาพของแถวตอนที่ผู้ใช้เปิดฟอร์มครั้งก่อน (ใช้ตรวจว่ามีคนอื่นแก้แถวนี้ไปก่อนหรือไม่)
+    base_key = f"edit_base_{code}"
+    prev_base = st.session_state.get(base_key)
+
+    # ถ้ากดบันทึก → อัปเดต DataFrame แล้วเขียนกลับลงฐานข้อมูล
     if submitted:
         try:
-            # จัดการไฟล์รูปภาพที่อัปโหลด (ถ้ามี)
+            # จัดการไฟล์รูปภาพที่อัปโหลด (ถ้ามี): หมุนตาม EXIF, ย่อ, เข้ารหัสใหม่ + thumbnail
             if uploaded_image_file is not None:
-                IMAGE_FOLDER.mkdir(exist_ok=True)
-                suffix = Path(uploaded_image_file.name).suffix.lower()
-                if suffix not in [".png", ".jpg", ".jpeg"]:
-                    suffix = ".png"
-                img_filename = f"{code}{suffix}"
-                save_path = IMAGE_FOLDER / img_filename
-
-                with open(save_path, "wb") as f:
-                    f.write(uploaded_image_file.getbuffer())
-
                 # เก็บ path แบบ relative ไว้ในคอลัมน์รูปภาพ
-                rel_path = save_path.relative_to(BASE_DIR)
-                new_values[COL_IMAGE] = str(rel_path)
+                with perf.timer("image"):
+                    new_values[COL_IMAGE] = image_store.ingest(uploaded_image_file.getvalue())
 
-            # อัปเดตทุกคอลัมน์ตาม new_values
-            for col_name, val in new_values.items():
-                df.at[row_idx, col_name] = val
+            # อัปเดตทุกคอลัมน์ตาม new_values (UPDATE เฉพาะแถวนี้ในฐานข้อมูล)
+            with perf.timer("save"):
+                asset_data.save_row(df, row_idx, new_values, base=prev_base, user=current_user())
+            df = load_data()   # ข้อมูลกลางชุดใหม่หลังบันทึก
 
-            df.to_excel(EXCEL_PATH, index=False)
-
-            # เคลียร์ cache แล้วโหลดใหม่ให้ข้อมูลอัปเดตทันที
-            load_data.clear()
             st.success("บันทึกข้อมูลเรียบร้อยแล้ว ✅")
         except Exception as e:
             st.error(f"บันทึกไม่สำเร็จ: {e}")
 
+    st.session_state[base_key] = asset_data.edit_base(df, row_idx)
+
+    # รูปเต็มโหลดเฉพาะเมื่อผู้ใช้ขอดู (หน้าสแกนบนมือถือโหลดแค่รูปย่อ)
+    full_image = image_store.resolve(df.iloc[row_idx].get(COL_IMAGE, "")) if COL_IMAGE in df.columns else None
+    if full_image is not None and st.toggle("🔍 ดูรูปภาพขนาดเต็ม", key=f"full_image_{code}"):
+        st.image(str(full_image), use_container_width=True)
+
+    # ประวัติการแก้ไข (อ่านจาก index ตามรหัส ไม่ต้องอ่านประวัติทั้งหมด)
+    with st.expander("🕘 ประวัติการแก้ไข"):
+        with perf.timer("history"):
+            history = asset_data.load_history(df.iloc[row_idx].get(COL_CODE, code))
+        if history.empty:
+            st.caption("ยังไม่มีการแก้ไขรายการนี้")
+        else:
+            st.dataframe(
+                pd.DataFrame({
+                    "เวลา": history["ts"].dt.strftime("%Y-%m-%d %H:%M"),
+                    "ผู้แก้": history["user"].fillna("-"),
+                    "คอลัมน์": history["col"].fillna(history["op"].map({"insert": "(เพิ่มรายการ)", "delete": "(ลบรายการ)"})),
+                    "เดิม": history["old"].astype(str).where(history["old"].notna(), ""),
+                    "ใหม่": history["new"].astype(str).where(history["new"].notna(), ""),
+                }),
+                hide_index=True,
+                use_container_width=True,
+            )
+
     st.info(
         "หน้านี้อ่านข้อมูลจากการสแกน QR โดยดึงทุกคอลัมน์จากแถวใน Google Sheet/Excel "
         "สามารถแก้ไขข้อมูลได้ทุกช่อง และอัปโหลดรูปใหม่ให้แสดงแทนรูปเดิมได้"
@@ -239,6 +267,13 @@ def render_asset_from_query() -> bool:
 def render_overview():
     st.markdown("## ภาพรวมระบบ")
 
+    # ตัวเลขสรุปคำนวณไว้ต่อ snapshot ของข้อมูล (ไม่ groupby ทุก rerun)
+    try:
+        with perf.timer("summary"):
+            render_summary(asset_data.load_summary(), QRCODE_DIR, charts=False)
+    except FileNotFoundError as e:
+        st.warning(str(e))
+
     st.markdown(
         """
 - สร้างหน้า **HTML รายครุภัณฑ์** จากไฟล์ Excel  
@@ -259,6 +294,7 @@ def render_overview():
 # main
 # ==============================
 def main():
+    perf.begin("app")
     render_sidebar()
 
     # ถ้า URL มี ?code=... ให้แสดง + แก้ไขรายละเอียดจาก Excel
@@ -268,6 +304,8 @@ def main():
     if not shown:
         render_overview()
 
+    perf.end()
+
 
 if __name__ == "__main__":
     main()
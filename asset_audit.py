@@ -0,0 +1,191 @@
+# asset_audit.py
+"""ตรวจนับครุภัณฑ์ประจำปี: เทียบรหัสที่สแกนได้ทั้งห้องกับข้อมูลในระบบในครั้งเดียว
+
+    python asset_audit.py scans.txt --location "ห้องปฏิบัติการเทคนิคการแพทย์"            # ดูผล
+    python asset_audit.py scans.xlsx --location "ห้องปฏิบัติการเทคนิคการแพทย์" --apply    # ย้ายสถานที่ของรายการที่ผิดห้อง
+
+- รับรหัสจากข้อความ (คั่นด้วยขึ้นบรรทัด/ช่องว่าง/จุลภาค) ไฟล์ .txt/.csv/.xlsx หรือ URL ใน QR (?code=... / .../<รหัส>.html)
+- reconcile() merge รหัสที่สแกนกับรหัสในระบบครั้งเดียว (ไม่เปิดหน้ารายละเอียดทีละรายการ) แยกผลเป็น
+  พบ / ผิดสถานที่ / ไม่มีในระบบ / ไม่ได้สแกน (อยู่ในห้องนี้ตามระบบแต่ไม่ถูกสแกน)
+- relocate() ย้ายสถานที่ของรายการ "ผิดสถานที่" มาที่ห้องที่ตรวจ ด้วย save_rows ครั้งเดียว (writer เขียนใน transaction เดียว)
+"""
+import argparse
+import re
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import asset_data
+from asset_db import DB_PATH
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_NAME = "ชื่อ"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+
+FOUND, WRONG_LOCATION, UNKNOWN, MISSING = "found", "wrong_location", "unknown", "missing"
+STATUS_LABELS = {
+    WRONG_LOCATION: "⚠️ ผิดสถานที่",
+    UNKNOWN: "❓ ไม่มีในระบบ",
+    MISSING: "❌ ไม่ได้สแกน",
+    FOUND: "✅ พบ",
+}
+STATUS_ORDER = list(STATUS_LABELS)   # ลำดับในรายงาน: เรื่องที่ต้องจัดการก่อน
+
+RESULT_COLUMNS = ["code", "status", "name", "location", "scans", "rowid"]
+
+_SPLIT = re.compile(r"[\s,;]+")
+
+
+def _key(series: pd.Series) -> pd.Series:
+    """รหัสสำหรับเทียบ (ตัดช่องว่าง, ตัวพิมพ์ใหญ่) ค่าว่าง/NaN = "" """
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip().str.upper()
+
+
+def _location(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def code_from_scan(text) -> str:
+    """รหัสจากสิ่งที่เครื่องสแกนอ่านได้: รหัสตรง ๆ หรือ URL ของ QR (?code=LAB-AS-001 / .../LAB-AS-001.html)"""
+    text = str(text).strip()
+    if "://" not in text and not text.startswith("?"):
+        return text
+    url = urlsplit(text)
+    code = parse_qs(url.query).get("code", [""])[0]
+    if code:
+        return code.strip()
+    name = unquote(url.path.rstrip("/").rsplit("/", 1)[-1])
+    return name[:-len(".html")] if name.endswith(".html") else name
+
+
+def parse_codes(text) -> list:
+    """รหัสทั้งหมดในข้อความที่วาง (คั่นด้วยขึ้นบรรทัด/ช่องว่าง/จุลภาค/อัฒภาค) ตามลำดับ ไม่ตัดตัวซ้ำ"""
+    return [c for c in (code_from_scan(t) for t in _SPLIT.split(text or "")) if c]
+
+
+def read_codes(file, name=None) -> list:
+    """รหัสจากไฟล์ .txt / .csv / .xlsx (path หรือไฟล์ที่อัปโหลด) ใช้คอลัมน์รหัสถ้ามี ไม่มีก็ใช้คอลัมน์แรก"""
+    suffix = Path(name or getattr(file, "name", "") or str(file)).suffix.lower()
+    if suffix in (".xlsx", ".xls"):
+        table = pd.read_excel(file, dtype=str)
+    elif suffix == ".csv":
+        table = pd.read_csv(file, dtype=str, encoding="utf-8-sig")
+    else:
+        data = file.read() if hasattr(file, "read") else Path(file).read_bytes()
+        return parse_codes(data.decode("utf-8-sig") if isinstance(data, bytes) else data)
+    if table.empty:
+        return []
+    col = COL_CODE if COL_CODE in table.columns else table.columns[0]
+    return [code_from_scan(c) for c in table[col].dropna() if str(c).strip()]
+
+
+def reconcile(df: pd.DataFrame, scanned, location=None) -> pd.DataFrame:
+    """เทียบรหัสที่สแกน (list ของรหัสหรือ URL ใน QR) กับข้อมูลในระบบ คืนตารางหนึ่งแถวต่อรหัส
+
+    คอลัมน์: code, status, name, location (ตามระบบ), scans (จำนวนครั้งที่สแกน), rowid (ของแถวในระบบ หรือ <NA>)
+    location: ห้องที่ตรวจ ถ้าไม่ระบุจะไม่ตรวจสถานที่ (ไม่มี ผิดสถานที่ / ไม่ได้สแกน)
+    รหัสซ้ำในระบบใช้แถวแรก (เหมือน AssetIndex)
+    """
+    scans = pd.DataFrame({"code": [code_from_scan(c) for c in scanned]})
+    scans["key"] = _key(scans["code"])
+    scans = scans[scans["key"] != ""]
+    scans = scans.groupby("key", sort=False).agg(code=("code", "first"), scans=("code", "size")).reset_index()
+
+    inventory = pd.DataFrame({
+        "key": _key(df[COL_CODE]).to_numpy(),
+        "inv_code": df[COL_CODE].to_numpy(dtype=object),
+        "name": df[COL_NAME].to_numpy(dtype=object) if COL_NAME in df.columns else None,
+        "location": _location(df[COL_LOC]).to_numpy() if COL_LOC in df.columns else "",
+        "rowid": df.index.to_numpy(),
+    })
+    inventory = inventory[inventory["key"] != ""].drop_duplicates("key")
+
+    result = scans.merge(inventory, on="key", how="left", indicator=True)
+    known = (result["_merge"] == "both").to_numpy()
+    room = (location or "").strip()
+    if room:
+        status = np.select([~known, result["location"].to_numpy() != room], [UNKNOWN, WRONG_LOCATION], FOUND)
+        missing = inventory[(inventory["location"] == room) & ~inventory["key"].isin(scans["key"])]
+        missing = missing.assign(code=missing["inv_code"], scans=0, status=MISSING)
+    else:
+        status = np.where(known, FOUND, UNKNOWN)
+        missing = inventory.iloc[:0].assign(code=None, scans=0, status=MISSING)
+    result["status"] = status
+
+    report = pd.concat([result, missing], ignore_index=True)
+    report["rowid"] = report["rowid"].astype("Int64")
+    report["scans"] = report["scans"].astype(int)
+    report["status"] = pd.Categorical(report["status"], categories=STATUS_ORDER, ordered=True)
+    return report.sort_values(["status", "code"], kind="stable", ignore_index=True)[RESULT_COLUMNS]
+
+
+def counts(report: pd.DataFrame) -> dict:
+    """{status: จำนวนรหัส} ครบทุก status"""
+    return {s: int(n) for s, n in report["status"].value_counts(sort=False).items()}
+
+
+def location_changes(report: pd.DataFrame, location) -> dict:
+    """{rowid: {สถานที่: location}} ของรายการที่ผิดสถานที่ (ใช้กับ asset_data.save_rows)"""
+    rowids = report.loc[report["status"] == WRONG_LOCATION, "rowid"].dropna().astype("int64").tolist()
+    return {rowid: {COL_LOC: location} for rowid in rowids}
+
+
+def relocate(df: pd.DataFrame, report: pd.DataFrame, location, versions=None, user=None, db_path=DB_PATH) -> dict:
+    """ย้ายรายการที่ผิดสถานที่ทั้งหมดมาที่ location ในการบันทึกครั้งเดียว
+
+    ค่าเดิมจาก df (ข้อมูลชุดที่ใช้ตรวจ) กับ versions ({rowid: _version} จาก row_versions ตอนโหลด df)
+    ถ้ามีคนแก้สถานที่ของแถวนั้นหลังจากนั้น แถวนั้นจะเป็น conflict ไม่เขียนทับ
+    (versions=None ใช้ _version ล่าสุด ตรวจได้เฉพาะการแก้ที่แทรกระหว่างบันทึก)
+    คืน {"saved": [rowid...], "conflicts": {rowid: ข้อความ}} เหมือน save_rows
+    """
+    changes = location_changes(report, location)
+    if not changes:
+        return {"saved": [], "conflicts": {}}
+    rowids = list(changes)
+    base = df.loc[rowids, [COL_LOC]]
+    if versions is None:
+        versions = asset_data.row_versions(rowids, db_path)
+    return asset_data.save_rows(changes, base, versions, db_path=db_path, user=user)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ตรวจนับครุภัณฑ์: เทียบรหัสที่สแกนกับข้อมูลในระบบ")
+    parser.add_argument("scans", help="ไฟล์รหัสที่สแกน .txt / .csv / .xlsx")
+    parser.add_argument("--location", help="ห้อง/สถานที่ที่ตรวจ (ตามคอลัมน์ สถานที่ใช้งาน)")
+    parser.add_argument("--apply", action="store_true", help="ย้ายสถานที่ของรายการที่ผิดสถานที่มาที่ --location")
+    parser.add_argument("--out", help="บันทึกรายงานเป็น .csv")
+    parser.add_argument("--user", default="audit")
+    parser.add_argument("--db", default=str(DB_PATH))
+    args = parser.parse_args(argv)
+    if args.apply and not args.location:
+        parser.error("--apply ต้องระบุ --location")
+
+    try:
+        codes = read_codes(args.scans)
+        df = asset_data.load_data(args.db)
+        versions = asset_data.row_versions(df.index, args.db)
+    except FileNotFoundError as e:
+        parser.exit(1, f"❌ {e}\n")
+    report = reconcile(df, codes, args.location)
+    totals = counts(report)
+    print(f"สแกน {len(codes):,} ครั้ง ({int((report['scans'] > 0).sum()):,} รหัส)")
+    for status, label in STATUS_LABELS.items():
+        print(f"  {label:<16} {totals.get(status, 0):>6,}")
+    for row in report[report["status"] != FOUND].itertuples(index=False):
+        print(f"  {STATUS_LABELS[row.status]}  {row.code}  {row.name if isinstance(row.name, str) else ''}"
+              f"  [{row.location if isinstance(row.location, str) else ''}]")
+    if args.out:
+        report.assign(status=report["status"].map(STATUS_LABELS)).to_csv(args.out, index=False, encoding="utf-8-sig")
+        print(f"✔ รายงาน → {args.out}")
+
+    if args.apply:
+        result = relocate(df, report, args.location.strip(), versions, user=args.user, db_path=args.db)
+        print(f"✔ ย้าย {len(result['saved']):,} รายการมาที่ {args.location.strip()}")
+        for rowid, message in result["conflicts"].items():
+            print(f"  ⚠️ {rowid}: {message}")
+
+
+if __name__ == "__main__":
+    main()
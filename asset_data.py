@@ -0,0 +1,667 @@
+# asset_data.py
+"""ตัวโหลดข้อมูลครุภัณฑ์ที่ทุกหน้าใช้ร่วมกัน
+
+- ข้อมูลหลักอยู่ในฐานข้อมูล SQLite (ดู asset_db.py) ถ้ายังไม่มีฐานข้อมูล จะนำเข้าจาก Excel ให้อัตโนมัติ
+- การอ่าน Excel (load_excel) เก็บเป็น snapshot (pickle) ไว้ข้างไฟล์ Excel
+  จะ parse Excel ใหม่ก็ต่อเมื่อไฟล์ Excel เปลี่ยนจริง (ตรวจจาก mtime/ขนาด แล้วยืนยันด้วย hash)
+- ข้อมูลจากฐานข้อมูลมีชุดเดียวต่อ process ทุก session อ่านร่วมกัน (ห้ามแก้ในที่)
+  การบันทึกสร้างตารางใหม่ที่คัดลอกเฉพาะคอลัมน์ที่แก้ (copy-on-write) session ที่ถือชุดเดิมอยู่ไม่เห็นการเปลี่ยนกลางคัน
+- ถ้าฐานข้อมูลถูกแบ่งตามคำนำหน้ารหัส (asset_partitions.py) load_data() คืนข้อมูลรวมทุก partition
+  load_row(code) โหลดเฉพาะ partition ของรหัสนั้น และการบันทึกเขียนเฉพาะ partition ของแถวที่แก้
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from asset_db import DB_PATH, HISTORY_COLUMNS, AssetDB, ConflictError, RowEdit, same_value  # noqa: F401 (ConflictError ให้หน้าเว็บ catch)
+from asset_index import AssetIndex
+from asset_partitions import load_map, partition_key
+from asset_picker import PrefixIndex
+from asset_search import SEARCH_COLUMNS, SearchIndex
+from asset_summary import AssetSummary
+from asset_writer import drop_writer, get_writer
+
+BASE_DIR = Path(__file__).resolve().parent
+EXCEL_PATH = BASE_DIR / "Smart Asset Lab.xlsx"
+
+# คอลัมน์หลัก
+COL_NAME = "ชื่อ"
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_ASSET = "AssetID"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+COL_OWNER = "ผู้รับผิดชอบ (ปัจจุบัน)"
+COL_IMAGE = "รูปภาพ"
+
+# dtype ของข้อมูลกลาง: ค่าซ้ำกันมาก → categorical, ข้อความหลัก → Arrow string
+CATEGORY_COLUMNS = (COL_LOC, COL_OWNER)
+STRING_COLUMNS = (COL_NAME, COL_CODE, COL_ASSET)
+try:
+    ARROW_STRING = pd.StringDtype("pyarrow", na_value=np.nan)   # pandas ≥ 2.3 (ค่าเริ่มต้นของ pandas 3)
+except TypeError:
+    ARROW_STRING = pd.StringDtype("pyarrow_numpy")
+
+SNAPSHOT_VERSION = 1
+
+_lock = threading.RLock()
+_excel_memo = {}  # {excel_path: (mtime_ns, size, DataFrame)}
+_store_memo = {}  # {db_path: {"revision", "df" (ใช้ร่วมกันทุก session), "versions": {rowid: int}, "index": AssetIndex|None,
+                  #             "search": {cols: SearchIndex}, "summary": AssetSummary|None, "picker": PrefixIndex|None}}
+                  # ฐานข้อมูลที่แบ่งแล้ว: entry ของข้อมูลรวมมี revision = ((ไฟล์ partition, revision), ...)
+_dbs = {}         # {db_path: AssetDB}
+
+
+def snapshot_paths(excel_path=EXCEL_PATH):
+    """คืน (ไฟล์ snapshot, ไฟล์ meta) ที่วางไว้ข้างไฟล์ Excel"""
+    excel_path = Path(excel_path)
+    return (
+        excel_path.with_name(excel_path.name + ".snapshot.pkl"),
+        excel_path.with_name(excel_path.name + ".snapshot.json"),
+    )
+
+
+def file_hash(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_excel(excel_path=EXCEL_PATH) -> pd.DataFrame:
+    """parse Excel ตรง ๆ (ช้า) — ใช้ตอนสร้าง snapshot เท่านั้น"""
+    return pd.read_excel(excel_path).dropna(how="all").reset_index(drop=True)
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    return meta
+
+
+def _write_atomic(path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _load_snapshot(excel_path, st_mtime_ns, st_size):
+    """โหลด snapshot ถ้ายังตรงกับไฟล์ Excel ไม่งั้น parse ใหม่แล้วเขียน snapshot ทับ"""
+    snap_path, meta_path = snapshot_paths(excel_path)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and snap_path.exists():
+        same_stat = meta.get("mtime_ns") == st_mtime_ns and meta.get("size") == st_size
+        # mtime เปลี่ยนแต่เนื้อหาเหมือนเดิม (เช่น copy/touch) → ใช้ snapshot เดิมได้
+        if same_stat or meta.get("sha256") == file_hash(excel_path):
+            try:
+                df = pd.read_pickle(snap_path)
+            except Exception:
+                df = None
+            if df is not None:
+                if not same_stat:
+                    meta.update(mtime_ns=st_mtime_ns, size=st_size)
+                    try:
+                        _write_atomic(meta_path, lambda p: p.write_text(json.dumps(meta), encoding="utf-8"))
+                    except OSError:
+                        pass
+                return df
+
+    df = read_excel(excel_path)
+    _write_snapshot(excel_path, df, st_mtime_ns, st_size)
+    return df
+
+
+def _write_snapshot(excel_path, df, st_mtime_ns, st_size):
+    snap_path, meta_path = snapshot_paths(excel_path)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "mtime_ns": st_mtime_ns,
+        "size": st_size,
+        "sha256": file_hash(excel_path),
+    }
+    try:
+        _write_atomic(snap_path, lambda p: df.to_pickle(p))
+        _write_atomic(meta_path, lambda p: p.write_text(json.dumps(meta), encoding="utf-8"))
+    except OSError:
+        # โฟลเดอร์อ่านอย่างเดียว (เช่นบน Cloud) → ใช้ข้อมูลใน memory ไปก่อน
+        pass
+
+
+def load_excel(excel_path=EXCEL_PATH) -> pd.DataFrame:
+    """อ่านชีตแรกของไฟล์ Excel ผ่าน snapshot (สำเนา แก้ไขได้อิสระ)
+
+    ภายใน process จะจำผลไว้ตาม mtime/ขนาดไฟล์ จึงไม่ต้องอ่าน snapshot ซ้ำ
+    """
+    excel_path = Path(excel_path)
+    if not excel_path.exists():
+        raise FileNotFoundError(f"ไม่พบไฟล์ Excel: {excel_path.name}")
+
+    stat = excel_path.stat()
+    key = str(excel_path)
+    with _lock:
+        cached = _excel_memo.get(key)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            df = _load_snapshot(excel_path, stat.st_mtime_ns, stat.st_size)
+            cached = (stat.st_mtime_ns, stat.st_size, df)
+            _excel_memo[key] = cached
+    return cached[2].copy()
+
+
+# ==============================
+# ข้อมูลหลักจากฐานข้อมูล
+# ==============================
+def _open_db(db_path) -> AssetDB:
+    key = str(db_path)
+    db = _dbs.get(key)
+    if db is None:
+        db = _dbs.setdefault(key, AssetDB(db_path))
+    return db
+
+
+def _partition_db(path) -> AssetDB:
+    db = _open_db(path)
+    if not db.exists():
+        raise FileNotFoundError(f"ไม่พบไฟล์ partition: {Path(path).name}")
+    return db
+
+
+def get_db(db_path=DB_PATH) -> AssetDB:
+    """AssetDB ของ process นี้ (ถ้ายังไม่มีฐานข้อมูล จะนำเข้าจาก Excel ครั้งแรก)
+
+    ใช้กับฐานข้อมูลไฟล์เดียว ถ้าแบ่ง partition แล้วใช้ฟังก์ชันระดับ store ด้านล่าง (revision, read_store, ...)
+    """
+    db = _open_db(db_path)
+    if db.exists():
+        return db
+    if not EXCEL_PATH.exists():
+        raise FileNotFoundError(f"ไม่พบฐานข้อมูลและไฟล์ Excel: {EXCEL_PATH.name}")
+    # ล็อกไฟล์ก่อน _lock (ลำดับเดียวกับ writer) แล้วตรวจซ้ำ: process/thread อื่นอาจนำเข้าไปแล้วระหว่างรอ
+    with db.lock(), _lock:
+        if not db.exists():
+            db.import_frame(load_excel(EXCEL_PATH))
+    return db
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """แปลง dtype ให้ใช้หน่วยความจำน้อย (CATEGORY_COLUMNS → category, STRING_COLUMNS → Arrow string)"""
+    df = df.copy(deep=False)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(ARROW_STRING)
+    return df
+
+
+def editable_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """สำเนาที่แก้ได้อิสระ คอลัมน์ categorical กลับเป็นชนิดปกติ (พิมพ์ค่าใหม่ใน data_editor ได้)"""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
+
+
+def _db_entry(db: AssetDB):
+    """entry ใน memo ของฐานข้อมูลไฟล์เดียว (ทั้งหมด หรือ partition เดียว) ตาม revision ปัจจุบัน (ต้องถือ _lock อยู่)"""
+    key = str(db.path)
+    entry = _store_memo.get(key)
+    if entry is None or entry["revision"] != db.revision():
+        revision, df, versions = db.read_frame()
+        df = compact_frame(df)
+        entry = {"revision": revision, "df": df, "versions": versions, "index": None, "search": {}, "ranks": {}, "summary": None, "picker": None}
+        _store_memo[key] = entry
+    return entry
+
+
+def _entry(db_path):
+    """คืน entry ใน memo ที่ตรงกับ revision ปัจจุบันของฐานข้อมูล (ต้องถือ _lock อยู่)
+
+    ฐานข้อมูลที่แบ่งแล้ว: ข้อมูลรวมทุก partition เรียงตาม _rowid (อ่านใหม่เมื่อ partition ใดเปลี่ยนจากที่อื่น
+    การบันทึกใน process นี้แก้ entry ตรง ๆ ไม่ต้องอ่านใหม่)
+    """
+    partitions = load_map(db_path)
+    if partitions is None:
+        return _db_entry(get_db(db_path))
+    dbs = [_partition_db(p) for p in partitions.paths()]
+    key = str(db_path)
+    entry = _store_memo.get(key)
+    if entry is None or entry["revision"] != tuple((str(db.path), db.revision()) for db in dbs):
+        revisions, frames, versions = [], [], {}
+        for db in dbs:
+            revision, df, part_versions = db.read_frame()
+            revisions.append((str(db.path), revision))
+            frames.append(df)
+            versions.update(part_versions)
+        df = compact_frame(pd.concat(frames))
+        entry = {"revision": tuple(revisions), "df": df, "versions": versions, "index": None, "search": {}, "ranks": {}, "summary": None, "picker": None}
+        _store_memo[key] = entry
+    return entry
+
+
+def load_data(db_path=DB_PATH) -> pd.DataFrame:
+    """คืน DataFrame ข้อมูลครุภัณฑ์ทั้งหมด index คือ _rowid ในฐานข้อมูล
+
+    เป็นชุดเดียวกันทุก session (ไม่คัดลอก) ห้ามแก้ในที่ ถ้าต้องการแก้ใช้ editable_frame()
+    หรือส่งค่าใหม่ผ่าน save_row / save_rows ภายใน process จะจำผลไว้ตาม revision ของฐานข้อมูล
+    """
+    with _lock:
+        return _entry(db_path)["df"]
+
+
+def load_index(db_path=DB_PATH) -> AssetIndex:
+    """ดัชนีรหัส/AssetID → ตำแหน่งแถว ของข้อมูลชุดปัจจุบัน (สร้างครั้งเดียวต่อ revision)"""
+    with _lock:
+        entry = _entry(db_path)
+        if entry["index"] is None:
+            entry["index"] = AssetIndex(entry["df"])
+        return entry["index"]
+
+
+def load_search(columns=SEARCH_COLUMNS, db_path=DB_PATH) -> SearchIndex:
+    """ดัชนีค้นหา n-gram ของคอลัมน์ที่กำหนด (สร้างครั้งเดียวต่อ revision อัปเดตทีละแถวเมื่อบันทึก)"""
+    with _lock:
+        entry = _entry(db_path)
+        key = tuple(columns)
+        if key not in entry["search"]:
+            entry["search"][key] = SearchIndex(entry["df"], key)
+        return entry["search"][key]
+
+
+def load_summary(db_path=DB_PATH) -> AssetSummary:
+    """ตัวเลขสรุป (จำนวนตามสถานที่/ผู้รับผิดชอบ, ไม่มีรูป/รหัส) สร้างครั้งเดียวต่อ revision ปรับทีละแถวเมื่อบันทึก"""
+    with _lock:
+        entry = _entry(db_path)
+        if entry["summary"] is None:
+            entry["summary"] = AssetSummary(entry["df"])
+        return entry["summary"]
+
+
+def load_picker(db_path=DB_PATH) -> PrefixIndex:
+    """ดัชนี prefix ของรหัส/AssetID (เรียงไว้) ให้ช่องเลือกแบบพิมพ์แล้วแนะนำ สร้างครั้งเดียวต่อ revision"""
+    with _lock:
+        entry = _entry(db_path)
+        if entry["picker"] is None:
+            entry["picker"] = PrefixIndex(entry["df"])
+        return entry["picker"]
+
+
+def load_row(code, db_path=DB_PATH):
+    """แถวของรหัส code ในข้อมูลชุดปัจจุบัน โดยไม่คัดลอกทั้งตาราง (ใช้กับหน้าอ่านอย่างเดียว)
+
+    ฐานข้อมูลที่แบ่งแล้ว: โหลดเฉพาะ partition ของคำนำหน้ารหัส (ถ้า process นี้มีข้อมูลรวมอยู่แล้วใช้ชุดนั้น)
+    ถ้าไม่พบ เช่นรหัสถูกแก้เป็นคำนำหน้าอื่นหลังแบ่ง จะหาใน partition อื่นต่อ
+    คืน (rowid, {คอลัมน์: ค่า}) หรือ None ถ้าไม่พบ
+    """
+    with _lock:
+        partitions = load_map(db_path)
+        if partitions is None or str(db_path) in _store_memo:
+            return _find_row(_entry(db_path), code)
+        first = partitions.path_for_code(code)
+        paths = [first] if first is not None else []
+        for path in paths + [p for p in partitions.paths() if p != first]:
+            found = _find_row(_db_entry(_partition_db(path)), code)
+            if found is not None:
+                return found
+        return None
+
+
+def _find_row(entry, code):
+    if entry["index"] is None:
+        entry["index"] = AssetIndex(entry["df"])
+    pos = entry["index"].find_code(code)
+    if pos is None:
+        return None
+    df = entry["df"]
+    return df.index[pos], dict(zip(df.columns, df.iloc[pos].tolist()))
+
+
+def load_sort_rank(column, db_path=DB_PATH) -> np.ndarray:
+    """อันดับของแต่ละแถวเมื่อเรียงตามคอลัมน์ (rank[ตำแหน่งแถว]) สร้างครั้งเดียวต่อ revision
+
+    ใช้เรียงผลค้นหาบางส่วนได้โดยไม่ต้อง sort ทั้งตารางใหม่: positions[np.argsort(rank[positions])]
+    """
+    with _lock:
+        entry = _entry(db_path)
+        rank = entry["ranks"].get(column)
+        if rank is None:
+            values = entry["df"][column].reset_index(drop=True)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)   # categories ที่เพิ่มภายหลังไม่ได้เรียงตามตัวอักษร
+            try:
+                order = values.sort_values(kind="stable", na_position="last").index.to_numpy()
+            except TypeError:
+                # คอลัมน์ที่มีทั้งตัวเลขและข้อความ → เรียงแบบข้อความ
+                order = values.fillna("").astype(str).sort_values(kind="stable").index.to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            entry["ranks"][column] = rank
+        return rank
+
+
+def set_cell(df: pd.DataFrame, pos, col, value):
+    """ใส่ค่าลงเซลล์ ถ้า dtype เดิมรับค่าไม่ได้ (เช่นข้อความลงคอลัมน์ตัวเลข) จะแปลงคอลัมน์เป็น object"""
+    j = df.columns.get_loc(col)
+    dtype = df[col].dtype
+    if isinstance(dtype, pd.CategoricalDtype) and not pd.isna(value) and value not in dtype.categories:
+        try:
+            df[col] = df[col].cat.add_categories([value])
+        except (TypeError, ValueError):
+            df[col] = df[col].astype(object)
+    try:
+        df.iat[pos, j] = value
+    except (TypeError, ValueError):
+        df[col] = df[col].astype(object)
+        df.iat[pos, j] = value
+
+
+def edit_base(df: pd.DataFrame, pos, db_path=DB_PATH) -> dict:
+    """ภาพของแถวตอนเปิดฟอร์ม (rowid, _version, ค่าเดิม) เก็บไว้ใน session_state
+    แล้วส่งกลับมาตอนบันทึก เพื่อให้ writer ตรวจว่ามีคนอื่นแก้แถวนี้ไปก่อนหรือไม่
+    """
+    rowid = df.index[pos]
+    with _lock:
+        entry = _entry(db_path)
+        # ค่าจากข้อมูลกลางล่าสุด (df ของหน้าอาจเป็นชุดก่อนบันทึก)
+        shared = entry["df"]
+        values = shared.loc[rowid].to_dict() if rowid in shared.index else df.iloc[pos].to_dict()
+        return {"rowid": rowid, "version": entry["versions"].get(rowid), "values": values}
+
+
+def _patch_entry(key, db_key, old_revision, new_revision, applied):
+    """อัปเดต entry key เฉพาะแถวที่ writer ของฐานข้อมูล db_key เพิ่งเขียน (ต้องถือ _lock อยู่)"""
+    entry = _store_memo.get(key)
+    if entry is None:
+        return
+    revisions = dict(entry["revision"]) if isinstance(entry["revision"], tuple) else {db_key: entry["revision"]}
+    if revisions.get(db_key) != old_revision:
+        # มีการเขียนจากที่อื่นแทรกเข้ามา → ทิ้ง cache แล้วอ่านใหม่ครั้งหน้า
+        _store_memo.pop(key, None)
+        return
+    # copy-on-write: ตารางใหม่ใช้คอลัมน์เดิมร่วมกัน คัดลอกเฉพาะคอลัมน์ที่ถูกแก้
+    # session ที่กำลังอ่านตารางเดิมอยู่จะเห็นข้อมูลชุดเดิมครบทั้งชุด
+    cached = entry["df"].copy(deep=False)
+    for col in {c for result in applied for c in result["values"]}:
+        if col in cached.columns:
+            cached[col] = cached[col].copy()
+    for result in applied:
+        pos = cached.index.get_loc(result["rowid"])
+        old_values = {c: cached.iat[pos, cached.columns.get_loc(c)] for c in result["values"]}
+        for col, val in result["values"].items():
+            set_cell(cached, pos, col, val)
+        if entry["index"] is not None:
+            entry["index"].update_row(pos, old_values, result["values"])
+        for search in entry["search"].values():
+            search.update_row(pos, result["values"])
+        if entry["summary"] is not None:
+            entry["summary"].update_row(pos, old_values, result["values"])
+        if entry["picker"] is not None:
+            entry["picker"].update_row(pos, old_values, result["values"])
+        entry["versions"][result["rowid"]] = result["version"]
+    entry["df"] = cached
+    entry["ranks"].clear()   # ลำดับการเรียงอาจเปลี่ยน สร้างใหม่เมื่อมีคนขอ
+    revisions[db_key] = new_revision
+    entry["revision"] = tuple(revisions.items()) if isinstance(entry["revision"], tuple) else new_revision
+
+
+def _on_commit(key, store_key=None):
+    def patch(old_revision, new_revision, applied):
+        """อัปเดต cache เฉพาะแถวที่ writer เพิ่งเขียน (ถ้า cache ตามทัน revision ก่อนเขียน)
+
+        partition: อัปเดตทั้ง entry ของ partition นั้นและ entry ข้อมูลรวม (store_key) ที่มีอยู่
+        """
+        with _lock:
+            _patch_entry(key, key, old_revision, new_revision, applied)
+            if store_key is not None:
+                _patch_entry(store_key, key, old_revision, new_revision, applied)
+
+    return patch
+
+
+def _row_db_path(rowid, db_path=DB_PATH) -> Path:
+    """ไฟล์ฐานข้อมูลที่เก็บแถว rowid (partition ของแถว หรือ db_path ถ้ายังไม่แบ่ง)"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        return Path(db_path)
+    path = partitions.path_for_rowid(rowid)
+    if path is None:
+        raise KeyError(f"ไม่พบ partition ของแถว _rowid={rowid}")
+    return path
+
+
+def _writer(path, db_path=DB_PATH):
+    """writer ของไฟล์ path (หนึ่ง writer ต่อไฟล์ partition การบันทึกใน partition ต่างกันไม่รอกัน)"""
+    if str(path) == str(db_path):
+        get_db(db_path)
+        return get_writer(db_path, on_commit=_on_commit(str(db_path)))
+    _partition_db(path)
+    return get_writer(path, on_commit=_on_commit(str(path), str(db_path)))
+
+
+def save_row(df: pd.DataFrame, pos, values: dict, base=None, db_path=DB_PATH, timeout=60, user=None):
+    """บันทึกแถวตำแหน่ง pos ของ df ผ่าน writer thread
+
+    df ไม่ถูกแก้ (ข้อมูลกลางถูกแทนด้วยชุดใหม่) หน้าที่ต้องแสดงค่าใหม่ในรอบเดียวกันให้เรียก load_data() อีกครั้ง
+
+    - base : ผลจาก edit_base() ตอนเปิดฟอร์ม ถ้าให้มา จะส่งเฉพาะคอลัมน์ที่เปลี่ยนจริง
+      และถ้าแถวถูกแก้โดยคนอื่นในคอลัมน์เดียวกัน จะได้ ConflictError แทนการเขียนทับ
+    - user : ผู้แก้ (บันทึกลงประวัติ)
+    - คืน dict ผลการเขียน หรือ None ถ้าไม่มีอะไรเปลี่ยน
+    """
+    rowid = df.index[pos]
+    if base is not None and base.get("rowid") == rowid:
+        changes = {c: v for c, v in values.items() if not same_value(v, base["values"].get(c))}
+        edit = RowEdit(rowid, changes, base.get("version"), {c: base["values"].get(c) for c in changes}, user)
+    else:
+        edit = RowEdit(rowid, dict(values), user=user)
+    if not edit.values:
+        return None
+
+    return _writer(_row_db_path(rowid, db_path), db_path).submit(edit).result(timeout=timeout)
+
+
+def row_versions(rowids, db_path=DB_PATH) -> dict:
+    """_version ของหลายแถว (ของข้อมูลชุดที่อยู่ใน memo) ใช้เป็นฐานของการแก้แบบตาราง"""
+    with _lock:
+        versions = _entry(db_path)["versions"]
+        return {rowid: versions.get(rowid) for rowid in rowids}
+
+
+def diff_frames(original: pd.DataFrame, edited: pd.DataFrame) -> dict:
+    """เทียบสองตาราง (index และคอลัมน์เดียวกัน) คืน {rowid: {คอลัมน์: ค่าใหม่}} เฉพาะช่องที่เปลี่ยน
+
+    เทียบทั้งคอลัมน์แบบ vectorized ก่อน แล้วตรวจเฉพาะช่องที่ต่างด้วย same_value
+    (ช่องว่าง/NaN/None ถือว่าเท่ากัน, 5 = 5.0 = "5") ไม่นับการเปลี่ยนที่ผู้ใช้มองไม่เห็น
+    """
+    changes = {}
+    for col in original.columns.intersection(edited.columns):
+        a = original[col]
+        b = edited[col].reindex(original.index)
+        try:
+            differs = ~((a == b) | (a.isna() & b.isna()))
+        except TypeError:
+            differs = a.astype(object).ne(b.astype(object))
+        if not differs.any():
+            continue
+        for rowid, old, new in zip(a.index[differs], a[differs].tolist(), b[differs].tolist()):
+            if not same_value(old, new):
+                changes.setdefault(rowid, {})[col] = new
+    return changes
+
+
+def save_rows(changes: dict, base: pd.DataFrame = None, versions: dict = None,
+              db_path=DB_PATH, timeout=120, user=None) -> dict:
+    """บันทึกการแก้หลายแถวในครั้งเดียว (writer เขียนใน transaction เดียว)
+
+    - changes  : {rowid: {คอลัมน์: ค่าใหม่}} (เช่นผลจาก diff_frames)
+    - base     : ตารางค่าเดิมตอนเปิดตาราง (index = rowid) ใช้ตรวจการแก้ชนกับผู้อื่น
+    - versions : {rowid: _version} ตอนเปิดตาราง (จาก row_versions)
+    คืน {"saved": [rowid...], "conflicts": {rowid: ข้อความ}}
+
+    ฐานข้อมูลที่แบ่งแล้ว: แต่ละ partition เขียนใน transaction ของตัวเอง
+    """
+    edits = []
+    for rowid, values in changes.items():
+        if not values:
+            continue
+        if base is not None and versions is not None and rowid in base.index:
+            base_values = {c: base.at[rowid, c] for c in values if c in base.columns}
+            edits.append(RowEdit(rowid, dict(values), versions.get(rowid), base_values, user))
+        else:
+            edits.append(RowEdit(rowid, dict(values), user=user))
+    if not edits:
+        return {"saved": [], "conflicts": {}}
+
+    groups = {}
+    for i, edit in enumerate(edits):
+        try:
+            path = _row_db_path(edit.rowid, db_path)
+        except KeyError as e:
+            path = e
+        groups.setdefault(path, []).append(i)
+    futures = [None] * len(edits)
+    for path, positions in groups.items():
+        if isinstance(path, KeyError):
+            for i in positions:
+                futures[i] = Future()
+                futures[i].set_exception(path)
+            continue
+        for i, future in zip(positions, _writer(path, db_path).submit_many([edits[i] for i in positions])):
+            futures[i] = future
+    saved, conflicts = [], {}
+    for edit, future in zip(edits, futures):
+        try:
+            future.result(timeout=timeout)
+        except (ConflictError, KeyError) as e:
+            conflicts[edit.rowid] = str(e)
+            continue
+        saved.append(edit.rowid)
+    return {"saved": saved, "conflicts": conflicts}
+
+
+def load_history(code, db_path=DB_PATH) -> pd.DataFrame:
+    """ประวัติการแก้ไขของรหัส code (ใหม่สุดก่อน) อ่านจาก index ของตาราง history โดยตรง"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        return get_db(db_path).history(code)
+    first = partitions.path_for_code(code)
+    # manifest ที่ไม่มี partition เลย → ตารางว่าง (หน้าเว็บเช็ก history.empty)
+    history = pd.DataFrame(columns=HISTORY_COLUMNS).astype({"ts": "datetime64[ns]"})
+    for path in ([first] if first is not None else []) + [p for p in partitions.paths() if p != first]:
+        history = _partition_db(path).history(code)
+        if len(history):
+            break
+    return history
+
+
+def state_as_of(when, db_path=DB_PATH) -> pd.DataFrame:
+    """ข้อมูลทั้งหมด ณ เวลา when (ดู AssetDB.state_as_of)"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        return get_db(db_path).state_as_of(when)
+    df = pd.concat([_partition_db(p).state_as_of(when) for p in partitions.paths()])
+    df.index.name = "_rowid"
+    return df
+
+
+# ==============================
+# ระดับ store (ไฟล์เดียว หรือทุก partition)
+# ==============================
+def revision(db_path=DB_PATH):
+    """ตัวบอกว่าข้อมูลเปลี่ยนไหม: int (ไฟล์เดียว) หรือ ((ไฟล์ partition, revision), ...)"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        return get_db(db_path).revision()
+    return tuple((str(p), _partition_db(p).revision()) for p in partitions.paths())
+
+
+def last_modified(rowid, db_path=DB_PATH) -> float | None:
+    """เวลาแก้ไขล่าสุดของแถว (ดู AssetDB.last_modified) จากไฟล์ที่เก็บแถวนั้น"""
+    path = _row_db_path(rowid, db_path)
+    return (get_db(db_path) if str(path) == str(db_path) else _partition_db(path)).last_modified(rowid)
+
+
+def _store_dbs(db_path=DB_PATH) -> list:
+    partitions = load_map(db_path)
+    if partitions is None:
+        return [get_db(db_path)]
+    return [_partition_db(p) for p in partitions.paths()]
+
+
+@contextmanager
+def store_lock(db_path=DB_PATH, timeout=30.0):
+    """ล็อกผู้เขียนของทุกไฟล์ (เรียงตามลำดับ partition เสมอ ไม่ deadlock กับผู้ถือล็อกหลายไฟล์อื่น)"""
+    with ExitStack() as stack:
+        for db in _store_dbs(db_path):
+            stack.enter_context(db.lock(timeout))
+        yield
+
+
+def read_store(db_path=DB_PATH) -> pd.DataFrame:
+    """อ่านข้อมูลทั้งหมดจากฐานข้อมูลตรง ๆ (ไม่ผ่าน memo) index = _rowid"""
+    frames = [db.read_frame()[1] for db in _store_dbs(db_path)]
+    return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+
+def apply_import(inserts=None, updates=None, deletes=(), user=None, db_path=DB_PATH):
+    """เขียนผลการรวมไฟล์นำเข้า (ดู AssetDB.apply_import) คืน revision ใหม่ (แบบเดียวกับ revision())
+
+    ฐานข้อมูลที่แบ่งแล้ว: แถวใหม่ไปที่ partition ของคำนำหน้ารหัส (สร้าง partition ใหม่ถ้ายังไม่มี)
+    แถวที่แก้/ลบไปที่ partition ของแถวนั้น ผู้เรียกถือ store_lock() อยู่แล้ว
+    """
+    partitions = load_map(db_path)
+    if partitions is None:
+        return get_db(db_path).apply_import(inserts, updates, deletes, user=user)[1]
+
+    work, created = {}, set()
+    if inserts is not None and len(inserts):
+        keys = inserts[COL_CODE].map(partition_key)
+        for key, part in inserts.groupby(keys, sort=True):
+            if key not in partitions.partitions:
+                from asset_partitions import add_partition
+
+                created.add(str(add_partition(db_path, key, _partition_db(partitions.paths()[0]).columns())))
+                partitions = load_map(db_path)
+            work.setdefault(str(partitions.path(key)), [None, {}, []])[0] = part
+    for rowid, values in (updates or {}).items():
+        work.setdefault(str(_row_db_path(rowid, db_path)), [None, {}, []])[1][rowid] = values
+    for rowid in deletes:
+        work.setdefault(str(_row_db_path(rowid, db_path)), [None, {}, []])[2].append(rowid)
+    for path, (part_inserts, part_updates, part_deletes) in work.items():
+        db = _partition_db(path)
+        # partition ที่เพิ่งสร้างไม่อยู่ใน store_lock ของผู้เรียก → ล็อกเอง
+        with db.lock() if path in created else ExitStack():
+            db.apply_import(part_inserts, part_updates, part_deletes, user=user)
+    return revision(db_path)
+
+
+def clear_cache():
+    """ล้าง cache ใน process (snapshot บนดิสก์ยังอยู่ และจะถูกตรวจกับไฟล์ต้นทางตามปกติ)"""
+    with _lock:
+        _excel_memo.clear()
+        _store_memo.clear()
+
+
+def release(paths):
+    """หยุด writer ปิดการเชื่อมต่อ และลืม memo ของไฟล์ฐานข้อมูลเหล่านี้ (ก่อน/หลัง split, join ที่ลบหรือแทนที่ไฟล์)"""
+    for path in paths:
+        drop_writer(path)   # นอก _lock: writer ที่กำลังเขียนอยู่เรียก _on_commit ซึ่งต้องใช้ _lock
+    with _lock:
+        for path in paths:
+            db = _dbs.pop(str(path), None)
+            if db is not None:
+                db.close()
+            _store_memo.pop(str(path), None)
@@ -0,0 +1,644 @@
+# asset_db.py
+"""ที่เก็บข้อมูลครุภัณฑ์หลักบน SQLite (WAL)
+
+ไฟล์ Excel กลายเป็นไฟล์สำหรับนำเข้า/ส่งออกเท่านั้น การบันทึกแต่ละครั้งจะ UPDATE เฉพาะแถวที่แก้
+
+ใช้งานจาก command line:
+    python asset_db.py import ["Smart Asset Lab.xlsx"]   # นำเข้า Excel → ฐานข้อมูล (แทนที่ทั้งหมด)
+    python asset_db.py export ["Smart Asset Lab.xlsx"]   # ส่งออกฐานข้อมูล → Excel
+    python asset_db.py export old.xlsx --as-of 2026-01-31  # ส่งออกสภาพข้อมูล ณ สิ้นวันที่ระบุ
+
+ทุกการแก้ไขถูกต่อท้ายในตาราง history (append-only) หนึ่งแถวต่อหนึ่งช่องที่เปลี่ยน
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "smart_asset.db"
+EXCEL_PATH = BASE_DIR / "Smart Asset Lab.xlsx"
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+
+# คอลัมน์ที่ทำ index ในฐานข้อมูล
+INDEXED_COLUMNS = (COL_CODE, "AssetID")
+
+# ประวัติการแก้ (เพิ่มอย่างเดียว ไม่แก้/ลบ) หนึ่งแถวต่อหนึ่งช่องที่เปลี่ยน
+# op: update = แก้ช่อง col จาก old เป็น new, insert = เพิ่มแถว, delete = ลบแถว (old = ค่าทั้งแถวเป็น JSON),
+#     import = นำเข้า Excel แทนที่ทั้งหมด (ย้อนเวลาผ่านจุดนี้ไม่ได้)
+HISTORY_COLUMNS = ["ts", "op", "row", "code", "col", "old", "new", "user"]
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    op TEXT NOT NULL,
+    row INTEGER,
+    code TEXT,
+    col TEXT,
+    old,
+    new,
+    user TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_history_code ON history(code, ts);
+CREATE INDEX IF NOT EXISTS ix_history_row ON history(row, ts);
+CREATE INDEX IF NOT EXISTS ix_history_ts ON history(ts);
+"""
+
+
+def quote(name) -> str:
+    """ใส่เครื่องหมายคำพูดให้ชื่อคอลัมน์ (ชื่อภาษาไทย/มีวงเล็บ)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def to_sql_value(value):
+    """แปลงค่าจาก pandas/numpy ให้ sqlite3 รับได้"""
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, (pd.Timestamp, dt.datetime, dt.date)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+
+def as_timestamp(when) -> float:
+    """แปลงเวลา (epoch / datetime / date / ข้อความ ISO) เป็น epoch วินาที
+
+    วันที่อย่างเดียวหมายถึงสิ้นวันนั้นตามเวลาเครื่อง
+    """
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        text = when.strip()
+        when = dt.date.fromisoformat(text) if len(text) == 10 else dt.datetime.fromisoformat(text)
+    if isinstance(when, pd.Timestamp):
+        when = when.to_pydatetime()
+    if not isinstance(when, dt.datetime):
+        when = dt.datetime.combine(when, dt.time.max)
+    return when.timestamp()
+
+
+def same_value(a, b) -> bool:
+    """เทียบค่าแบบที่ผู้ใช้เห็นในฟอร์ม (None/NaN = "", 5 = 5.0 = "5")"""
+    a, b = to_sql_value(a), to_sql_value(b)
+    a = "" if a is None else a
+    b = "" if b is None else b
+    if isinstance(a, float) and a.is_integer():
+        a = int(a)
+    if isinstance(b, float) and b.is_integer():
+        b = int(b)
+    # ตัวเลขจากฐานข้อมูลกับข้อความจากฟอร์ม เช่น 13000 กับ "13000.0"
+    if isinstance(a, str) and isinstance(b, (int, float)):
+        a, b = b, a
+    if isinstance(a, (int, float)) and isinstance(b, str):
+        try:
+            return float(a) == float(b)
+        except ValueError:
+            pass
+    return str(a).strip() == str(b).strip()
+
+
+class ConflictError(Exception):
+    """แถวถูกแก้โดยผู้อื่นหลังจากที่เราโหลดมา และแก้คอลัมน์เดียวกันกับเรา"""
+
+
+@dataclass
+class RowEdit:
+    """การแก้หนึ่งแถว
+
+    - base_version : _version ของแถวตอนที่ผู้ใช้โหลดมา (None = ไม่ตรวจ)
+    - base_values  : ค่าเดิมของคอลัมน์ที่แก้ ใช้ตัดสินว่ารวม (merge) กับการแก้ของคนอื่นได้ไหม
+    - user         : ผู้แก้ (บันทึกลงประวัติ)
+    """
+
+    rowid: int
+    values: dict
+    base_version: int | None = None
+    base_values: dict = field(default_factory=dict)
+    user: str | None = None
+
+
+class FileLock:
+    """ล็อกข้าม process ด้วยไฟล์ (fcntl บน Linux/macOS, msvcrt บน Windows)"""
+
+    def __init__(self, path, timeout=30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fh = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def __enter__(self):
+        self._fh = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() > deadline:
+                self._fh.close()
+                self._fh = None
+                raise TimeoutError(f"รอล็อก {self.path.name} นานเกิน {self.timeout} วินาที")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+class AssetDB:
+    """ตาราง assets หนึ่งแถวต่อครุภัณฑ์ คอลัมน์ตรงกับหัวตารางใน Excel
+
+    - ``_rowid``   : id ถาวรของแถว (ใช้เป็น index ของ DataFrame)
+    - ``_version`` : เพิ่มขึ้นทุกครั้งที่แถวถูกแก้
+    - meta.revision : เพิ่มขึ้นทุกครั้งที่ฐานข้อมูลถูกเขียน ใช้ตรวจว่า cache ยังใหม่อยู่ไหม
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._conns = []          # ทุกการเชื่อมต่อของ object นี้ (ทุก thread) ให้ close() ปิดได้ครบ
+        self._conns_lock = threading.Lock()
+        self._generation = 0      # เพิ่มเมื่อ close() การเชื่อมต่อเดิมใน thread อื่นจะถูกเปิดใหม่
+
+    def lock(self, timeout=30.0) -> FileLock:
+        """ล็อกสำหรับผู้เขียนทุกคน (writer thread, การนำเข้า Excel) ข้ามทุก process"""
+        return FileLock(self.path.with_name(self.path.name + ".lock"), timeout)
+
+    # ---------- การเชื่อมต่อ ----------
+    def _file_id(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def connect(self) -> sqlite3.Connection:
+        """การเชื่อมต่อของ thread นี้ เปิดใหม่ถ้าไฟล์ถูกลบ/แทนที่ (เช่น split/join จาก process อื่น) หรือหลัง close()"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and (
+            self._local.generation != self._generation or self._local.file_id != self._file_id()
+        ):
+            self._discard(conn)
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executescript(HISTORY_SCHEMA)
+            with self._conns_lock:
+                self._conns.append(conn)
+            self._local.conn, self._local.file_id, self._local.generation = conn, self._file_id(), self._generation
+        return conn
+
+    def _discard(self, conn):
+        with self._conns_lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """ปิดทุกการเชื่อมต่อของ object นี้ (ใช้ก่อนลบ/แทนที่ไฟล์ฐานข้อมูล)"""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._generation += 1
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def exists(self) -> bool:
+        if not self.path.exists():
+            return False
+        row = self.connect().execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='assets'"
+        ).fetchone()
+        return row is not None
+
+    def _get_meta(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn, key, value):
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, str(value)),
+        )
+
+    def _bump_revision(self, conn, fresh=False) -> int:
+        """revision ถัดไป fresh=True (นำเข้าแทนที่ทั้งหมด) เริ่มจากเวลาปัจจุบัน (มิลลิวินาที)
+        ไฟล์ที่ถูกลบแล้วสร้างใหม่ชื่อเดิม (split/join) จึงไม่ได้ revision ซ้ำกับที่ cache ของ process อื่นจำไว้
+        """
+        revision = int(self._get_meta(conn, "revision", 0)) + 1
+        if fresh:
+            revision = max(revision, time.time_ns() // 1_000_000)
+        self._set_meta(conn, "revision", revision)
+        return revision
+
+    def revision(self) -> int:
+        return int(self._get_meta(self.connect(), "revision", 0))
+
+    def columns(self) -> list:
+        return json.loads(self._get_meta(self.connect(), "columns", "[]"))
+
+    # ---------- อ่าน ----------
+    def read_frame(self):
+        """คืน (revision, DataFrame, versions) โดย index ของ DataFrame คือ _rowid
+
+        versions คือ dict {_rowid: _version} ของข้อมูลชุดเดียวกัน
+        """
+        conn = self.connect()
+        conn.execute("BEGIN")
+        try:
+            return self._read_frame(conn)
+        finally:
+            conn.execute("COMMIT")
+
+    def _read_frame(self, conn):
+        revision = int(self._get_meta(conn, "revision", 0))
+        cols = json.loads(self._get_meta(conn, "columns", "[]"))
+        select = ", ".join(["_rowid", "_version"] + [quote(c) for c in cols])
+        df = pd.read_sql_query(f"SELECT {select} FROM assets ORDER BY _rowid", conn)
+        df = df.set_index("_rowid")
+        versions = dict(zip(df.index.tolist(), df.pop("_version").tolist()))
+        df.columns = cols
+        return revision, df, versions
+
+    def row_version(self, rowid) -> int | None:
+        row = self.connect().execute(
+            "SELECT _version FROM assets WHERE _rowid=?", (int(rowid),)
+        ).fetchone()
+        return row[0] if row else None
+
+    # ---------- ประวัติ ----------
+    def history(self, code) -> pd.DataFrame:
+        """ประวัติการแก้ไขของรหัส code (ใหม่สุดก่อน) ตามแถวที่เคยใช้รหัสนี้ แม้รหัสถูกเปลี่ยนภายหลัง"""
+        conn = self.connect()
+        rowids = [r[0] for r in conn.execute(
+            "SELECT DISTINCT row FROM history WHERE code=? AND row IS NOT NULL", (str(code),)
+        )]
+        marks = ", ".join("?" for _ in rowids)
+        where = f"row IN ({marks}) OR code=?" if rowids else "code=?"
+        df = pd.read_sql_query(
+            f"SELECT ts, op, row, code, col, old, new, user FROM history WHERE {where} ORDER BY ts DESC, id DESC",
+            conn, params=[*rowids, str(code)],
+        )
+        df["ts"] = pd.to_datetime([dt.datetime.fromtimestamp(t) for t in df["ts"]])
+        return df
+
+    def read_history(self) -> pd.DataFrame:
+        """ประวัติทั้งหมดตามลำดับที่บันทึก (ใช้ตอนย้ายข้อมูลระหว่างฐานข้อมูล)"""
+        return pd.read_sql_query(
+            "SELECT ts, op, row, code, col, old, new, user FROM history ORDER BY id", self.connect()
+        )
+
+    def last_modified(self, rowid) -> float | None:
+        """เวลาแก้ไขล่าสุดของแถว (epoch) จากประวัติ หรือเวลานำเข้าทั้งหมดครั้งล่าสุด ถ้าใหม่กว่า"""
+        conn = self.connect()
+        (edited,) = conn.execute("SELECT max(ts) FROM history WHERE row=?", (int(rowid),)).fetchone()
+        imported = self._get_meta(conn, "imported_at")
+        times = [float(t) for t in (edited, imported) if t is not None]
+        return max(times) if times else None
+
+    def state_as_of(self, when) -> pd.DataFrame:
+        """สภาพข้อมูล ณ เวลา when (วันที่อย่างเดียว = สิ้นวันนั้น ตามเวลาเครื่อง)
+
+        เริ่มจากข้อมูลปัจจุบันแล้วย้อนเฉพาะรายการหลังเวลานั้น (ใช้ index ts ไม่ต้องอ่านประวัติทั้งหมด)
+        ย้อนข้ามการนำเข้าแบบแทนที่ทั้งหมด (import_frame) ไม่ได้ → ValueError
+        """
+        cutoff = as_timestamp(when)
+        conn = self.connect()
+        conn.execute("BEGIN")
+        try:
+            _, df, _ = self._read_frame(conn)
+            entries = conn.execute(
+                "SELECT op, row, col, old FROM history WHERE ts > ? ORDER BY id DESC", (cutoff,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        if any(op == "import" for op, *_ in entries):
+            raise ValueError("ย้อนข้อมูลข้ามการนำเข้าแบบแทนที่ทั้งหมดไม่ได้ (ไม่มีประวัติก่อนหน้านั้น)")
+
+        # ย้อนจากใหม่ไปเก่า ค่าสุดท้ายที่เหลือของแต่ละช่องคือค่า ณ เวลานั้น
+        updates, dropped, restored = {}, set(), {}
+        for op, row, col, old in entries:
+            if op == "update":
+                if row in restored:
+                    restored[row][col] = old
+                elif row not in dropped:
+                    updates.setdefault(col, {})[row] = old
+            elif op == "insert":
+                dropped.add(row)
+                restored.pop(row, None)
+            elif op == "delete":
+                dropped.discard(row)
+                restored[row] = json.loads(old)
+
+        # แก้ทีละคอลัมน์ (แปลงเป็น object เฉพาะคอลัมน์ที่ถูกแก้)
+        for col, values in updates.items():
+            if col not in df.columns:
+                continue
+            rows = pd.Index(list(values))
+            keep = rows.isin(df.index)
+            series = df[col].astype(object)
+            series.loc[rows[keep]] = np.array(list(values.values()), dtype=object)[keep]
+            df[col] = series.infer_objects()
+        df = df.drop(index=[r for r in dropped | restored.keys() if r in df.index])
+        if restored:
+            extra = pd.DataFrame.from_dict(restored, orient="index").reindex(columns=df.columns)
+            df = pd.concat([df.astype(object), extra.astype(object)]).sort_index().infer_objects()
+        df.index.name = "_rowid"
+        return df
+
+    # ---------- เขียน ----------
+    def import_frame(self, df: pd.DataFrame, user=None, rowids=None, history=None, rowid_base=0) -> int:
+        """แทนที่ข้อมูลทั้งหมดด้วย df (ใช้ตอนนำเข้า Excel) คืน revision ใหม่
+
+        ใช้ตอนแบ่ง/รวม partition ด้วย (asset_partitions.py):
+        - rowids     : _rowid ของแต่ละแถว (None = 1, 2, 3, ...)
+        - history    : ประวัติเดิมที่ย้ายมาด้วย (DataFrame จาก read_history) แทนการบันทึกว่านำเข้าใหม่
+        - rowid_base : แถวที่เพิ่มภายหลังได้ _rowid มากกว่าค่านี้เสมอ
+        """
+        cols = [str(c) for c in df.columns]
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DROP TABLE IF EXISTS assets")
+            col_defs = ", ".join(quote(c) for c in cols)
+            conn.execute(
+                "CREATE TABLE assets (_rowid INTEGER PRIMARY KEY, "
+                f"_version INTEGER NOT NULL DEFAULT 1, {col_defs})"
+            )
+            for i, col in enumerate(c for c in INDEXED_COLUMNS if c in cols):
+                conn.execute(f"CREATE INDEX ix_assets_{i} ON assets({quote(col)})")
+
+            placeholders = ", ".join("?" for _ in cols)
+            rows = ([to_sql_value(v) for v in row] for row in df.itertuples(index=False, name=None))
+            if rowids is None:
+                conn.executemany(
+                    f"INSERT INTO assets({', '.join(quote(c) for c in cols)}) VALUES ({placeholders})", rows
+                )
+            else:
+                conn.executemany(
+                    f"INSERT INTO assets(_rowid, {', '.join(quote(c) for c in cols)}) VALUES (?, {placeholders})",
+                    ([int(r), *row] for r, row in zip(rowids, rows)),
+                )
+            self._set_meta(conn, "columns", json.dumps(cols, ensure_ascii=False))
+            self._set_meta(conn, "rowid_base", int(rowid_base))
+            if history is None:
+                self._log(conn, [("import", None, None, None, None, len(df))], user)
+                self._set_meta(conn, "imported_at", time.time())
+            else:
+                conn.execute("DELETE FROM history")
+                conn.executemany(
+                    "INSERT INTO history(ts, op, row, code, col, old, new, user) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ([to_sql_value(v) for v in row] for row in history[HISTORY_COLUMNS].itertuples(index=False, name=None)),
+                )
+                imported = history.loc[history["op"] == "import", "ts"]
+                if len(imported):
+                    self._set_meta(conn, "imported_at", float(imported.max()))
+            revision = self._bump_revision(conn, fresh=True)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return revision
+
+    def _log(self, conn, entries, user=None, ts=None):
+        """ต่อท้ายประวัติ entries = [(op, row, code, col, old, new), ...] (เวลาเดียวกันทั้งชุด)"""
+        ts = time.time() if ts is None else ts
+        conn.executemany(
+            "INSERT INTO history(ts, op, row, code, col, old, new, user) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(ts, op, row, code, col, to_sql_value(old), to_sql_value(new), user)
+             for op, row, code, col, old, new in entries],
+        )
+
+    def update_row(self, rowid, values: dict) -> int:
+        """UPDATE แถวเดียวโดยไม่ตรวจ _version คืน revision ใหม่ของฐานข้อมูล"""
+        _, revision, (result,) = self.apply_edits([RowEdit(rowid, values)])
+        if isinstance(result, Exception):
+            raise result
+        return revision
+
+    def apply_edits(self, edits):
+        """เขียนการแก้หลายแถวใน transaction เดียว พร้อมตรวจ _version ทีละแถว
+
+        ถ้า _version ไม่ตรง แต่คอลัมน์ที่เราแก้ยังเป็นค่าเดิม (คนอื่นแก้คอลัมน์อื่น) จะรวมให้
+        ถ้าคอลัมน์เดียวกันถูกแก้ไปแล้ว ผลของ edit นั้นคือ ConflictError
+
+        คืน (revision_ก่อน, revision_หลัง, ผลลัพธ์ต่อ edit) ผลลัพธ์คือ dict
+        {"rowid", "version", "values", "merged"} หรือ exception
+        """
+        cols = self.columns()
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old_revision = int(self._get_meta(conn, "revision", 0))
+            results = []
+            for edit in edits:
+                try:
+                    results.append(self._apply_edit(conn, cols, edit))
+                except (ConflictError, KeyError) as e:
+                    results.append(e)
+            applied = any(isinstance(r, dict) and r["values"] for r in results)
+            new_revision = self._bump_revision(conn) if applied else old_revision
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return old_revision, new_revision, results
+
+    def _apply_edit(self, conn, cols, edit: RowEdit):
+        unknown = [c for c in edit.values if c not in cols]
+        if unknown:
+            raise KeyError(f"ไม่พบคอลัมน์ในฐานข้อมูล: {', '.join(map(str, unknown))}")
+        if not edit.values:
+            version = conn.execute(
+                "SELECT _version FROM assets WHERE _rowid=?", (int(edit.rowid),)
+            ).fetchone()
+            if version is None:
+                raise KeyError(f"ไม่พบแถว _rowid={edit.rowid}")
+            return {"rowid": edit.rowid, "version": version[0], "values": {}, "merged": False}
+
+        code_sql = quote(COL_CODE) if COL_CODE in cols else "NULL"
+        select = ", ".join(["_version", code_sql] + [quote(c) for c in edit.values])
+        current = conn.execute(
+            f"SELECT {select} FROM assets WHERE _rowid=?", (int(edit.rowid),)
+        ).fetchone()
+        if current is None:
+            raise KeyError(f"ไม่พบแถว _rowid={edit.rowid}")
+
+        version, code, current_values = current[0], current[1], dict(zip(edit.values, current[2:]))
+        merged = False
+        if edit.base_version is not None and version != edit.base_version:
+            clashes = [
+                c for c, new in edit.values.items()
+                if not same_value(current_values[c], edit.base_values.get(c))
+                and not same_value(current_values[c], new)
+            ]
+            if clashes:
+                raise ConflictError(
+                    "ข้อมูลถูกแก้โดยผู้ใช้อื่นหลังจากที่คุณเปิดฟอร์ม "
+                    f"(คอลัมน์: {', '.join(map(str, clashes))}) กรุณาโหลดหน้าใหม่แล้วแก้อีกครั้ง"
+                )
+            merged = True
+
+        assignments = ", ".join(f"{quote(c)}=?" for c in edit.values)
+        params = [to_sql_value(v) for v in edit.values.values()] + [int(edit.rowid)]
+        conn.execute(f"UPDATE assets SET {assignments}, _version=_version+1 WHERE _rowid=?", params)
+        code = edit.values.get(COL_CODE, code)
+        self._log(conn, [
+            ("update", int(edit.rowid), code, c, current_values[c], new)
+            for c, new in edit.values.items() if not same_value(current_values[c], new)
+        ], edit.user)
+        return {"rowid": edit.rowid, "version": version + 1, "values": dict(edit.values), "merged": merged}
+
+    def apply_import(self, inserts: pd.DataFrame = None, updates: dict = None, deletes=(), user=None) -> tuple:
+        """เขียนผลการรวมไฟล์นำเข้าใน transaction เดียว (ใช้โดย asset_import.py)
+
+        - inserts : แถวใหม่ (คอลัมน์ที่ไม่มีในฐานข้อมูลจะถูกข้าม)
+        - updates : {_rowid: {คอลัมน์: ค่าใหม่}}
+        - deletes : _rowid ที่จะลบ
+        คืน (revision_ก่อน, revision_หลัง, [_rowid ของแถวใหม่])
+        """
+        cols = self.columns()
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old_revision = int(self._get_meta(conn, "revision", 0))
+            new_rowids, log = [], []
+            code_sql = quote(COL_CODE) if COL_CODE in cols else "NULL"
+            if inserts is not None and len(inserts):
+                ins_cols = [c for c in inserts.columns if c in cols]
+                sql = (
+                    f"INSERT INTO assets(_rowid, {', '.join(quote(c) for c in ins_cols)}) "
+                    f"VALUES (?, {', '.join('?' for _ in ins_cols)})"
+                )
+                (last,) = conn.execute("SELECT max(_rowid) FROM assets").fetchone()
+                next_rowid = max(last or 0, int(self._get_meta(conn, "rowid_base", 0))) + 1
+                for row in inserts[ins_cols].itertuples(index=False, name=None):
+                    rowid = conn.execute(sql, [next_rowid] + [to_sql_value(v) for v in row]).lastrowid
+                    next_rowid += 1
+                    new_rowids.append(rowid)
+                    values = dict(zip(ins_cols, row))
+                    log.append(("insert", rowid, values.get(COL_CODE), None, None,
+                                json.dumps({c: to_sql_value(v) for c, v in values.items()}, ensure_ascii=False)))
+            for rowid, values in (updates or {}).items():
+                values = {c: v for c, v in values.items() if c in cols}
+                if values:
+                    select = ", ".join([code_sql] + [quote(c) for c in values])
+                    before = conn.execute(f"SELECT {select} FROM assets WHERE _rowid=?", (int(rowid),)).fetchone()
+                    assignments = ", ".join(f"{quote(c)}=?" for c in values)
+                    conn.execute(
+                        f"UPDATE assets SET {assignments}, _version=_version+1 WHERE _rowid=?",
+                        [to_sql_value(v) for v in values.values()] + [int(rowid)],
+                    )
+                    code = values.get(COL_CODE, before[0])
+                    log.extend(("update", int(rowid), code, c, old, new)
+                               for (c, new), old in zip(values.items(), before[1:]) if not same_value(old, new))
+            if len(deletes):
+                quoted = ", ".join(["_rowid"] + [quote(c) for c in cols])
+                for r in deletes:
+                    row = conn.execute(f"SELECT {quoted} FROM assets WHERE _rowid=?", (int(r),)).fetchone()
+                    if row is not None:
+                        values = dict(zip(cols, row[1:]))
+                        log.append(("delete", int(r), values.get(COL_CODE), None,
+                                    json.dumps(values, ensure_ascii=False), None))
+                conn.executemany("DELETE FROM assets WHERE _rowid=?", [(int(r),) for r in deletes])
+            self._log(conn, log, user)
+            changed = bool(new_rowids or updates or len(deletes))
+            new_revision = self._bump_revision(conn) if changed else old_revision
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return old_revision, new_revision, new_rowids
+
+    # ---------- นำเข้า / ส่งออก Excel ----------
+    def import_excel(self, excel_path=EXCEL_PATH) -> int:
+        from asset_data import load_excel
+
+        df = load_excel(excel_path)
+        with self.lock():
+            return self.import_frame(df)
+
+    def export_excel(self, excel_path=EXCEL_PATH, as_of=None) -> Path:
+        """เขียนไฟล์ Excel ใหม่จากฐานข้อมูล (เขียนไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่ ไฟล์ไม่เสียครึ่งทาง)
+
+        as_of: ส่งออกสภาพข้อมูล ณ เวลานั้นแทนข้อมูลปัจจุบัน
+        """
+        excel_path = Path(excel_path)
+        if as_of is None:
+            _, df, _ = self.read_frame()
+        else:
+            df = self.state_as_of(as_of)
+        tmp = excel_path.with_name(excel_path.stem + ".tmp" + excel_path.suffix)
+        df.to_excel(tmp, index=False)
+        os.replace(tmp, excel_path)
+        return excel_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="นำเข้า/ส่งออกข้อมูลครุภัณฑ์ระหว่าง Excel กับ SQLite")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("excel", nargs="?", default=str(EXCEL_PATH))
+    parser.add_argument("--db", default=str(DB_PATH))
+    parser.add_argument("--as-of", help="(export) สภาพข้อมูล ณ วันที่/เวลา เช่น 2026-01-31 หรือ 2026-01-31T12:00")
+    args = parser.parse_args(argv)
+
+    from asset_partitions import load_map
+
+    if load_map(args.db) is not None:
+        parser.exit(1, "❌ ฐานข้อมูลถูกแบ่งเป็น partition แล้ว ใช้ python asset_partitions.py export / join แทน\n")
+    db = AssetDB(args.db)
+    if args.command == "import":
+        revision = db.import_excel(args.excel)
+        print(f"✔ นำเข้า {args.excel} → {db.path.name} แล้ว (revision {revision})")
+    else:
+        path = db.export_excel(args.excel, as_of=args.as_of)
+        when = f" (ณ {args.as_of})" if args.as_of else ""
+        print(f"✔ ส่งออก {db.path.name}{when} → {path.name} แล้ว")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# asset_export.py
+"""ส่งออกรายการครุภัณฑ์ (ทั้งหมด หรือผลค้นหา) เป็น CSV / JSON-lines / Excel แบบเขียนทีละก้อน
+
+    python asset_export.py assets.csv                                  # ทุกรายการ
+    python asset_export.py found.xlsx --search "กล้องจุลทรรศน์"           # เฉพาะผลค้นหา (เหมือนช่องค้นหาใน Dashboard)
+    python asset_export.py blood.jsonl --location "ธนาคารเลือด" --columns "รหัสเครื่องมือห้องปฏิบัติการ,ชื่อ"
+
+- อ่านข้อมูลทีละ CHUNK_ROWS แถวจากข้อมูลกลาง (ไม่คัดลอกทั้งตาราง) แล้วเขียนต่อท้ายไฟล์ทันที
+- xlsx ใช้ openpyxl แบบ write-only (แถวถูกเขียนลงไฟล์ชั่วคราวทีละแถว ไม่สร้างทั้ง workbook ในหน่วยความจำ)
+  หน่วยความจำจึงคงที่ไม่ว่าจะส่งออกกี่แถว
+- CSV เป็น UTF-8 มี BOM (Excel เปิดภาษาไทยได้ถูก)
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import asset_data
+from asset_db import DB_PATH
+from asset_search import SEARCH_COLUMNS
+
+CHUNK_ROWS = 5000
+SHEET_NAME = "Assets"
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def format_of(path) -> str:
+    fmt = Path(path).suffix.lower().lstrip(".")
+    fmt = {"json": "jsonl", "ndjson": "jsonl"}.get(fmt, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"ไม่รองรับนามสกุล .{fmt} (ใช้ได้: {', '.join(FORMATS)})")
+    return fmt
+
+
+def iter_chunks(df: pd.DataFrame, positions=None, columns=None, chunk_rows=CHUNK_ROWS):
+    """ส่วนของ df ทีละ chunk_rows แถว ตามลำดับ positions (None = ทุกแถว) เฉพาะ columns (None = ทุกคอลัมน์)"""
+    col_idx = [df.columns.get_loc(c) for c in columns] if columns else list(range(len(df.columns)))
+    total = len(df) if positions is None else len(positions)
+    for start in range(0, total, chunk_rows):
+        rows = slice(start, start + chunk_rows) if positions is None else positions[start:start + chunk_rows]
+        yield df.iloc[rows, col_idx]
+
+
+def _header(df, columns) -> list:
+    return [str(c) for c in (columns or df.columns)]
+
+
+def _cell(value):
+    """ค่าที่ openpyxl / json รับได้ (ว่าง = None, numpy → Python)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def iter_csv(df, positions=None, columns=None, chunk_rows=CHUNK_ROWS):
+    """bytes ของไฟล์ CSV ทีละก้อน"""
+    header = pd.DataFrame(columns=_header(df, columns)).to_csv(index=False, lineterminator="\r\n")
+    yield ("\ufeff" + header).encode("utf-8")
+    for chunk in iter_chunks(df, positions, columns, chunk_rows):
+        yield chunk.to_csv(index=False, header=False, lineterminator="\r\n").encode("utf-8")
+
+
+def _json_default(value):
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_jsonl(df, positions=None, columns=None, chunk_rows=CHUNK_ROWS):
+    """bytes ของไฟล์ JSON-lines (หนึ่งรายการต่อบรรทัด) ทีละก้อน"""
+    header = _header(df, columns)
+    for chunk in iter_chunks(df, positions, columns, chunk_rows):
+        lines = (
+            json.dumps(dict(zip(header, map(_cell, row))), ensure_ascii=False, default=_json_default)
+            for row in chunk.itertuples(index=False, name=None)
+        )
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def write_xlsx(out, df, positions=None, columns=None, chunk_rows=CHUNK_ROWS):
+    """เขียน Excel แบบ write-only ลง out (path หรือไฟล์ที่เปิดแบบ binary)"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_NAME)
+    ws.append(_header(df, columns))
+    for chunk in iter_chunks(df, positions, columns, chunk_rows):
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append([_cell(v) for v in row])
+    wb.save(out)
+
+
+def write(out, df, positions=None, columns=None, fmt="csv", chunk_rows=CHUNK_ROWS):
+    """เขียนผลส่งออกลงไฟล์ที่เปิดแบบ binary"""
+    if fmt == "xlsx":
+        write_xlsx(out, df, positions, columns, chunk_rows)
+        return
+    stream = iter_csv if fmt == "csv" else iter_jsonl
+    for block in stream(df, positions, columns, chunk_rows):
+        out.write(block)
+
+
+def export(path, df, positions=None, columns=None, fmt=None, chunk_rows=CHUNK_ROWS) -> Path:
+    """ส่งออกเป็นไฟล์ path (เขียนไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่) รูปแบบตามนามสกุล ถ้าไม่ระบุ fmt"""
+    path = Path(path)
+    fmt = fmt or format_of(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f, df, positions, columns, fmt, chunk_rows)
+    os.replace(tmp, path)
+    return path
+
+
+def export_file(df, positions=None, columns=None, fmt="csv", chunk_rows=CHUNK_ROWS):
+    """ส่งออกลงไฟล์ชั่วคราว คืนไฟล์ที่เปิดอยู่ (ตำแหน่งต้นไฟล์) ใช้เป็น data ของ st.download_button"""
+    f = tempfile.TemporaryFile()
+    write(f, df, positions, columns, fmt, chunk_rows)
+    f.seek(0)
+    return f
+
+
+def select(df, search="", location=None, owner=None, db_path=DB_PATH) -> np.ndarray:
+    """ตำแหน่งแถวที่ตรงเงื่อนไข (คำค้นแบบเดียวกับ Dashboard + สถานที่/ผู้รับผิดชอบที่มีข้อความนี้)"""
+    positions = None
+    if search:
+        positions = np.asarray(asset_data.load_search(SEARCH_COLUMNS, db_path).search(search), dtype=np.int64)
+    for col, text in ((asset_data.COL_LOC, location), (asset_data.COL_OWNER, owner)):
+        if text and col in df.columns:
+            mask = df[col].astype(object).fillna("").astype(str).str.contains(text, regex=False).to_numpy()
+            positions = np.flatnonzero(mask) if positions is None else positions[mask[positions]]
+    return np.arange(len(df)) if positions is None else positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ส่งออกรายการครุภัณฑ์เป็น CSV / JSON-lines / Excel (เขียนทีละก้อน)")
+    parser.add_argument("out", help="ไฟล์ปลายทาง .csv / .jsonl / .xlsx")
+    parser.add_argument("--search", default="", help="คำค้น (ชื่อ / รหัส / AssetID)")
+    parser.add_argument("--location", help="สถานที่ใช้งานที่มีข้อความนี้")
+    parser.add_argument("--owner", help="ผู้รับผิดชอบที่มีข้อความนี้")
+    parser.add_argument("--columns", help="คอลัมน์ที่ส่งออก คั่นด้วยจุลภาค (ค่าเริ่มต้น: ทุกคอลัมน์)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--db", default=str(DB_PATH))
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = format_of(args.out)
+        df = asset_data.load_data(args.db)
+    except (ValueError, FileNotFoundError) as e:
+        parser.exit(1, f"❌ {e}\n")
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    unknown = [c for c in columns or [] if c not in df.columns]
+    if unknown:
+        parser.exit(1, f"❌ ไม่พบคอลัมน์: {', '.join(unknown)}\n")
+
+    positions = select(df, args.search, args.location, args.owner, args.db)
+    path = export(args.out, df, positions, columns, fmt, args.chunk_rows)
+    print(f"✔ ส่งออก {len(positions):,} รายการ → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# asset_import.py
+"""นำเข้าไฟล์ครุภัณฑ์ (Excel / CSV เช่นรายการใหม่จากพัสดุ) แล้วรวมเข้าฐานข้อมูลตามรหัสเครื่องมือ
+
+แยกแต่ละรหัสเป็น เพิ่มใหม่ / เปลี่ยน / ไม่เปลี่ยน / ไม่อยู่ในไฟล์ ด้วยการ merge ทั้งตาราง (ไม่วนทีละแถว)
+ตรวจรหัสว่าง/ซ้ำก่อน แล้วเขียนทุกอย่างใน transaction เดียว จากนั้นสร้าง QR เฉพาะรายการที่ได้รับผล
+(หน้า HTML สร้างใหม่เฉพาะรายการที่ข้อมูลเปลี่ยน ตาม manifest ของ build_pages)
+
+ใช้งาน:
+    python asset_import.py new_items.xlsx              # เพิ่ม/อัปเดตตามไฟล์ (รายการที่ไม่อยู่ในไฟล์คงไว้)
+    python asset_import.py full_inventory.csv --replace   # ไฟล์คือรายการทั้งหมด: ลบรายการที่ไม่อยู่ในไฟล์
+    python asset_import.py new_items.xlsx --dry-run    # ดูผลการจัดกลุ่มโดยไม่เขียน
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import asset_data
+from asset_db import DB_PATH
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+
+
+class ImportValidationError(ValueError):
+    """ไฟล์นำเข้าไม่ผ่านการตรวจ (รหัสว่าง/ซ้ำ, ไม่มีคอลัมน์รหัส)"""
+
+
+def read_source(path) -> pd.DataFrame:
+    """อ่านไฟล์นำเข้า (.xlsx/.xls ชีตแรก หรือ .csv) ตัดแถวว่างทั้งแถว"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"ไม่พบไฟล์: {path}")
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path, encoding="utf-8-sig")
+    else:
+        df = pd.read_excel(path)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df.dropna(how="all").reset_index(drop=True)
+
+
+def _codes(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def _scalar(v) -> str:
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return ""
+    if isinstance(v, (int, float, np.number)) and not isinstance(v, bool):
+        return str(int(v)) if float(v).is_integer() else repr(float(v))
+    return str(v)
+
+
+def _comparable(series: pd.Series) -> np.ndarray:
+    """แปลงค่าเป็นข้อความสำหรับเทียบ ให้ผลเหมือน same_value (ว่าง/NaN = "", 5 = 5.0 = "5")
+
+    คอลัมน์ตัวเลขและคอลัมน์ข้อความแปลงทั้งคอลัมน์ในครั้งเดียว เฉพาะคอลัมน์ชนิดปนกัน (object) ที่แปลงทีละช่อง
+    """
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        num = series.to_numpy(dtype=float, na_value=np.nan)
+        out = np.full(len(num), "", dtype=object)
+        present = ~np.isnan(num)
+        whole = present & (np.mod(num, 1, where=present, out=np.zeros_like(num)) == 0)
+        out[whole] = num[whole].astype(np.int64).astype(str)
+        frac = present & ~whole
+        out[frac] = [repr(float(v)) for v in num[frac]]
+        return out
+    if pd.api.types.is_string_dtype(dtype) and dtype != object:
+        return series.fillna("").to_numpy(dtype=object)
+    return np.array([_scalar(v) for v in series.to_numpy(dtype=object)], dtype=object)
+
+
+def validate(incoming: pd.DataFrame, current: pd.DataFrame):
+    """ตรวจไฟล์นำเข้า คืนรายการคำเตือน (ปัญหาร้ายแรงจะ raise ImportValidationError)"""
+    if COL_CODE not in incoming.columns:
+        raise ImportValidationError(f"ไฟล์นำเข้าไม่มีคอลัมน์ '{COL_CODE}'")
+    codes = _codes(incoming[COL_CODE])
+    problems = []
+    blank = np.flatnonzero((codes == "").to_numpy())
+    if len(blank):
+        problems.append(f"รหัสว่าง {len(blank)} แถว (แถวที่ {', '.join(str(i + 2) for i in blank[:10])})")
+    dup = codes[(codes != "") & codes.duplicated(keep=False)].unique()
+    if len(dup):
+        problems.append(f"รหัสซ้ำในไฟล์นำเข้า {len(dup)} รหัส: {', '.join(dup[:10])}")
+    current_codes = _codes(current[COL_CODE])
+    dup_current = current_codes[(current_codes != "") & current_codes.duplicated(keep=False)]
+    clash = sorted(set(dup_current) & set(codes))
+    if clash:
+        problems.append(f"รหัสที่ซ้ำอยู่แล้วในฐานข้อมูล (จับคู่ไม่ได้): {', '.join(clash[:10])}")
+    if problems:
+        raise ImportValidationError("\n".join(problems))
+
+    warnings = []
+    unknown = [c for c in incoming.columns if c not in current.columns]
+    if unknown:
+        warnings.append(f"ข้ามคอลัมน์ที่ไม่มีในฐานข้อมูล: {', '.join(unknown)}")
+    return warnings
+
+
+def classify(incoming: pd.DataFrame, current: pd.DataFrame, replace=False) -> dict:
+    """จัดกลุ่มการนำเข้าเทียบกับข้อมูลปัจจุบัน (current มี index = _rowid)
+
+    คืน dict:
+    - added     : DataFrame แถวใหม่ (เฉพาะคอลัมน์ที่มีในฐานข้อมูล)
+    - changed   : {_rowid: {คอลัมน์: ค่าใหม่}}
+    - unchanged : จำนวนรหัสที่ข้อมูลเหมือนเดิม
+    - removed   : _rowid ของรายการที่ไม่อยู่ในไฟล์ (ลบจริงเฉพาะ replace=True)
+    - codes     : {"added": [...], "changed": [...], "removed": [...]}
+    """
+    cols = [c for c in incoming.columns if c in current.columns]
+    compare_cols = [c for c in cols if c != COL_CODE]
+
+    left = current[cols].copy()
+    left["_rowid"] = current.index
+    left["_key"] = _codes(current[COL_CODE])
+    left = left[left["_key"] != ""]
+    right = incoming[cols].copy()
+    right["_key"] = _codes(incoming[COL_CODE])
+
+    merged = left.merge(right, on="_key", how="outer", suffixes=("_old", ""), indicator=True, sort=False)
+    both = merged["_merge"] == "both"
+
+    # เทียบทีละคอลัมน์ทั้งตาราง
+    diff = pd.DataFrame(False, index=merged.index, columns=compare_cols)
+    for col in compare_cols:
+        diff[col] = both.to_numpy() & (_comparable(merged[f"{col}_old"]) != _comparable(merged[col]))
+    is_changed = diff.any(axis=1) if compare_cols else pd.Series(False, index=merged.index)
+
+    changed = {}
+    changed_codes = []
+    for i in np.flatnonzero(is_changed.to_numpy()):
+        cols_i = [c for c in compare_cols if diff.iat[i, compare_cols.index(c)]]
+        changed[int(merged.at[i, "_rowid"])] = {c: merged.at[i, c] for c in cols_i}
+        changed_codes.append(merged.at[i, "_key"])
+
+    added_mask = merged["_merge"] == "right_only"
+    added = merged.loc[added_mask, cols].copy()
+    added[COL_CODE] = merged.loc[added_mask, "_key"]
+    removed_mask = merged["_merge"] == "left_only"
+
+    return {
+        "added": added.reset_index(drop=True),
+        "changed": changed,
+        "unchanged": int((both & ~is_changed).sum()),
+        "removed": merged.loc[removed_mask, "_rowid"].astype(int).tolist() if replace else [],
+        "not_in_file": int(removed_mask.sum()),
+        "codes": {
+            "added": added[COL_CODE].tolist(),
+            "changed": changed_codes,
+            "removed": merged.loc[removed_mask, "_key"].tolist() if replace else [],
+        },
+    }
+
+
+def import_file(path, replace=False, dry_run=False, db_path=DB_PATH) -> dict:
+    """อ่าน ตรวจ จัดกลุ่ม แล้ว (ถ้าไม่ใช่ dry_run) เขียนลงฐานข้อมูลในครั้งเดียว คืนผล classify + warnings"""
+    incoming = read_source(path)
+
+    def run():
+        current = asset_data.read_store(db_path)
+        warnings = validate(incoming, current)
+        return {**classify(incoming, current, replace=replace), "warnings": warnings}
+
+    if dry_run:
+        return run()
+    # จัดกลุ่มและเขียนภายใต้ lock เดียวกับ writer (ไม่มีใครแก้แทรกระหว่างเทียบกับเขียน)
+    # ฐานข้อมูลที่แบ่งแล้ว: ล็อกทุก partition แถวใหม่ไปที่ partition ของคำนำหน้ารหัส
+    with asset_data.store_lock(db_path):
+        result = run()
+        result["revision"] = asset_data.apply_import(
+            result["added"], result["changed"], result["removed"],
+            user=f"import ({Path(path).name})", db_path=db_path,
+        )
+    asset_data.clear_cache()
+    return result
+
+
+def rebuild_outputs(result, qr_out=None, pages_out=None, jobs=None, db_path=DB_PATH):
+    """สร้าง QR เฉพาะรายการที่ได้รับผล ลบ QR ของรายการที่ถูกลบ และอัปเดตหน้า HTML"""
+    from build_pages_and_qr import OUTPUT_PAGES, OUTPUT_QR, build_pages, build_qr, remove_qr
+
+    codes = result["codes"]
+    summary = {}
+    if qr_out is not False:
+        out = qr_out or OUTPUT_QR
+        summary["qr"] = build_qr(codes["added"] + codes["changed"], out, jobs=jobs, prune=False)
+        summary["qr"]["removed"] = remove_qr(codes["removed"], out)
+    if pages_out is not False:
+        summary["pages"] = build_pages(asset_data.load_data(db_path), pages_out or OUTPUT_PAGES)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="นำเข้าไฟล์ครุภัณฑ์ (Excel/CSV) แล้วรวมเข้าฐานข้อมูลตามรหัสเครื่องมือ")
+    parser.add_argument("source", help="ไฟล์ .xlsx หรือ .csv")
+    parser.add_argument("--replace", action="store_true", help="ไฟล์คือรายการทั้งหมด: ลบรายการที่ไม่อยู่ในไฟล์")
+    parser.add_argument("--dry-run", action="store_true", help="แสดงผลการจัดกลุ่มโดยไม่เขียน")
+    parser.add_argument("--db", default=str(DB_PATH))
+    parser.add_argument("--skip-qr", action="store_true", help="ไม่สร้าง QR")
+    parser.add_argument("--skip-pages", action="store_true", help="ไม่สร้างหน้า HTML")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--report", help="เขียนรายการรหัสแต่ละกลุ่มเป็น JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        result = import_file(args.source, replace=args.replace, dry_run=args.dry_run, db_path=args.db)
+    except ImportValidationError as e:
+        parser.exit(1, f"❌ นำเข้าไม่ได้:\n{e}\n")
+
+    for w in result["warnings"]:
+        print(f"⚠ {w}")
+    print(
+        f"{'(ทดลอง) ' if args.dry_run else ''}เพิ่มใหม่ {len(result['codes']['added'])}, "
+        f"เปลี่ยน {len(result['changed'])}, ไม่เปลี่ยน {result['unchanged']}, "
+        + (f"ลบ {len(result['removed'])}" if args.replace else f"ไม่อยู่ในไฟล์ (คงไว้) {result['not_in_file']}")
+    )
+    if args.report:
+        Path(args.report).write_text(json.dumps(result["codes"], ensure_ascii=False, indent=1), encoding="utf-8")
+
+    if not args.dry_run:
+        print(f"✔ บันทึกแล้ว (revision {result['revision']})")
+        summary = rebuild_outputs(
+            result,
+            qr_out=False if args.skip_qr else None,
+            pages_out=False if args.skip_pages else None,
+            jobs=args.jobs,
+            db_path=args.db,
+        )
+        if "qr" in summary:
+            print(f"🔳 QR: สร้าง {len(summary['qr']['built'])}, ลบ {len(summary['qr']['removed'])}")
+            for code in summary["qr"]["skipped"]:
+                print(f"  ⚠️ ข้าม QR ของรหัสที่ใช้เป็นชื่อไฟล์ไม่ได้: {code!r}")
+        if "pages" in summary:
+            print(f"🌐 หน้า HTML: สร้างใหม่ {len(summary['pages']['built'])}, ลบ {len(summary['pages']['removed'])}")
+            for code in summary["pages"]["skipped"]:
+                print(f"  ⚠️ ข้ามหน้า HTML ของรหัส {code!r} (ใช้เป็นชื่อไฟล์ไม่ได้ / ชื่อสงวน)")
+
+
+if __name__ == "__main__":
+    main()
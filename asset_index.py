@@ -0,0 +1,74 @@
+# asset_index.py
+"""ดัชนีค้นหาแถวจากรหัสเครื่องมือ / AssetID แบบ O(1)
+
+สร้างครั้งเดียวต่อ snapshot ของข้อมูล แล้วอัปเดตเฉพาะแถวที่ถูกบันทึก
+(แทนการ astype(str) แล้วเทียบทั้งคอลัมน์ทุกครั้งที่สแกน QR)
+"""
+import pandas as pd
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_ASSET = "AssetID"
+
+
+def normalize_key(value) -> str:
+    """แปลงค่าในเซลล์ให้เป็น key เดียวกับที่มาจาก URL (?code=...)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+class AssetIndex:
+    """map รหัส → ตำแหน่งแถว (position ไม่ใช่ label) ของ DataFrame
+
+    ถ้ารหัสซ้ำ จะชี้ไปแถวแรกเสมอ (เหมือนพฤติกรรมเดิม match_idx[0])
+    และเก็บรายการรหัสซ้ำไว้ใน ``duplicates`` ให้หน้าเว็บแจ้งเตือนได้
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=(COL_CODE, COL_ASSET)):
+        self.columns = [c for c in columns if c in df.columns]
+        self._maps = {}   # {col: {key: [pos, ...]}}
+        for col in self.columns:
+            positions = {}
+            for pos, value in enumerate(df[col].tolist()):
+                key = normalize_key(value)
+                if key:
+                    positions.setdefault(key, []).append(pos)
+            self._maps[col] = positions
+
+    # ---------- ค้นหา ----------
+    def find(self, col, key):
+        """คืนตำแหน่งแถวแรกของ key ในคอลัมน์ col หรือ None ถ้าไม่พบ"""
+        positions = self._maps.get(col, {}).get(normalize_key(key))
+        return positions[0] if positions else None
+
+    def find_code(self, code):
+        return self.find(COL_CODE, code)
+
+    def find_asset(self, asset_id):
+        return self.find(COL_ASSET, asset_id)
+
+    def duplicates(self, col=COL_CODE) -> dict:
+        """{key: [pos, ...]} เฉพาะ key ที่มีมากกว่า 1 แถว"""
+        return {k: list(v) for k, v in self._maps.get(col, {}).items() if len(v) > 1}
+
+    # ---------- อัปเดตเมื่อบันทึกแถว ----------
+    def update_row(self, pos, old_values: dict, new_values: dict):
+        """ย้าย key ของแถว pos จากค่าเดิมไปค่าใหม่ (เฉพาะคอลัมน์ที่ทำดัชนีไว้)"""
+        for col in self.columns:
+            if col not in new_values:
+                continue
+            old_key = normalize_key(old_values.get(col))
+            new_key = normalize_key(new_values.get(col))
+            if old_key == new_key:
+                continue
+            positions = self._maps[col]
+            if old_key in positions:
+                bucket = positions[old_key]
+                if pos in bucket:
+                    bucket.remove(pos)
+                if not bucket:
+                    del positions[old_key]
+            if new_key:
+                bucket = positions.setdefault(new_key, [])
+                bucket.append(pos)
+                bucket.sort()
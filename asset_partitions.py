@@ -0,0 +1,276 @@
+# asset_partitions.py
+"""แบ่งข้อมูลครุภัณฑ์เป็นหลายฐานข้อมูลตามคำนำหน้ารหัส (แผนก/ห้องปฏิบัติการ เช่น LAB-AS-001 → LAB-AS)
+
+    python asset_partitions.py split          # แบ่ง smart_asset.db (หรือ Excel ถ้ายังไม่มี) เป็น smart_asset.<คำนำหน้า>.db
+    python asset_partitions.py list           # จำนวนรายการต่อ partition
+    python asset_partitions.py export out/    # ส่งออก Excel หนึ่งไฟล์ต่อ partition (out/LAB-AS.xlsx ...)
+    python asset_partitions.py join           # รวมกลับเป็น smart_asset.db ไฟล์เดียว
+
+- รายชื่อ partition อยู่ใน smart_asset.partitions.json ข้างฐานข้อมูล ถ้าไม่มีไฟล์นี้ = ไฟล์เดียวแบบเดิม
+- partition ที่ n ใช้ _rowid ในช่วง n × SPAN ขึ้นไป _rowid จึงไม่ซ้ำข้าม partition และรู้ partition ได้จาก _rowid
+  ไฟล์เดียว (ก่อน split / หลัง join) ใช้ _rowid ต่ำกว่า SPAN เสมอ แบ่ง/รวมกี่รอบก็ได้
+- แต่ละ partition มี lock / revision / writer / ประวัติ ของตัวเอง การบันทึกเขียนเฉพาะไฟล์ของแถวนั้น
+- asset_data ใช้ไฟล์นี้เลือก partition: ค้นด้วยรหัส (load_row) โหลดเฉพาะ partition ของคำนำหน้านั้น
+  ส่วน load_data() ยังคืนข้อมูลรวมทุก partition ให้ dashboard
+
+smart_asset.db เดิมไม่ถูกลบตอน split (เป็นสำเนาก่อนแบ่ง ไม่ถูกใช้อีกจนกว่าจะ join)
+"""
+import argparse
+import json
+import os
+import re
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from asset_db import COL_CODE, DB_PATH, AssetDB
+
+SPAN = 10 ** 9
+DEFAULT_KEY = "OTHER"   # รหัสว่าง/ไม่มีขีด
+MANIFEST_VERSION = 1
+LOCK_TIMEOUT = 2.0   # วินาที: รอผู้เขียนที่ถือ lock อยู่ก่อนยกเลิกการแบ่ง/รวม
+
+_lock = threading.Lock()
+_maps = {}   # {manifest_path: (mtime_ns, PartitionMap)}
+
+
+def partition_key(code) -> str:
+    """คำนำหน้าของรหัส (ทุกอย่างก่อนขีดสุดท้าย) เช่น "lab-as-001" → "LAB-AS" """
+    prefix, sep, _ = str(code if code is not None else "").strip().upper().rpartition("-")
+    return prefix if sep and prefix else DEFAULT_KEY
+
+
+def manifest_path(db_path=DB_PATH) -> Path:
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.stem + ".partitions.json")
+
+
+def _file_name(db_path, key) -> str:
+    db_path = Path(db_path)
+    return f"{db_path.stem}.{re.sub(r'[^0-9A-Za-z_-]', '_', key)}{db_path.suffix}"
+
+
+class PartitionMap:
+    """คำนำหน้า → ไฟล์ฐานข้อมูล (จาก manifest)"""
+
+    def __init__(self, db_path, partitions: dict):
+        self.db_path = Path(db_path)
+        self.partitions = partitions   # {key: {"number": n, "file": ชื่อไฟล์}}
+        self._by_number = {p["number"]: key for key, p in partitions.items()}
+
+    def keys(self) -> list:
+        return sorted(self.partitions, key=lambda k: self.partitions[k]["number"])
+
+    def path(self, key) -> Path:
+        return self.db_path.with_name(self.partitions[key]["file"])
+
+    def paths(self) -> list:
+        """ไฟล์ของทุก partition เรียงตามช่วง _rowid"""
+        return [self.path(k) for k in self.keys()]
+
+    def path_for_code(self, code) -> Path | None:
+        key = partition_key(code)
+        return self.path(key) if key in self.partitions else None
+
+    def path_for_rowid(self, rowid) -> Path | None:
+        key = self._by_number.get(int(rowid) // SPAN)
+        return self.path(key) if key is not None else None
+
+    def rowid_base(self, key) -> int:
+        return self.partitions[key]["number"] * SPAN
+
+
+def load_map(db_path=DB_PATH) -> PartitionMap | None:
+    """รายชื่อ partition ของฐานข้อมูล db_path หรือ None ถ้ายังไม่ได้แบ่ง (อ่าน manifest ใหม่เมื่อไฟล์เปลี่ยน)"""
+    path = manifest_path(db_path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _lock:
+        cached = _maps.get(str(path))
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            cached = (mtime, PartitionMap(db_path, manifest["partitions"]))
+            _maps[str(path)] = cached
+        return cached[1]
+
+
+def _write_manifest(db_path, partitions: dict):
+    path = manifest_path(db_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "partitions": partitions}, ensure_ascii=False, indent=1),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def add_partition(db_path, key, columns) -> Path:
+    """สร้าง partition ว่างของคำนำหน้าใหม่ (เช่นตอนนำเข้ารหัสแผนกใหม่) คืนไฟล์ฐานข้อมูล"""
+    current = load_map(db_path)
+    partitions = dict(current.partitions) if current else {}
+    if key in partitions:
+        return current.path(key)
+    number = max((p["number"] for p in partitions.values()), default=0) + 1
+    partitions[key] = {"number": number, "file": _file_name(db_path, key)}
+    path = Path(db_path).with_name(partitions[key]["file"])
+    AssetDB(path).import_frame(pd.DataFrame(columns=list(columns)), history=pd.DataFrame(
+        columns=["ts", "op", "row", "code", "col", "old", "new", "user"]
+    ), rowid_base=number * SPAN)
+    _write_manifest(db_path, partitions)
+    return path
+
+
+@contextmanager
+def _exclusive(paths, timeout=LOCK_TIMEOUT):
+    """ถือ file lock ของทุกไฟล์ตลอดการแบ่ง/รวม ถ้ามีผู้เขียน (เช่นแอปที่กำลังบันทึก) ถืออยู่ ไม่ทำ"""
+    with ExitStack() as stack:
+        for path in paths:
+            try:
+                stack.enter_context(AssetDB(path).lock(timeout))
+            except TimeoutError:
+                raise ValueError(
+                    f"{Path(path).name} กำลังถูกเขียนอยู่ (แอปกำลังบันทึกข้อมูล) ลองใหม่อีกครั้ง หรือปิดแอปก่อน"
+                ) from None
+        yield
+
+
+def split(db_path=DB_PATH) -> PartitionMap:
+    """แบ่งฐานข้อมูลไฟล์เดียวเป็น partition ตามคำนำหน้ารหัส (ย้ายประวัติของแต่ละแถวไปด้วย)"""
+    if load_map(db_path) is not None:
+        raise ValueError("ฐานข้อมูลนี้ถูกแบ่งไว้แล้ว")
+    import asset_data
+
+    asset_data.get_db(db_path)   # นำเข้าจาก Excel ถ้ายังไม่มีฐานข้อมูล
+    asset_data.release([db_path])   # writer ของ process นี้เขียนคิวที่ค้างให้เสร็จก่อน
+    source = AssetDB(db_path)
+    with _exclusive([db_path]):
+        _, df, _ = source.read_frame()
+        history = source.read_history()
+
+        keys = df[COL_CODE].map(partition_key) if COL_CODE in df.columns else pd.Series(DEFAULT_KEY, index=df.index)
+        # ประวัติของแถวที่ยังอยู่ตามแถว ของแถวที่ถูกลบไปแล้วตามคำนำหน้าของรหัสในประวัติ
+        # การนำเข้าทั้งหมด (row ว่าง) ใส่ทุก partition
+        history_keys = history["row"].map(keys).fillna(history["code"].map(partition_key))
+        history_keys[history["row"].isna()] = None
+
+        groups = sorted(df.groupby(keys, sort=False), key=lambda kv: kv[0])
+        partitions = {key: {"number": n, "file": _file_name(db_path, key)} for n, (key, _) in enumerate(groups, start=1)}
+        paths = [Path(db_path).with_name(p["file"]) for p in partitions.values()]
+        for path in paths:
+            if path.exists():
+                raise FileExistsError(f"มีไฟล์ {path.name} อยู่แล้ว (ลบก่อนแบ่งใหม่)")
+        # การเชื่อมต่อ/writer ที่ค้างจากรอบก่อน (ไฟล์ชื่อเดียวกันที่ join ลบไปแล้ว) ต้องไม่ถูกใช้ต่อ
+        asset_data.release(paths)
+
+        for (key, part), path in zip(groups, paths):
+            base = partitions[key]["number"] * SPAN
+            # _rowid ของไฟล์เดียวต่ำกว่า SPAN (ดู join) → เลื่อนเข้าช่วงของ partition
+            part_history = history[history_keys.isna() | (history_keys == key)].copy()
+            part_history["row"] = part_history["row"].map(lambda r: None if pd.isna(r) else base + int(r) % SPAN)
+            rowids = base + part.index.to_numpy() % SPAN
+            db = AssetDB(path)
+            db.import_frame(part, rowids=rowids, history=part_history, rowid_base=base)
+            db.close()
+        _write_manifest(db_path, partitions)
+    source.close()
+    asset_data.release([db_path])
+    asset_data.clear_cache()
+    return load_map(db_path)
+
+
+def join(db_path=DB_PATH) -> int:
+    """รวมทุก partition กลับเป็นฐานข้อมูลไฟล์เดียว (เขียนทับ db_path) แล้วลบไฟล์ partition คืนจำนวนแถว"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        raise ValueError("ฐานข้อมูลนี้ยังไม่ได้แบ่ง")
+    import asset_data
+
+    paths = partitions.paths()
+    asset_data.release(paths + [Path(db_path)])   # writer ของ process นี้เขียนคิวที่ค้างให้เสร็จ แล้วปิดไฟล์
+    dbs = [AssetDB(p) for p in paths]
+    with _exclusive(paths + [Path(db_path)]):
+        frames, histories = [], []
+        for db in dbs:
+            _, df, _ = db.read_frame()
+            frames.append(df)
+            histories.append(db.read_history())
+        df = pd.concat(frames)
+        history = pd.concat(histories, ignore_index=True)
+        # การนำเข้าทั้งหมดถูกคัดลอกไปทุก partition → เหลือครั้งเดียว
+        history = history.drop_duplicates().sort_values("ts", kind="stable")
+
+        # กลับเป็น _rowid ช่วงไฟล์เดียว (ต่ำกว่า SPAN): ใช้ _rowid % SPAN เดิม
+        # แถวที่เพิ่มหลัง split อาจได้เลขซ้ำกับ partition อื่น → ให้เลขใหม่ต่อท้าย
+        local = pd.Index(df.index.to_numpy() % SPAN)
+        rowids = local.to_numpy().copy()
+        clash = local.duplicated(keep="first")
+        if clash.any():
+            rowids[clash] = rowids.max() + 1 + np.arange(clash.sum())
+        renumber = dict(zip(df.index.tolist(), rowids.tolist()))
+        history["row"] = history["row"].map(
+            lambda r: None if pd.isna(r) else renumber.get(int(r), int(r) % SPAN)
+        )
+
+        target = AssetDB(db_path)
+        target.import_frame(df, rowids=rowids, history=history)
+        target.close()
+        os.remove(manifest_path(db_path))
+        for db in dbs:
+            db.close()
+            for suffix in ("", "-wal", "-shm"):
+                Path(str(db.path) + suffix).unlink(missing_ok=True)
+    for db in dbs:
+        Path(str(db.path) + ".lock").unlink(missing_ok=True)
+    asset_data.release(paths + [Path(db_path)])
+    asset_data.clear_cache()
+    return len(df)
+
+
+def export_workbooks(out_dir, db_path=DB_PATH) -> list:
+    """ส่งออก Excel หนึ่งไฟล์ต่อ partition คืนรายการไฟล์"""
+    partitions = load_map(db_path)
+    if partitions is None:
+        raise ValueError("ฐานข้อมูลนี้ยังไม่ได้แบ่ง (ใช้ python asset_db.py export)")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return [AssetDB(partitions.path(k)).export_excel(out_dir / f"{k}.xlsx") for k in partitions.keys()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="แบ่ง/รวมฐานข้อมูลครุภัณฑ์ตามคำนำหน้ารหัส")
+    parser.add_argument("command", choices=["split", "join", "list", "export"])
+    parser.add_argument("out_dir", nargs="?", default="partitions_export", help="(export) โฟลเดอร์ปลายทาง")
+    parser.add_argument("--db", default=str(DB_PATH))
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "split":
+            partitions = split(args.db)
+            print(f"✔ แบ่งเป็น {len(partitions.keys())} partition: {', '.join(partitions.keys())}")
+            print(f"  ({Path(args.db).name} เดิมเก็บไว้เป็นสำเนาก่อนแบ่ง)")
+        elif args.command == "join":
+            print(f"✔ รวม {join(args.db):,} รายการกลับเป็น {Path(args.db).name} แล้ว")
+        elif args.command == "export":
+            for path in export_workbooks(args.out_dir, args.db):
+                print(f"✔ {path}")
+        else:
+            partitions = load_map(args.db)
+            if partitions is None:
+                print("ยังไม่ได้แบ่ง (ไฟล์เดียว)")
+                return
+            for key in partitions.keys():
+                db = AssetDB(partitions.path(key))
+                (count,) = db.connect().execute("SELECT count(*) FROM assets").fetchone()
+                print(f"{key:<16} {count:>8,} รายการ  {db.path.name}")
+    except (ValueError, FileExistsError) as e:
+        parser.exit(1, f"❌ {e}\n")
+
+
+if __name__ == "__main__":
+    main()
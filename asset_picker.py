@@ -0,0 +1,111 @@
+# asset_picker.py
+"""ช่องเลือกครุภัณฑ์แบบพิมพ์แล้วแนะนำ (type-ahead) แทน selectbox ที่ส่งทุกรายการไปเบราว์เซอร์
+
+- PrefixIndex: list ของ (รหัส/AssetID ที่ normalize แล้ว, ตำแหน่งแถว) เรียงไว้ หา prefix ด้วย bisect
+  สร้างครั้งเดียวต่อ snapshot ของข้อมูล (asset_data.load_picker) แล้วปรับทีละแถวเมื่อบันทึก (เหมือน AssetIndex)
+- พิมพ์ต้นรหัส เช่น "lab-as-01" → รหัสที่ขึ้นต้นด้วยข้อความนั้นก่อน ไม่ครบ TOP_K ค่อยเติมจากดัชนี n-gram
+  (ส่วนกลางของรหัส เช่น "010" หรือชื่อ)
+- selectbox มีแค่ TOP_K ตัวเลือก สร้างข้อความ "รหัส - ชื่อ" เฉพาะตัวเลือกที่แสดง
+"""
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+from asset_search import normalize
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_NAME = "ชื่อ"
+COL_ASSET = "AssetID"
+
+TOP_K = 20
+
+
+class PrefixIndex:
+    """(key, pos) เรียงตาม key ของคอลัมน์รหัส / AssetID (ค่าว่างไม่เก็บ)"""
+
+    def __init__(self, df: pd.DataFrame, columns=(COL_CODE, COL_ASSET)):
+        self.columns = [c for c in columns if c in df.columns]
+        self._entries = {
+            col: sorted((normalize(v), pos) for pos, v in enumerate(df[col].tolist()) if normalize(v))
+            for col in self.columns
+        }
+
+    def complete(self, prefix, k=TOP_K, within=None) -> list:
+        """ตำแหน่งแถวที่รหัส (แล้วจึง AssetID) ขึ้นต้นด้วย prefix ไม่เกิน k แถว เรียงตามรหัส
+
+        within: กรองเฉพาะตำแหน่งในชุดนี้ (set) เช่นผลค้นหาของหน้า
+        """
+        prefix = normalize(prefix)
+        found = {}
+        for col in self.columns:
+            entries = self._entries[col]
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(found) < k and entries[i][0].startswith(prefix):
+                pos = entries[i][1]
+                if within is None or pos in within:
+                    found.setdefault(pos, None)
+                i += 1
+        return list(found)
+
+    # ---------- อัปเดตเมื่อบันทึกแถว ----------
+    def update_row(self, pos, old_values: dict, new_values: dict):
+        for col in self.columns:
+            if col not in new_values:
+                continue
+            old, new = normalize(old_values.get(col)), normalize(new_values.get(col))
+            if old == new:
+                continue
+            entries = self._entries[col]
+            if old:
+                i = bisect_left(entries, (old, pos))
+                if i < len(entries) and entries[i] == (old, pos):
+                    del entries[i]
+            if new:
+                insort(entries, (new, pos))
+
+
+def suggest(picker: PrefixIndex, search, text, k=TOP_K, within=None) -> list:
+    """ตัวเลือกไม่เกิน k แถวของข้อความที่พิมพ์ (prefix ก่อน แล้วเติมจาก search.search)
+
+    within: list ตำแหน่งแถวที่เลือกได้ (None = ทุกแถว) ถ้าไม่ได้พิมพ์อะไรคืน k แถวแรกของ within
+    """
+    allowed = None if within is None else set(within)
+    if not normalize(text):
+        if within is not None:
+            return list(within[:k])
+        return picker.complete("", k)
+    found = picker.complete(text, k, allowed)
+    if len(found) < k:
+        seen = set(found)
+        for pos in search.search(text, limit=None if allowed is not None else 2 * k):
+            if pos not in seen and (allowed is None or pos in allowed):
+                found.append(pos)
+                seen.add(pos)
+                if len(found) >= k:
+                    break
+    return found
+
+
+def option_label(df: pd.DataFrame, pos) -> str:
+    code = df.iat[pos, df.columns.get_loc(COL_CODE)] if COL_CODE in df.columns else ""
+    name = df.iat[pos, df.columns.get_loc(COL_NAME)] if COL_NAME in df.columns else ""
+    return f"{'' if pd.isna(code) else code} - {'' if pd.isna(name) else name}"
+
+
+# ---------- ช่องเลือกใน Streamlit ----------
+def render_picker(df, picker, search, label, key, within=None, k=TOP_K):
+    """ช่องพิมพ์รหัส/ชื่อ + selectbox ของ k ตัวเลือกที่ตรงที่สุด คืนตำแหน่งแถวที่เลือก หรือ None"""
+    import streamlit as st
+
+    text = st.text_input(label, key=f"{key}_text", placeholder="พิมพ์ต้นรหัส / AssetID / ชื่อ เช่น LAB-AS-01")
+    positions = suggest(picker, search, text, k, within)
+    if not positions:
+        st.info(f"ไม่พบรายการที่ตรงกับ “{text}”")
+        return None
+    labels = {pos: option_label(df, pos) for pos in positions}
+    return st.selectbox(
+        f"ผลลัพธ์ ({len(positions)} รายการแรก)" if len(positions) >= k else "ผลลัพธ์",
+        positions,
+        format_func=labels.get,
+        key=f"{key}_select",
+    )
@@ -0,0 +1,156 @@
+# asset_search.py
+"""ดัชนีค้นหาแบบ n-gram (ตัวอักษร 3 ตัว) สำหรับช่องค้นหาใน Dashboard / QR Assets
+
+ภาษาไทยไม่มีช่องว่างระหว่างคำ จึงใช้ n-gram ของตัวอักษรแทนการตัดคำ ใช้ได้ทั้งชื่อภาษาไทยและรหัส
+- คำค้นยาว ≥ 3 ตัวอักษร: intersect posting list ของ trigram แล้วตรวจยืนยันเฉพาะแถวที่เป็นผู้สมัคร
+- คำค้นสั้นกว่านั้น: ไล่ตรวจข้อความที่ normalize ไว้แล้ว (ยังเร็วกว่า str.contains หลายคอลัมน์)
+- แยกคำค้นด้วยช่องว่าง ทุกคำต้องพบ (AND) ผลลัพธ์เรียงตามความตรง: รหัสตรงทั้งหมด > ขึ้นต้นด้วย > มีอยู่ในข้อความ
+  (ถ้าผลลัพธ์มากเกิน RANK_LIMIT จะเรียงตามลำดับแถวแทน)
+"""
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+COL_NAME = "ชื่อ"
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_ASSET = "AssetID"
+
+# คอลัมน์ที่ Dashboard ค้น (ชื่อ / รหัส / AssetID)
+SEARCH_COLUMNS = (COL_NAME, COL_CODE, COL_ASSET)
+
+# คอลัมน์ที่หน้า QR Assets ค้น (ข้อมูลหลักทุกช่องที่เป็นข้อความ)
+SEARCH_COLUMNS_ALL = (
+    COL_CODE, COL_ASSET, COL_NAME, "ยี่ห้อ", "โมเดล", "หมายเลขเครื่อง",
+    "สถานะ", "สถานที่ใช้งาน (ปัจจุบัน)", "ผู้รับผิดชอบ (ปัจจุบัน)",
+)
+
+NGRAM = 3
+FIELD_SEP = "\x1f"   # คั่นระหว่างคอลัมน์ ไม่ให้ n-gram คร่อมสองคอลัมน์
+
+# น้ำหนักตามคอลัมน์ (ลำดับใน columns: คอลัมน์แรก ๆ สำคัญกว่า)
+_EXACT, _PREFIX, _CONTAINS = 100, 10, 1
+
+# ผลลัพธ์มากกว่านี้ (คำค้นกว้าง เช่น "lab") จะไม่จัดอันดับ คืนตามลำดับแถว
+RANK_LIMIT = 5000
+
+
+def normalize(value) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    text = unicodedata.normalize("NFC", str(value)).lower()
+    return " ".join(text.split())
+
+
+def _grams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SearchIndex:
+    """posting list ของ trigram → ตำแหน่งแถว (numpy array เรียงแล้ว)
+
+    การอัปเดตแถว (update_row) ไม่แก้ posting หลัก แต่จด ``_stale`` (แถวที่ posting หลักใช้ไม่ได้แล้ว)
+    กับ ``_delta`` (posting ของค่าใหม่) ไว้แยก จึงอัปเดตได้ทันทีโดยไม่ต้องสร้างดัชนีใหม่ทั้งก้อน
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=SEARCH_COLUMNS):
+        self.columns = [c for c in columns if c in df.columns]
+        self._fields = []    # ต่อแถว: tuple ของข้อความที่ normalize แล้ว ตามลำดับ columns
+        self._docs = []      # ต่อแถว: ข้อความทุกคอลัมน์ต่อกัน
+        postings = defaultdict(list)
+        values = [df[c].tolist() for c in self.columns]
+        for pos, row in enumerate(zip(*values)):
+            fields = tuple(normalize(v) for v in row)
+            doc = FIELD_SEP.join(fields)
+            self._fields.append(fields)
+            self._docs.append(doc)
+            for g in {doc[i:i + NGRAM] for i in range(len(doc) - NGRAM + 1)}:
+                postings[g].append(pos)
+        self._base = {g: np.array(p, dtype=np.int32) for g, p in postings.items()}
+        self._stale = set()
+        self._delta = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ---------- อัปเดตเมื่อบันทึกแถว ----------
+    def update_row(self, pos, row: dict):
+        """แทนข้อความของแถว pos ด้วยค่าใหม่ (row คือ {คอลัมน์: ค่า} อย่างน้อยคอลัมน์ที่เปลี่ยน)"""
+        old = self._fields[pos]
+        fields = tuple(
+            normalize(row[c]) if c in row else old[i] for i, c in enumerate(self.columns)
+        )
+        if fields == old:
+            return
+        for g in _grams(self._docs[pos]):
+            bucket = self._delta.get(g)
+            if bucket is not None:
+                bucket.discard(pos)
+        self._stale.add(pos)
+        self._fields[pos] = fields
+        self._docs[pos] = FIELD_SEP.join(fields)
+        for g in _grams(self._docs[pos]):
+            self._delta.setdefault(g, set()).add(pos)
+
+    # ---------- ค้นหา ----------
+    def _postings(self, gram):
+        base = self._base.get(gram)
+        delta = self._delta.get(gram)
+        if base is None:
+            base = np.empty(0, dtype=np.int32)
+        if self._stale and len(base):
+            base = base[~np.isin(base, np.fromiter(self._stale, dtype=np.int32))]
+        if delta:
+            base = np.union1d(base, np.fromiter(delta, dtype=np.int32))
+        return base
+
+    def _match_term(self, term, candidates):
+        if len(term) >= NGRAM:
+            lists = sorted((self._postings(g) for g in _grams(term)), key=len)
+            found = lists[0]
+            for other in lists[1:]:
+                if not len(found):
+                    break
+                found = np.intersect1d(found, other, assume_unique=True)
+            if candidates is not None:
+                found = np.intersect1d(found, candidates, assume_unique=True)
+            docs = self._docs
+            # trigram ครบไม่ได้แปลว่าเจอทั้งคำ → ตรวจยืนยันอีกชั้น
+            return np.fromiter((p for p in found.tolist() if term in docs[p]), dtype=np.int64)
+
+        docs = self._docs
+        pool = range(len(docs)) if candidates is None else candidates.tolist()
+        return np.fromiter((p for p in pool if term in docs[p]), dtype=np.int64)
+
+    def _score(self, pos, terms):
+        score = 0
+        n = len(self.columns)
+        for i, text in enumerate(self._fields[pos]):
+            weight = n - i
+            for term in terms:
+                if text == term:
+                    score += _EXACT * weight
+                elif text.startswith(term):
+                    score += _PREFIX * weight
+                elif term in text:
+                    score += _CONTAINS * weight
+        return score
+
+    def search(self, query, limit=None) -> list:
+        """คืนตำแหน่งแถวที่ตรงกับคำค้น เรียงจากตรงที่สุด (ถ้าไม่มีคำค้นคืน list ว่าง)"""
+        terms = normalize(query).split()
+        if not terms:
+            return []
+        candidates = None
+        # คำยาวกรองได้แคบกว่า ทำก่อน
+        for term in sorted(terms, key=len, reverse=True):
+            candidates = self._match_term(term, candidates)
+            if not len(candidates):
+                return []
+        positions = candidates.tolist()
+        if len(positions) <= RANK_LIMIT:
+            positions.sort(key=lambda p: (-self._score(p, terms), p))
+        else:
+            positions.sort()
+        return positions[:limit] if limit else positions
@@ -0,0 +1,143 @@
+# asset_summary.py
+"""ตัวเลขสรุปของข้อมูลครุภัณฑ์ (จำนวนตามสถานที่ / ผู้รับผิดชอบ, ไม่มีรูป, ไม่มี QR)
+
+สร้างครั้งเดียวต่อ snapshot ของข้อมูล (asset_data.load_summary) แล้วปรับเฉพาะส่วนต่างเมื่อบันทึกแถว
+(เหมือน AssetIndex) หน้า Dashboard / ภาพรวม จึงไม่ต้อง groupby ทั้งตารางทุก rerun
+"""
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+COL_OWNER = "ผู้รับผิดชอบ (ปัจจุบัน)"
+COL_IMAGE = "รูปภาพ"
+
+GROUP_COLUMNS = (COL_LOC, COL_OWNER)
+BLANK_LABEL = "(ไม่ระบุ)"
+CHART_TOP = 15   # แผนภูมิแสดงกลุ่มใหญ่สุดเท่านี้ ที่เหลือรวมเป็น "อื่น ๆ"
+
+_manifest_lock = threading.Lock()
+_manifest_memo = {}   # {qr_dir: (mtime_ns, frozenset รหัสที่มี QR)}
+
+
+def _label(value) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def _labels(series: pd.Series) -> pd.Series:
+    """แปลงทั้งคอลัมน์แบบเดียวกับ _label (ว่าง/NaN = "", ตัดช่องว่างหัวท้าย)"""
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def _value_counts(series: pd.Series) -> Counter:
+    counts = _labels(series).value_counts(sort=False)
+    return Counter(dict(zip(counts.index.tolist(), counts.tolist())))
+
+
+def qr_codes(qr_dir) -> frozenset:
+    """รหัสที่มีไฟล์ QR แล้ว (จาก manifest ของ build_qr) อ่านใหม่เมื่อ manifest เปลี่ยน"""
+    from build_pages_and_qr import MANIFEST_NAME, load_manifest
+
+    path = Path(qr_dir) / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return frozenset()
+    with _manifest_lock:
+        cached = _manifest_memo.get(str(qr_dir))
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, frozenset(load_manifest(qr_dir)))
+            _manifest_memo[str(qr_dir)] = cached
+        return cached[1]
+
+
+class AssetSummary:
+    """ตัวนับของข้อมูลหนึ่ง snapshot
+
+    - counts[col]   : Counter ค่าในคอลัมน์ → จำนวนแถว (ค่าว่างนับเป็น "")
+    - missing_photo : จำนวนแถวที่ไม่มีรูปภาพ
+    - missing_code  : จำนวนแถวที่ไม่มีรหัส (สร้าง QR ไม่ได้)
+    """
+
+    def __init__(self, df: pd.DataFrame, columns=GROUP_COLUMNS):
+        self.total = len(df)
+        self.columns = [c for c in columns if c in df.columns]
+        self.counts = {col: _value_counts(df[col]) for col in self.columns}
+        self.codes = _value_counts(df[COL_CODE]) if COL_CODE in df.columns else Counter()
+        self.missing_code = self.codes.pop("", 0)
+        self.missing_photo = int(_labels(df[COL_IMAGE]).eq("").sum()) if COL_IMAGE in df.columns else self.total
+        self._version = 0
+        self._tables = {}      # {(col, top): (version, DataFrame)}
+        self._qr_memo = None   # (frozenset ของ manifest, version, จำนวน)
+
+    # ---------- อัปเดตเมื่อบันทึกแถว ----------
+    def update_row(self, pos, old_values: dict, new_values: dict):
+        """ปรับตัวนับจากค่าเดิม → ค่าใหม่ของแถวเดียว (เฉพาะคอลัมน์ที่มีใน new_values)"""
+        for col in self.columns:
+            if col in new_values:
+                self._move(self.counts[col], _label(old_values.get(col)), _label(new_values.get(col)))
+        if COL_CODE in new_values:
+            old, new = _label(old_values.get(COL_CODE)), _label(new_values.get(COL_CODE))
+            if old != new:
+                self.missing_code += (new == "") - (old == "")
+                self._move(self.codes, old, new, keep_blank=False)
+        if COL_IMAGE in new_values:
+            old, new = _label(old_values.get(COL_IMAGE)), _label(new_values.get(COL_IMAGE))
+            self.missing_photo += (new == "") - (old == "")
+        self._version += 1
+
+    @staticmethod
+    def _move(counter: Counter, old, new, keep_blank=True):
+        if old == new:
+            return
+        if old or keep_blank:
+            counter[old] -= 1
+            if counter[old] <= 0:
+                del counter[old]
+        if new or keep_blank:
+            counter[new] += 1
+
+    # ---------- อ่าน ----------
+    def table(self, col, top=None) -> pd.DataFrame:
+        """จำนวนแถวต่อค่า (มากไปน้อย) ถ้ากำหนด top กลุ่มที่เหลือรวมเป็น "อื่น ๆ" (จำไว้จนกว่าจะมีการบันทึก)"""
+        cached = self._tables.get((col, top))
+        if cached is None or cached[0] != self._version:
+            items = self.counts[col].most_common()
+            if top is not None and len(items) > top:
+                items = items[:top] + [("อื่น ๆ", sum(n for _, n in items[top:]))]
+            table = pd.DataFrame([(label or BLANK_LABEL, n) for label, n in items], columns=[col, "จำนวน"])
+            cached = self._tables[(col, top)] = (self._version, table)
+        return cached[1]
+
+    def missing_qr(self, qr_dir) -> int:
+        """จำนวนรหัสที่ยังไม่มีไฟล์ QR ใน qr_dir (คิดใหม่เมื่อ manifest หรือข้อมูลเปลี่ยนเท่านั้น)"""
+        built = qr_codes(qr_dir)
+        memo = self._qr_memo
+        if memo is None or memo[0] is not built or memo[1] != self._version:
+            missing = sum(1 for code in self.codes if code not in built)
+            memo = self._qr_memo = (built, self._version, missing)
+        return memo[2]
+
+
+# ---------- แผงใน Streamlit ----------
+def render_summary(summary: AssetSummary, qr_dir, charts=True):
+    """ตัวเลขสรุป (+ แผนภูมิจำนวนตามสถานที่ / ผู้รับผิดชอบ)"""
+    import streamlit as st
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("รายการทั้งหมด", f"{summary.total:,}")
+    c2.metric("ไม่มีรูปภาพ", f"{summary.missing_photo:,}")
+    c3.metric("ยังไม่มี QR", f"{summary.missing_qr(qr_dir):,}")
+    c4.metric("ไม่มีรหัส", f"{summary.missing_code:,}")
+    if not charts:
+        return
+    cols = st.columns(len(summary.columns) or 1)
+    for box, col in zip(cols, summary.columns):
+        with box:
+            st.caption(f"จำนวนตาม{col.split(' (')[0]}")
+            st.bar_chart(summary.table(col, top=CHART_TOP), x=col, y="จำนวน", horizontal=True)
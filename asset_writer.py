@@ -0,0 +1,125 @@
+# asset_writer.py
+"""ผู้เขียนข้อมูลคนเดียวของ process (writer thread)
+
+ทุกหน้าส่งการแก้ (RowEdit) มาที่คิวเดียวกัน writer thread จะรวบการแก้ที่มาถึงใกล้ ๆ กัน
+เขียนลงฐานข้อมูลใน transaction เดียวภายใต้ file lock (กันการเขียนชนกันข้าม process)
+และตรวจ _version ของแถว เพื่อไม่ให้การแก้จากข้อมูลเก่าเขียนทับของคนอื่นแบบเงียบ ๆ
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from asset_db import DB_PATH, AssetDB, RowEdit
+
+BATCH_WINDOW = 0.05   # วินาที: รอรวบการแก้ที่ตามมาติด ๆ กัน
+MAX_BATCH = 500      # รวบไม่เกินนี้ต่อ transaction (กลุ่มจาก submit_many ไม่ถูกแบ่ง)
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+class AssetWriter:
+    """คิว + thread เดียวต่อฐานข้อมูล
+
+    on_commit(old_revision, new_revision, applied) จะถูกเรียกหลังเขียนแต่ละ batch สำเร็จ
+    (applied คือรายการผลลัพธ์ที่เขียนจริง) ใช้อัปเดต cache ในหน่วยความจำ
+    """
+
+    def __init__(self, db: AssetDB, on_commit=None, batch_window=BATCH_WINDOW):
+        self.db = db
+        self.on_commit = on_commit
+        self.batch_window = batch_window
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="asset-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, edit: RowEdit) -> Future:
+        """ส่งการแก้เข้าคิว คืน Future ที่ให้ผลเป็น dict ของแถวที่เขียน หรือ ConflictError"""
+        return self.submit_many([edit])[0]
+
+    def submit_many(self, edits) -> list:
+        """ส่งการแก้หลายแถวเป็นกลุ่มเดียว (เขียนใน transaction เดียวกันเสมอ ไม่ถูกแบ่ง batch)
+        คืน Future ต่อ edit ตามลำดับ
+        """
+        if self._closed:
+            raise RuntimeError(f"writer ของ {self.db.path.name} ถูกปิดแล้ว")
+        group = [(edit, Future()) for edit in edits]
+        if group:
+            self._queue.put(group)
+        return [future for _, future in group]
+
+    def close(self, timeout=30.0):
+        """เขียนการแก้ที่อยู่ในคิวให้เสร็จ แล้วหยุด thread (ใช้ก่อนลบ/แทนที่ไฟล์ฐานข้อมูล)"""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _collect(self):
+        group = self._queue.get()
+        if group is None:
+            return None
+        batch = list(group)
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                group = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if group is None:
+                self._queue.put(None)   # หยุดหลังเขียน batch นี้
+                break
+            batch.extend(group)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            edits = [edit for edit, _ in batch]
+            try:
+                with self.db.lock():
+                    old_revision, new_revision, results = self.db.apply_edits(edits)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            applied = [r for r in results if isinstance(r, dict) and r["values"]]
+            if applied and self.on_commit is not None:
+                try:
+                    self.on_commit(old_revision, new_revision, applied)
+                except Exception:
+                    pass  # cache จะถูกโหลดใหม่เองจาก revision
+
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def get_writer(db_path=DB_PATH, on_commit=None) -> AssetWriter:
+    """AssetWriter ของ process นี้ (สร้างครั้งแรกที่เรียก)"""
+    key = str(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = AssetWriter(AssetDB(db_path), on_commit=on_commit)
+            _writers[key] = writer
+        return writer
+
+
+def drop_writer(db_path):
+    """หยุดและลืม writer ของไฟล์นี้ (ถ้ามี) การบันทึกครั้งต่อไปจะสร้าง writer ใหม่"""
+    with _writers_lock:
+        writer = _writers.pop(str(db_path), None)
+    if writer is not None:
+        writer.close()
+        writer.db.close()
+
@@ -20,6 +20,15 @@ def _load_users():
 def is_authed() -> bool:
     return bool(st.session_state.get("auth_user"))
 
+def current_user():
+    """ชื่อผู้ใช้ที่ล็อกอินอยู่ (None ถ้ายังไม่ล็อกอิน เช่นเปิดจากการสแกน QR)"""
+    return st.session_state.get("auth_user")
+
+def is_admin() -> bool:
+    """ผู้ดูแลระบบ: ผู้ใช้ที่อยู่ใน .env ADMIN_USERS="admin, boss" (ค่าเริ่มต้น admin)"""
+    admins = {a.strip() for a in os.getenv("ADMIN_USERS", "admin").split(",") if a.strip()}
+    return st.session_state.get("auth_user") in admins
+
 def require_login():
     """ถ้ายังไม่ล็อกอิน ให้สวิตช์ไปหน้า Login"""
     if not is_authed():
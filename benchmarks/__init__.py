@@ -0,0 +1,9 @@
+"""ชุดวัดความเร็ว (benchmark) ของ Smart Asset
+
+- generate.py : สร้างไฟล์ Smart Asset Lab.xlsx สังเคราะห์ (คอลัมน์ภาษาไทยเหมือนไฟล์จริง) ขนาด 1k–500k แถว
+- run.py      : จับเวลาเส้นทางที่ใช้บ่อย ทั้งแบบเดิม (legacy) และแบบปัจจุบัน แล้วเขียนผลเป็น JSON
+- compare.py  : เทียบไฟล์ผลสองรอบ ดูว่าอะไรช้าลง
+
+    python -m benchmarks.run --sizes 1000,10000,100000 --out bench.json
+    python -m benchmarks.compare old.json bench.json
+"""
@@ -0,0 +1,50 @@
+# benchmarks/compare.py
+"""เทียบผล benchmark สองรอบ (ไฟล์ JSON จาก benchmarks.run)
+
+    python -m benchmarks.compare old.json new.json --threshold 1.2
+
+แสดง median ของแต่ละ (ขนาด, กรณี, แบบ) และอัตราส่วน new/old
+ถ้ามีกรณีที่ช้าลงเกิน threshold จะจบด้วย exit code 1 (ใช้ใน CI ได้)
+"""
+import argparse
+import json
+import sys
+
+
+def _medians(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {
+        (r["rows"], r["case"], r["impl"]): r["median"]
+        for r in report["results"] if "median" in r
+    }
+
+
+def compare(old: dict, new: dict, threshold=1.2) -> list:
+    """คืนรายการ (key, old, new, ratio, ช้าลงเกินไหม) เฉพาะกรณีที่มีทั้งสองรอบ"""
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        rows.append((key, old[key], new[key], ratio, ratio > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="เทียบผล benchmark สองรอบ")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="อัตราส่วน new/old ที่ถือว่าช้าลง")
+    args = parser.parse_args(argv)
+
+    rows = compare(_medians(args.old), _medians(args.new), args.threshold)
+    regressions = 0
+    for (n, case, impl), old, new, ratio, slower in rows:
+        mark = "  ⚠ ช้าลง" if slower else ""
+        print(f"{n:>8,}  {case:<30} {impl:<8} {old * 1000:10.2f} → {new * 1000:10.2f} ms  ×{ratio:5.2f}{mark}")
+        regressions += slower
+    print(f"\nเทียบ {len(rows)} กรณี ช้าลงเกิน ×{args.threshold}: {regressions}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# benchmarks/generate.py
+"""สร้างไฟล์ข้อมูลครุภัณฑ์สังเคราะห์ สำหรับวัดความเร็วกับข้อมูลขนาดใหญ่
+
+คอลัมน์และลักษณะข้อมูลเลียนแบบ Smart Asset Lab.xlsx จริง (ชื่อภาษาไทยซ้ำกันมาก, สถานที่/ผู้รับผิดชอบมีไม่กี่ค่า,
+ยี่ห้อ/หมายเลขเครื่องว่างบ่อย) สุ่มด้วย seed คงที่ รันซ้ำได้ไฟล์เดิม
+
+    python -m benchmarks.generate 100000 --out benchmarks/data/assets_100000.xlsx
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+COLUMNS = [
+    "ลำดับ", "ชื่อ", "รหัสเครื่องมือห้องปฏิบัติการ", "AssetID", "ปี", "ยี่ห้อ", "โมเดล",
+    "หมายเลขเครื่อง", "ต้นทุนต่อหน่วย", "สถานะ", "สถานที่ใช้งาน (ปัจจุบัน)",
+    "ผู้รับผิดชอบ (ปัจจุบัน)", "รูปภาพ", "QR Code",
+]
+
+NAMES = [
+    "เก้าอี้ปฏิบัติการ", "กล้องจุลทรรศน์ชนิด 2 กระบอกตา", "เครื่องไมโครคอมพิวเตอร์",
+    "จอเครื่องไมโครคอมพิวเตอร์", "ระบบสำรองไฟ", "เก้าอี้ทำงาน พนักพิงเตี้ยมีท้าวแขน",
+    "เตียงสำหรับนอนบริจาคโลหิต", "เครื่องชั่งและเขย่าถุงเลือดอัตโนมัติ", "ตู้แขวนลอย",
+    "ตู้สแตนเลส วางเครื่องเขย่าเลือด", "เครื่องปั่นเหวี่ยงตกตะกอน", "ตู้เย็นเก็บเลือด",
+    "เครื่องวิเคราะห์ความสมบูรณ์ของเม็ดเลือด", "อ่างน้ำควบคุมอุณหภูมิ", "ตู้ปลอดเชื้อ",
+    "เครื่องผนึกสายถุงเลือด", "เครื่องพิมพ์บาร์โค้ด", "โต๊ะปฏิบัติการ", "เครื่องปรับอากาศ",
+    "ที่ล้างตาฉุกเฉิน",
+]
+BRANDS = ["Olympus", "Dell", "FRESENIUS KABI", "BCN", "Haier", "Mitsubishi Electric", "SAKURA", "OPTIKA"]
+MODELS = ["LSC-121", "CX23", "TS-0308", "รุ่น OptiPlex 3050", "รุ่น U2415", "รุ่น 1 Kva", "CompoGuard", "CX31"]
+STATUSES = ["พร้อมใช้งาน", "ตรวจไม่พบ", "ชำรุด(ซ่อมแซมไม่ได้)", "ชำรุด(ซ่อมแซมได้)"]
+LOCATIONS = ["ห้องปฏิบัติการเทคนิคการแพทย์", "ธนาคารเลือดและบริการโลหิต", "ห้องยา", "พัสดุ", "งานธาลัสซิเมีย"]
+OWNERS = ["นายจักรพล  สมศรี", "นางสาวผกามาศ ไชยมงคล", "IT", "ห้องยา", "พัสดุ", "งานธาลัสซิเมีย"]
+
+
+def _pick(rng, pool, n, p=None, blank=0.0):
+    values = np.asarray(pool, dtype=object)[rng.choice(len(pool), size=n, p=p)]
+    if blank:
+        values[rng.random(n) < blank] = None
+    return values
+
+
+def generate_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """DataFrame ขนาด n แถว หน้าตาเหมือนที่อ่านจาก Smart Asset Lab.xlsx"""
+    rng = np.random.default_rng(seed)
+    width = max(3, len(str(n)))
+    seq = np.arange(1, n + 1)
+    names = _pick(rng, NAMES, n)
+    # ชื่อบางส่วนมีเลขครุภัณฑ์ย่อยต่อท้ายแบบไฟล์จริง เช่น "(534)"
+    tagged = rng.random(n) < 0.1
+    names[tagged] = [f"{a} ({b})" for a, b in zip(names[tagged], rng.integers(100, 999, tagged.sum()))]
+
+    serial = np.array([f"BC{x:012d}" for x in rng.integers(0, 10**12, n)], dtype=object)
+    serial[rng.random(n) < 0.55] = None
+    images = np.array([None] * n, dtype=object)
+    has_image = rng.random(n) < 0.02
+    images[has_image] = [f"Smart Asset Lab_Images/LAB-AS-{i:0{width}d}.รูปภาพ.jpg" for i in seq[has_image]]
+
+    return pd.DataFrame({
+        "ลำดับ": seq,
+        "ชื่อ": names,
+        "รหัสเครื่องมือห้องปฏิบัติการ": [f"LAB-AS-{i:0{width}d}" for i in seq],
+        "AssetID": [f"{a}-ZFA{b:02d}-{c:04d}-{d:03d}-{i % 1000:03d}" for a, b, c, d, i in zip(
+            rng.integers(100, 130, n), rng.integers(1, 20, n), rng.integers(6500, 7200, n),
+            rng.integers(1, 40, n), seq)],
+        "ปี": rng.choice([60, 62, 63, 64, 66, 67], size=n),
+        "ยี่ห้อ": _pick(rng, BRANDS, n, blank=0.45),
+        "โมเดล": _pick(rng, MODELS, n, blank=0.1),
+        "หมายเลขเครื่อง": serial,
+        "ต้นทุนต่อหน่วย": np.round(rng.lognormal(9.5, 1.5, n), -1),
+        "สถานะ": _pick(rng, STATUSES, n, p=[0.66, 0.33, 0.005, 0.005]),
+        "สถานที่ใช้งาน (ปัจจุบัน)": _pick(rng, LOCATIONS, n, p=[0.85, 0.12, 0.01, 0.01, 0.01]),
+        "ผู้รับผิดชอบ (ปัจจุบัน)": _pick(rng, OWNERS, n, p=[0.84, 0.12, 0.01, 0.01, 0.01, 0.01]),
+        "รูปภาพ": images,
+        "QR Code": np.full(n, np.nan),
+    }, columns=COLUMNS)
+
+
+def write_workbook(df: pd.DataFrame, path) -> Path:
+    """เขียน xlsx แบบ write-only (เร็วและใช้หน่วยความจำน้อยกว่า DataFrame.to_excel มาก)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([None if (v is None or (isinstance(v, float) and np.isnan(v))) else v for v in row])
+    tmp = path.with_name(path.name + ".tmp")
+    wb.save(tmp)
+    tmp.replace(path)
+    return path
+
+
+def workbook(n: int, seed: int = 0, data_dir=DATA_DIR) -> Path:
+    """path ของไฟล์ขนาด n แถว (สร้างครั้งแรก แล้วใช้ซ้ำในรอบถัดไป)"""
+    path = Path(data_dir) / f"assets_{n}_s{seed}.xlsx"
+    if not path.exists():
+        write_workbook(generate_frame(n, seed), path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="สร้างไฟล์ครุภัณฑ์สังเคราะห์")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="path ไฟล์ xlsx (ค่าเริ่มต้น benchmarks/data/assets_<rows>_s<seed>.xlsx)")
+    args = parser.parse_args(argv)
+    if args.out:
+        path = write_workbook(generate_frame(args.rows, args.seed), args.out)
+    else:
+        path = workbook(args.rows, args.seed)
+    print(f"✔ {args.rows:,} แถว: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# benchmarks/run.py
+"""จับเวลาเส้นทางที่ใช้บ่อย กับไฟล์สังเคราะห์หลายขนาด แล้วเขียนผลเป็น JSON
+
+แต่ละกรณีมีสองแบบ:
+- legacy  : โค้ดแบบเดิมของแอป (read_excel ทุกครั้ง, str.contains, apply ทีละแถว, to_excel ทั้งไฟล์, วน qrcode.make)
+- current : โค้ดปัจจุบัน (snapshot/SQLite, AssetIndex, SearchIndex, writer thread, build_qr แบบ incremental)
+
+กรณีแบบเดิมที่ช้ามากกับข้อมูลใหญ่ (เกิน --legacy-max-rows) จะถูกข้ามและบันทึกไว้ว่า skipped
+QR จับเวลาจากตัวอย่าง --qr-sample รายการ (รายงานเวลาต่อรายการด้วย)
+
+    python -m benchmarks.run --sizes 1000,10000,100000 --out bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import qrcode
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import asset_data  # noqa: E402
+from asset_db import AssetDB  # noqa: E402
+from asset_index import AssetIndex  # noqa: E402
+from asset_search import SEARCH_COLUMNS, SEARCH_COLUMNS_ALL, SearchIndex  # noqa: E402
+from benchmarks.generate import DATA_DIR, workbook  # noqa: E402
+from build_pages_and_qr import STREAMLIT_URL, asset_codes, build_qr  # noqa: E402
+
+COL_NAME = "ชื่อ"
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_ASSET = "AssetID"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# คำค้นตัวอย่าง: ชื่อภาษาไทยที่พบบ่อย, รหัสเฉพาะ, ส่วนของ AssetID, คำกว้าง ๆ
+QUERIES = ("กล้องจุลทรรศน์", "LAB-AS-0001", "ZFA01-7110", "lab")
+
+
+def measure(fn, repeat=5, setup=None) -> dict:
+    """เรียก fn ซ้ำ repeat ครั้ง คืนสถิติเวลา (วินาที)"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+    }
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _mib(df) -> float:
+    return round(float(df.memory_usage(deep=True).sum()) / 2**20, 2)
+
+
+# ---------- แบบเดิม ----------
+def legacy_load(path):
+    return pd.read_excel(path).dropna(how="all").reset_index(drop=True)
+
+
+def legacy_lookup(df, code):
+    return df[df[COL_CODE].astype(str) == str(code)].index
+
+
+def legacy_dashboard_search(df, search):
+    return df[
+        df[COL_NAME].astype(str).str.contains(search, case=False, na=False) |
+        df[COL_CODE].astype(str).str.contains(search, case=False, na=False) |
+        df[COL_ASSET].astype(str).str.contains(search, case=False, na=False)
+    ]
+
+
+def legacy_row_search(df, search):
+    return df[df.apply(lambda row: search.lower() in str(row).lower(), axis=1)]
+
+
+def legacy_save(df, pos, path):
+    df.at[df.index[pos], COL_LOC] = "ธนาคารเลือดและบริการโลหิต"
+    df.to_excel(path, index=False)
+
+
+def legacy_qr(codes, out_dir):
+    for tool_code in codes:
+        qrcode.make(STREAMLIT_URL + tool_code).save(os.path.join(out_dir, f"{tool_code}.png"))
+
+
+# ---------- ชุดวัดต่อขนาดข้อมูล ----------
+def bench_size(n, args, emit):
+    path = workbook(n, seed=args.seed, data_dir=args.data_dir)
+    legacy_ok = n <= args.legacy_max_rows
+    skipped = f"ข้าม: มากกว่า --legacy-max-rows ({args.legacy_max_rows:,})"
+
+    def record(case, impl, stats=None, **extra):
+        row = {"rows": n, "case": case, "impl": impl, **(stats or {}), **extra}
+        emit(row)
+
+    # โหลดข้อมูล
+    if legacy_ok:
+        record("load", "legacy", measure(lambda: legacy_load(path), min(args.repeat, 3)))
+    else:
+        record("load", "legacy", skipped=skipped)
+    for snap in asset_data.snapshot_paths(path):
+        Path(snap).unlink(missing_ok=True)
+    record("load.snapshot_cold", "current", measure(lambda: asset_data.load_excel(path), 1))
+    record("load.snapshot", "current",
+           measure(lambda: asset_data.load_excel(path), args.repeat, setup=asset_data.clear_cache))
+
+    df = asset_data.load_excel(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        record("db.import", "current", measure(lambda: AssetDB(db_path).import_frame(df), 1))
+        record("load.db_cold", "current",
+               measure(lambda: asset_data.load_data(db_path), args.repeat, setup=asset_data.clear_cache))
+        record("load.db_warm", "current", measure(lambda: asset_data.load_data(db_path), args.repeat))
+        data = asset_data.load_data(db_path)
+
+        # หน่วยความจำของข้อมูลหนึ่งชุด (แบบเดิม: dtype ตามที่อ่านได้ และทุก session ได้สำเนาของตัวเอง)
+        raw = AssetDB(db_path).read_frame()[1]
+        record("memory.frame", "legacy", mib=_mib(raw), per_session=True)
+        record("memory.frame", "current", mib=_mib(data), per_session=False)
+        del raw
+
+        # ?code= lookup
+        codes = [data[COL_CODE].iat[i] for i in (0, n // 2, n - 1)]
+        record("lookup", "legacy", measure(lambda: [legacy_lookup(data, c) for c in codes], args.repeat),
+               per_call=True, calls=len(codes))
+        record("lookup.build_index", "current", measure(lambda: AssetIndex(data), 1))
+        index = asset_data.load_index(db_path)
+        record("lookup", "current", measure(lambda: [index.find_code(c) for c in codes], args.repeat),
+               per_call=True, calls=len(codes))
+
+        # ค้นหาใน Dashboard (ชื่อ / รหัส / AssetID)
+        record("search.dashboard", "legacy",
+               measure(lambda: [legacy_dashboard_search(data, q) for q in QUERIES], args.repeat),
+               queries=len(QUERIES))
+        record("search.dashboard.build_index", "current", measure(lambda: SearchIndex(data, SEARCH_COLUMNS), 1))
+        search = asset_data.load_search(SEARCH_COLUMNS, db_path)
+        record("search.dashboard", "current",
+               measure(lambda: [search.search(q) for q in QUERIES], args.repeat), queries=len(QUERIES))
+
+        # ค้นหาใน QR Assets (ทุกช่อง)
+        filled = data.astype(object).fillna("")
+        if legacy_ok:
+            record("search.qr_assets", "legacy",
+                   measure(lambda: [legacy_row_search(filled, q) for q in QUERIES], 1), queries=len(QUERIES))
+        else:
+            record("search.qr_assets", "legacy", skipped=skipped)
+        search_all = asset_data.load_search(SEARCH_COLUMNS_ALL, db_path)
+        record("search.qr_assets", "current",
+               measure(lambda: [search_all.search(q) for q in QUERIES], args.repeat), queries=len(QUERIES))
+
+        # บันทึกหนึ่งแถว
+        if legacy_ok:
+            xlsx = Path(tmp) / "save.xlsx"
+            record("save_row", "legacy", measure(lambda: legacy_save(data.copy(), n // 2, xlsx), 1))
+        else:
+            record("save_row", "legacy", skipped=skipped)
+        toggle = iter(range(10**9))
+
+        def save_current():
+            value = "ธนาคารเลือดและบริการโลหิต" if next(toggle) % 2 else "ห้องปฏิบัติการเทคนิคการแพทย์"
+            asset_data.save_row(data, n // 2, {COL_LOC: value}, db_path=db_path)
+
+        record("save_row", "current", measure(save_current, args.repeat))
+
+        # สร้าง QR (ตัวอย่าง args.qr_sample รายการ)
+        sample = asset_codes(data)[:args.qr_sample]
+        if sample:
+            legacy_dir = Path(tmp) / "qr_legacy"
+            legacy_dir.mkdir()
+            stats = measure(lambda: legacy_qr(sample, legacy_dir), 1)
+            record("qr_build", "legacy", stats, sample=len(sample), per_item=stats["median"] / len(sample))
+            qr_dir = Path(tmp) / "qr"
+            stats = measure(lambda: build_qr(sample, qr_dir, jobs=args.jobs, full=True), 1)
+            record("qr_build", "current", stats, sample=len(sample), per_item=stats["median"] / len(sample))
+            record("qr_build.incremental", "current",
+                   measure(lambda: build_qr(sample, qr_dir, jobs=args.jobs), args.repeat), sample=len(sample))
+    asset_data.clear_cache()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="วัดความเร็วเส้นทางหลักของ Smart Asset")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="จำนวนแถวคั่นด้วยจุลภาค เช่น 1000,10000,500000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-max-rows", type=int, default=100000,
+                        help="ข้ามกรณีแบบเดิมที่ช้ามาก (read_excel / apply / to_excel) เมื่อข้อมูลมากกว่านี้")
+    parser.add_argument("--qr-sample", type=int, default=200, help="จำนวน QR ที่ใช้วัด")
+    parser.add_argument("--jobs", type=int, default=None, help="จำนวน process ของ build_qr")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="โฟลเดอร์เก็บไฟล์สังเคราะห์ (ใช้ซ้ำข้ามรอบ)")
+    parser.add_argument("--out", default="bench.json")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = {"meta": {**_meta(), "args": vars(args)}, "results": []}
+
+    def emit(row):
+        report["results"].append(row)
+        if "skipped" in row:
+            print(f"{row['rows']:>8,}  {row['case']:<30} {row['impl']:<8} {row['skipped']}")
+        elif "mib" in row:
+            print(f"{row['rows']:>8,}  {row['case']:<30} {row['impl']:<8} {row['mib']:10.2f} MiB")
+        else:
+            print(f"{row['rows']:>8,}  {row['case']:<30} {row['impl']:<8} median {row['median'] * 1000:10.2f} ms")
+
+    for n in sizes:
+        bench_size(n, args, emit)
+
+    Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"✔ เขียนผลแล้ว: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""สร้างไฟล์ป้าย QR สำหรับพิมพ์ (A4, 3×8 ป้ายต่อหน้า)
+
+- วาด QR เป็นสี่เหลี่ยมเวกเตอร์ (ไม่ฝังรูป PNG) ไฟล์เล็กและคมทุกขนาดพิมพ์
+- อ่านข้อมูลทีละแถวแล้ววาดทีละหน้า ไม่ต้องโหลดรูป QR ทั้งหมดไว้ในหน่วยความจำ
+- เลือกพิมพ์เฉพาะบางรายการได้: ตามรายการรหัส, ตามสถานที่ใช้งาน, และเริ่มจากช่องที่ N
+  (ใช้กับแผ่นสติ๊กเกอร์ที่ใช้ไปแล้วบางส่วน)
+
+ใช้งาน:
+    python build_labels_pdf.py
+    python build_labels_pdf.py --location "ห้องปฏิบัติการเทคนิคการแพทย์" --start 5
+    python build_labels_pdf.py --codes LAB-AS-001,LAB-AS-002 --out some_labels.pdf
+"""
+import argparse
+import os
+from pathlib import Path
+
+import qrcode
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+import asset_data
+from build_pages_and_qr import COL_CODE, qr_url
+
+OUTPUT_PDF = "qr_labels_A4_pages.pdf"
+
+COL_NAME = "ชื่อ"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+
+# เลย์เอาต์ป้าย A4 3×8 (70 × 37.125 มม. ไม่มีขอบกระดาษ)
+COLS, ROWS = 3, 8
+PAGE_W, PAGE_H = A4
+LABEL_W, LABEL_H = PAGE_W / COLS, PAGE_H / ROWS
+PADDING = 2.5 * mm
+QR_SIZE = LABEL_H - 2 * PADDING
+LABELS_PER_PAGE = COLS * ROWS
+
+# ฟอนต์ที่รองรับภาษาไทย (ใช้ตัวแรกที่พบ หรือกำหนดเองด้วย LABEL_FONT=/path/font.ttf)
+FONT_CANDIDATES = [
+    os.getenv("LABEL_FONT", ""),
+    str(asset_data.BASE_DIR / "fonts" / "THSarabunNew.ttf"),
+    "/usr/share/fonts/truetype/noto/NotoSansThai-Regular.ttf",
+    "/usr/share/fonts/truetype/tlwg/Garuda.ttf",
+    "C:/Windows/Fonts/tahoma.ttf",
+    "/System/Library/Fonts/Supplemental/Tahoma.ttf",
+]
+
+
+def _register_font():
+    """คืน (ชื่อฟอนต์, รองรับภาษาไทยไหม)"""
+    for path in FONT_CANDIDATES:
+        if path and Path(path).exists():
+            try:
+                pdfmetrics.registerFont(TTFont("LabelThai", path))
+                return "LabelThai", True
+            except Exception:
+                continue
+    return "Helvetica", False
+
+
+def _wrap(text, font, size, width, max_lines):
+    """ตัดบรรทัดตามความกว้างจริง (ภาษาไทยไม่มีช่องว่าง จึงตัดทีละตัวอักษร)"""
+    lines, line = [], ""
+    for ch in text:
+        if pdfmetrics.stringWidth(line + ch, font, size) > width and line:
+            lines.append(line)
+            line = ch.lstrip()
+            if len(lines) == max_lines:
+                break
+        else:
+            line += ch
+    else:
+        if line:
+            lines.append(line)
+    if len(lines) == max_lines and "".join(lines) != text:
+        lines[-1] = lines[-1][:-1] + "…"
+    return lines
+
+
+def draw_qr(c, url, x, y, size):
+    """วาด QR เป็น path เวกเตอร์ (รวมโมดูลสีดำที่ติดกันในแถวเดียวเป็นสี่เหลี่ยมเดียว)"""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=1)
+    qr.add_data(url)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    n = len(matrix)
+    module = size / n
+
+    path = c.beginPath()
+    for r, row in enumerate(matrix):
+        top = y + size - (r + 1) * module
+        start = None
+        for col, dark in enumerate(row + [False]):
+            if dark and start is None:
+                start = col
+            elif not dark and start is not None:
+                path.rect(x + start * module, top, (col - start) * module, module)
+                start = None
+    c.drawPath(path, stroke=0, fill=1)
+
+
+def select_assets(df, codes=None, location=None):
+    """เลือกแถวที่จะพิมพ์ คืน iterator ของ (รหัส, ชื่อ) ตามลำดับรหัสที่ขอ (หรือลำดับในข้อมูล)"""
+    if location:
+        df = df[df[COL_LOC].astype(str).str.strip() == str(location).strip()]
+    names = df[COL_NAME].fillna("").astype(str).tolist() if COL_NAME in df.columns else [""] * len(df)
+    rows = {}
+    for code, name in zip(df[COL_CODE].fillna("").astype(str).str.strip().tolist(), names):
+        if code and code not in rows:
+            rows[code] = name
+    order = [str(c).strip() for c in codes] if codes else rows.keys()
+    return ((code, rows[code]) for code in order if code in rows)
+
+
+def build_labels(assets, out=OUTPUT_PDF, start=0, progress=None) -> int:
+    """เขียน PDF ป้าย QR ทีละหน้า
+
+    - assets   : iterable ของ (รหัส, ชื่อ)
+    - out      : path หรือ file-like (เช่น BytesIO สำหรับดาวน์โหลดจาก Dashboard)
+    - start    : ข้ามกี่ช่องแรกของหน้าแรก (แผ่นที่ใช้ไปแล้วบางส่วน)
+    - progress : callback(จำนวนป้ายที่วาดแล้ว) เรียกทุกครั้งที่จบหน้า
+    คืนจำนวนป้ายที่พิมพ์
+    """
+    font, thai = _register_font()
+    c = canvas.Canvas(out if not isinstance(out, Path) else str(out), pagesize=A4)
+    c.setTitle("Smart Asset QR labels")
+    text_x_offset = PADDING + QR_SIZE + 2 * mm
+    text_w = LABEL_W - text_x_offset - PADDING
+
+    slot = max(0, int(start)) % LABELS_PER_PAGE
+    count = 0
+    for code, name in assets:
+        if slot == LABELS_PER_PAGE:
+            c.showPage()
+            slot = 0
+            if progress is not None:
+                progress(count)
+        col, row = slot % COLS, slot // COLS
+        x = col * LABEL_W
+        y = PAGE_H - (row + 1) * LABEL_H
+
+        draw_qr(c, qr_url(code), x + PADDING, y + PADDING, QR_SIZE)
+
+        ty = y + LABEL_H - PADDING - 9
+        c.setFont("Helvetica-Bold", 9)
+        for line in _wrap(code, "Helvetica-Bold", 9, text_w, 2):
+            c.drawString(x + text_x_offset, ty, line)
+            ty -= 10
+        if thai and name:
+            c.setFont(font, 8)
+            for line in _wrap(name, font, 8, text_w, 4):
+                c.drawString(x + text_x_offset, ty, line)
+                ty -= 9
+
+        slot += 1
+        count += 1
+
+    c.showPage()
+    c.save()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="สร้าง PDF ป้าย QR (A4 3×8)")
+    parser.add_argument("--out", default=OUTPUT_PDF)
+    parser.add_argument("--codes", default="", help="รหัสคั่นด้วยจุลภาค")
+    parser.add_argument("--codes-file", help="ไฟล์ข้อความ รหัสบรรทัดละหนึ่งรายการ")
+    parser.add_argument("--location", help="พิมพ์เฉพาะสถานที่ใช้งานนี้")
+    parser.add_argument("--start", type=int, default=0, help="เริ่มที่ช่องที่เท่าไรของหน้าแรก (นับจาก 0)")
+    args = parser.parse_args(argv)
+
+    codes = [c for c in args.codes.split(",") if c.strip()]
+    if args.codes_file:
+        codes += [line.strip() for line in Path(args.codes_file).read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    df = asset_data.load_data()
+    count = build_labels(select_assets(df, codes or None, args.location), args.out, args.start)
+    print(f"🖨 สร้างป้าย QR {count} ป้ายแล้ว: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,488 @@
-import pandas as pd
-import qrcode
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from string import Template
+from urllib.parse import quote
+
+import qrcode
+
+import asset_data
+from asset_db import FileLock
 
 # -----------------------------
 # 1. ตั้งค่าไฟล์และโฟลเดอร์
 # -----------------------------
-EXCEL_PATH = "Smart Asset Lab.xlsx"
 OUTPUT_QR = "qrcodes"
+OUTPUT_PAGES = "pages"
 
 STREAMLIT_URL = "https://gpqgy3cvkjoblhckidqhaf.streamlit.app/qr_detail?code="
 
-os.makedirs(OUTPUT_QR, exist_ok=True)
+# ลิงก์ "แก้ไขข้อมูล" จากหน้า HTML ไปยังฟอร์มใน Streamlit (app.py?code=...)
+EDIT_URL = "https://gpqgy3cvkjoblhckidqhaf.streamlit.app/?code="
+
+# URL จริงของโฟลเดอร์ pages บนโฮสต์ static เช่น "https://hms.example.org/asset/pages/"
+# ถ้ากำหนด QR จะชี้ไปหน้า HTML ของแต่ละรายการแทน Streamlit (ไม่ต้องเปิด session ทุกครั้งที่สแกน)
+BASE_URL = ""
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_NAME = "ชื่อ"
+COL_IMAGE = "รูปภาพ"
+
+# ลำดับคอลัมน์ที่แสดงก่อนในหน้า HTML (คอลัมน์อื่นตามมาตามลำดับใน Excel)
+prefer = [
+    COL_NAME, COL_CODE, "AssetID", "ยี่ห้อ", "โมเดล", "หมายเลขเครื่อง",
+    "สถานะ", "สถานที่ใช้งาน (ปัจจุบัน)", "ผู้รับผิดชอบ (ปัจจุบัน)",
+]
+
+# คอลัมน์ที่ใส่ใน search.json ให้ index.html ค้นหาในเบราว์เซอร์
+SEARCH_FIELDS = [COL_CODE, COL_NAME, "AssetID", "สถานที่ใช้งาน (ปัจจุบัน)", "ผู้รับผิดชอบ (ปัจจุบัน)"]
+
+# ค่าที่มีผลกับหน้าตา QR (เปลี่ยนค่าไหน → สร้างใหม่ทุกไฟล์)
+QR_SETTINGS = {"error_correction": "M", "box_size": 10, "border": 4}
+
+MANIFEST_NAME = ".manifest.json"
+
+# งานน้อยกว่านี้ทำใน process เดียว (เปิด process pool ไม่คุ้ม)
+MIN_PARALLEL = 32
+
+# build_pages รายงานความคืบหน้าทุกกี่แถว
+PROGRESS_EVERY = 200
+
+_ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
 
 # -----------------------------
-# 2. โหลดข้อมูล
+# 2. สร้าง QR ทีละรายการ
 # -----------------------------
-df = pd.read_excel(EXCEL_PATH).fillna("")
+# ตัวอักษรที่ห้ามอยู่ในชื่อไฟล์ (ตัวคั่น path ทุกระบบ + ตัวที่ Windows ไม่รับ + ตัวควบคุม)
+_UNSAFE_NAME = re.compile(r'[\x00-\x1f/\\:*?"<>|]')
+MAX_NAME_BYTES = 200
+
+
+def file_stem(tool_code):
+    """ชื่อไฟล์ (ไม่รวมนามสกุล) ของรหัส ใช้ร่วมกันทั้งไฟล์ QR, หน้า HTML และ qr_render
+
+    รหัสมาจาก Excel / ฟอร์มแก้ไข จึงต้องไม่ชี้ออกนอกโฟลเดอร์ผลลัพธ์ (เช่น "../x", "A/B")
+    คืน None ถ้ารหัสใช้เป็นชื่อไฟล์ไม่ได้ ผู้เรียกข้ามรายการนั้นแล้วรายงาน (ไม่หยุดทั้ง build)
+    """
+    code = str(tool_code if tool_code is not None else "")
+    if (not code or code != code.strip() or code.startswith(".")
+            or len(code.encode("utf-8")) > MAX_NAME_BYTES or _UNSAFE_NAME.search(code)):
+        return None
+    return code
+
+
+# ชื่อไฟล์ในโฟลเดอร์ pages ที่ build_pages ใช้เอง (index.html, search.json) รหัสเหล่านี้ไม่มีหน้า HTML
+RESERVED_PAGE_NAMES = {"index", "search"}
+
+
+def page_stem(tool_code):
+    """ชื่อไฟล์หน้า HTML ของรหัส (file_stem ที่ไม่ชนกับ RESERVED_PAGE_NAMES) หรือ None ถ้าไม่มีหน้า"""
+    stem = file_stem(tool_code)
+    if stem is None or stem.lower() in RESERVED_PAGE_NAMES:
+        return None
+    return stem
+
+
+def qr_url(tool_code: str) -> str:
+    """URL ที่ฝังใน QR: หน้า HTML บนโฮสต์ static ถ้าตั้ง BASE_URL ไม่งั้นเป็น Streamlit Cloud
+
+    รหัสที่ไม่มีหน้า HTML (page_stem เป็น None) ชี้ไป Streamlit เสมอ
+    """
+    if BASE_URL and page_stem(tool_code) is not None:
+        return BASE_URL + quote(tool_code) + ".html"
+    return STREAMLIT_URL + tool_code
+
+
+def make_qr_image(url: str, settings=QR_SETTINGS):
+    qr = qrcode.QRCode(
+        error_correction=_ERROR_CORRECTION[settings["error_correction"]],
+        box_size=settings["box_size"],
+        border=settings["border"],
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr.make_image()
+
+
+def content_hash(tool_code: str, url: str, settings=QR_SETTINGS) -> str:
+    """hash ของทุกอย่างที่กำหนดหน้าตาไฟล์ QR (รหัส + URL + ค่าการ render)"""
+    payload = json.dumps([tool_code, url, settings], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _build_one(task):
+    """worker ของ process pool: (รหัส, url, path, settings) → (รหัส, path)"""
+    tool_code, url, save_path, settings = task
+    img = make_qr_image(url, settings)
+    tmp = save_path + ".tmp"
+    img.save(tmp, format="PNG")
+    os.replace(tmp, save_path)
+    return tool_code, save_path
 
-if "รหัสเครื่องมือห้องปฏิบัติการ" not in df.columns:
-    raise Exception("❌ ERROR: ไม่พบคอลัมน์ 'รหัสเครื่องมือห้องปฏิบัติการ' ใน Excel")
 
 # -----------------------------
-# 3. วนสร้าง QR Code
+# 3. manifest: จำ hash ของไฟล์ที่สร้างแล้ว
 # -----------------------------
-for i, row in df.iterrows():
-    tool_code = str(row["รหัสเครื่องมือห้องปฏิบัติการ"]).strip()
+def load_manifest(out_dir=OUTPUT_QR) -> dict:
+    try:
+        with open(Path(out_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict, out_dir=OUTPUT_QR):
+    path = Path(out_dir) / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def manifest_lock(out_dir=OUTPUT_QR) -> FileLock:
+    """file lock ของ manifest ใน out_dir (ทุกการอ่าน-แก้-เขียน manifest ต้องถือล็อกนี้)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return FileLock(out_dir / (MANIFEST_NAME + ".lock"))
+
+
+@contextmanager
+def edit_manifest(out_dir=OUTPUT_QR):
+    """อ่าน-แก้-เขียน manifest ภายใต้ file lock เดียว (build / remove_qr / หน้าเว็บที่เขียน QR กลับ ไม่ทับกัน)
+
+        with edit_manifest(out_dir) as manifest:
+            manifest[code] = {...}
+
+    เขียนกลับเฉพาะเมื่อเนื้อหาเปลี่ยน
+    """
+    with manifest_lock(out_dir):
+        manifest = load_manifest(out_dir)
+        before = dict(manifest)
+        yield manifest
+        if manifest != before:
+            save_manifest(manifest, out_dir)
+
+
+def asset_codes(df) -> list:
+    """รหัสเครื่องมือที่ไม่ว่าง (ตัดซ้ำ คงลำดับเดิม)"""
+    if COL_CODE not in df.columns:
+        raise Exception(f"❌ ERROR: ไม่พบคอลัมน์ '{COL_CODE}' ใน Excel")
+    codes = (str(c).strip() for c in df[COL_CODE].fillna("").tolist())
+    return list(dict.fromkeys(c for c in codes if c))
+
+
+def build_qr(codes, out_dir=OUTPUT_QR, jobs=None, full=False, prune=True, progress=None) -> dict:
+    """สร้าง QR เฉพาะรายการที่ใหม่/เปลี่ยน แล้วลบไฟล์ของรายการที่ถูกลบ
+
+    - codes    : รหัสทั้งหมดที่ควรมี QR (ถ้า prune=False ถือเป็นเพียงส่วนหนึ่ง ไม่ลบของเดิม)
+    - full     : สร้างใหม่ทั้งหมดโดยไม่สนใจ manifest
+    - progress : callback(จำนวนที่เสร็จ, จำนวนทั้งหมด) สำหรับแสดงความคืบหน้า
+    คืน {"built": [...], "unchanged": n, "removed": [...], "skipped": [รหัสที่ใช้เป็นชื่อไฟล์ไม่ได้]}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    tasks, hashes, skipped = [], {}, []
+    for tool_code in codes:
+        stem = file_stem(tool_code)
+        if stem is None:
+            skipped.append(tool_code)
+            continue
+        url = qr_url(tool_code)
+        h = content_hash(tool_code, url)
+        hashes[tool_code] = h
+        file_name = f"{stem}.png"
+        entry = manifest.get(tool_code)
+        if full or entry is None or entry.get("hash") != h or not (out_dir / file_name).exists():
+            tasks.append((tool_code, url, str(out_dir / file_name), QR_SETTINGS))
+
+    built = []
+    total = len(tasks)
+    if total:
+        if total < MIN_PARALLEL or jobs == 1:
+            results = map(_build_one, tasks)
+            pool = None
+        else:
+            # spawn ไม่ใช่ fork: build ถูกเรียกจาก thread ของ Streamlit (jobs.py) fork ตอนมีหลาย thread อาจค้าง
+            pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+            results = pool.map(_build_one, tasks, chunksize=max(1, total // ((jobs or os.cpu_count() or 1) * 4)))
+        try:
+            for done, (tool_code, save_path) in enumerate(results, 1):
+                built.append(tool_code)
+                if progress is not None:
+                    progress(done, total)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    # รวมผลเข้ากับ manifest ล่าสุด (ระหว่าง build อาจมีหน้าเว็บเขียน QR กลับเพิ่ม)
+    removed = []
+    with edit_manifest(out_dir) as manifest:
+        for tool_code in built:
+            manifest[tool_code] = {"hash": hashes[tool_code], "file": f"{file_stem(tool_code)}.png"}
+        if prune:
+            keep = set(hashes)
+            for tool_code in [c for c in manifest if c not in keep]:
+                file_name = manifest.pop(tool_code).get("file")
+                if file_name:
+                    (out_dir / file_name).unlink(missing_ok=True)
+                removed.append(tool_code)
+    return {"built": built, "unchanged": len(hashes) - len(built), "removed": removed, "skipped": skipped}
+
+
+def remove_qr(codes, out_dir=OUTPUT_QR) -> list:
+    """ลบไฟล์ QR ของรหัสที่กำหนด (เช่นรายการที่ถูกลบตอนนำเข้า) คืนรหัสที่ลบจริง"""
+    out_dir = Path(out_dir)
+    if not out_dir.exists():
+        return []
+    removed = []
+    with edit_manifest(out_dir) as manifest:
+        for tool_code in codes:
+            entry = manifest.pop(tool_code, None)
+            stem = file_stem(tool_code)
+            if entry is None and stem is None:
+                continue
+            path = out_dir / (entry.get("file") if entry else f"{stem}.png")
+            if entry or path.exists():
+                path.unlink(missing_ok=True)
+                removed.append(tool_code)
+    return removed
+
+
+# -----------------------------
+# 4. หน้า HTML ต่อรายการ + index.html
+# -----------------------------
+# เปลี่ยน template → เพิ่ม PAGE_TEMPLATE_VERSION เพื่อให้สร้างใหม่ทุกหน้า
+PAGE_TEMPLATE_VERSION = 1
+
+PAGE_TEMPLATE = Template("""<!doctype html>
+<html lang="th"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title</title>
+<style>
+body{font-family:system-ui,sans-serif;margin:0;background:#f4fbfd;color:#0b2e4f}
+main{max-width:720px;margin:auto;padding:16px}
+h1{font-size:22px;margin:8px 0 4px}
+table{width:100%;border-collapse:collapse;background:#fff;border-radius:12px;overflow:hidden}
+th,td{padding:8px 10px;border-bottom:1px solid #e2f1f5;text-align:left;vertical-align:top}
+th{width:38%;color:#456;font-weight:600}
+img{max-width:100%;border-radius:12px;margin:8px 0}
+a.btn{display:inline-block;margin:12px 8px 0 0;padding:8px 14px;border-radius:10px;background:#0ea5e9;color:#fff;text-decoration:none}
+</style></head>
+<body><main>
+<h1>$title</h1><p>รหัส: <b>$code</b></p>
+$image
+<table>$rows</table>
+<a class="btn" href="$edit_url">✏️ แก้ไขข้อมูล</a><a class="btn" href="index.html">📋 รายการทั้งหมด</a>
+</main></body></html>
+""")
+
+INDEX_HTML = """<!doctype html>
+<html lang="th"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>รายการครุภัณฑ์</title>
+<style>
+body{font-family:system-ui,sans-serif;margin:0;background:#f4fbfd;color:#0b2e4f}
+main{max-width:900px;margin:auto;padding:16px}
+input{width:100%;padding:10px;font-size:16px;border:1px solid #bfeef7;border-radius:10px;box-sizing:border-box}
+li{padding:6px 0;border-bottom:1px solid #e2f1f5;list-style:none}
+ul{padding:0} small{color:#567}
+</style></head>
+<body><main>
+<h1>รายการครุภัณฑ์</h1>
+<input id="q" placeholder="ค้นหาจากรหัส / ชื่อ / AssetID / สถานที่ / ผู้รับผิดชอบ" autofocus>
+<p><small id="count"></small></p><ul id="list"></ul>
+<script>
+const LIMIT = 200;
+let rows = [], hay = [];
+function render(q) {
+  const terms = q.toLowerCase().split(/\\s+/).filter(Boolean);
+  const out = [];
+  for (let i = 0; i < rows.length && out.length < LIMIT; i++) {
+    if (terms.every(t => hay[i].includes(t))) out.push(rows[i]);
+  }
+  document.getElementById("count").textContent =
+    terms.length ? `แสดง ${out.length} รายการแรกที่ตรงกับคำค้น` : `ทั้งหมด ${rows.length} รายการ`;
+  const list = document.getElementById("list");
+  list.replaceChildren(...out.map(r => {
+    const li = document.createElement("li"), a = document.createElement("a");
+    a.href = encodeURIComponent(r[0]) + ".html"; a.textContent = r[0];
+    const s = document.createElement("small"); s.textContent = " " + r.slice(1).filter(Boolean).join(" · ");
+    li.append(a, s); return li;
+  }));
+}
+fetch("search.json").then(r => r.json()).then(data => {
+  rows = data.rows; hay = rows.map(r => r.join(" ").toLowerCase());
+  render("");
+});
+document.getElementById("q").addEventListener("input", e => render(e.target.value));
+</script>
+</main></body></html>
+"""
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value).strip()
+
+
+def page_columns(columns) -> list:
+    """เรียงคอลัมน์ตาม prefer ก่อน แล้วตามด้วยคอลัมน์อื่น (ไม่รวมรูปภาพ/QR)"""
+    cols = [c for c in prefer if c in columns]
+    cols += [c for c in columns if c not in cols and c not in (COL_IMAGE, "QR Code")]
+    return cols
+
+
+def page_hash(record: dict, columns) -> str:
+    """hash ของเนื้อหาหน้า (template + ลิงก์แก้ไข + ค่าทุกช่อง) เปลี่ยนเมื่อหน้าต้องสร้างใหม่เท่านั้น"""
+    payload = json.dumps([PAGE_TEMPLATE_VERSION, EDIT_URL, columns, record], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_page(record: dict, columns, image_src=None) -> str:
+    """หน้า HTML ของหนึ่งรายการ (image_src: URL รูปแทน path ในคอลัมน์รูปภาพ ใช้โดย scan_server.py)"""
+    code = record.get(COL_CODE, "")
+    title = record.get(COL_NAME, "") or code
+    image = ""
+    if image_src:
+        image = f'<img src="{html.escape(image_src)}" alt="" loading="lazy">'
+    elif record.get(COL_IMAGE):
+        image = f'<img src="../{html.escape(quote(record[COL_IMAGE]))}" alt="" loading="lazy">'
+    rows = "".join(
+        f"<tr><th>{html.escape(str(c))}</th><td>{html.escape(record.get(c, ''))}</td></tr>"
+        for c in columns
+    )
+    return PAGE_TEMPLATE.substitute(
+        title=html.escape(title),
+        code=html.escape(code),
+        image=image,
+        rows=rows,
+        edit_url=html.escape(EDIT_URL + quote(code)),
+    )
+
+
+def _write_text(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_pages(df, out_dir=OUTPUT_PAGES, full=False, prune=True, progress=None) -> dict:
+    """เขียนหน้า HTML เฉพาะแถวที่เปลี่ยน (เทียบ hash ใน manifest) + index.html + search.json
+
+    progress : callback(จำนวนแถวที่ตรวจแล้ว, จำนวนแถวทั้งหมด) เรียกทุก PROGRESS_EVERY แถว
+
+    คืน {"built": [...], "unchanged": n, "removed": [...], "skipped": [รหัสที่ไม่มีหน้า ดู page_stem]}
+    รหัสที่ข้ามไม่อยู่ใน search.json (ไม่มีหน้าให้ลิงก์ไป)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    columns = page_columns(list(df.columns))
+    all_columns = [str(c) for c in df.columns]
+
+    built, seen, search_rows, entries, skipped = [], set(), [], {}, []
+    for i, values in enumerate(df.itertuples(index=False, name=None), 1):
+        if progress is not None and i % PROGRESS_EVERY == 0:
+            progress(i, len(df))
+        record = {col: _cell(v) for col, v in zip(all_columns, values)}
+        code = record.get(COL_CODE, "")
+        if not code or code in seen:
+            continue
+        stem = page_stem(code)
+        if stem is None:
+            skipped.append(code)
+            continue
+        seen.add(code)
+        search_rows.append([record.get(c, "") for c in SEARCH_FIELDS])
+
+        h = page_hash(record, columns)
+        file_name = f"{stem}.html"
+        entry = manifest.get(code)
+        if full or entry is None or entry.get("hash") != h or not (out_dir / file_name).exists():
+            _write_text(out_dir / file_name, render_page(record, columns))
+            entries[code] = {"hash": h, "file": file_name}
+            built.append(code)
+
+    removed = []
+    with edit_manifest(out_dir) as manifest:
+        manifest.update(entries)
+        if prune:
+            for code in [c for c in manifest if c not in seen]:
+                file_name = manifest.pop(code).get("file")
+                if file_name:
+                    (out_dir / file_name).unlink(missing_ok=True)
+                removed.append(code)
+
+    # search.json แบบกะทัดรัด: ชื่อฟิลด์ครั้งเดียว + array ของค่า
+    search_json = json.dumps({"fields": SEARCH_FIELDS, "rows": search_rows}, ensure_ascii=False, separators=(",", ":"))
+    if built or removed or not (out_dir / "search.json").exists():
+        _write_text(out_dir / "search.json", search_json)
+    if full or not (out_dir / "index.html").exists() or (out_dir / "index.html").read_text(encoding="utf-8") != INDEX_HTML:
+        _write_text(out_dir / "index.html", INDEX_HTML)
+    return {"built": built, "unchanged": len(seen) - len(built), "removed": removed, "skipped": skipped}
+
+
+# -----------------------------
+# 5. main
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="สร้าง QR Code และหน้า HTML ของครุภัณฑ์ (เฉพาะรายการที่ใหม่/เปลี่ยน)")
+    parser.add_argument("--jobs", type=int, default=None, help="จำนวน process (ค่าเริ่มต้น = จำนวน CPU)")
+    parser.add_argument("--full", action="store_true", help="สร้างใหม่ทั้งหมด ไม่ใช้ manifest")
+    parser.add_argument("--out", default=OUTPUT_QR, help="โฟลเดอร์ผลลัพธ์ QR")
+    parser.add_argument("--pages-out", default=OUTPUT_PAGES, help="โฟลเดอร์ผลลัพธ์หน้า HTML")
+    parser.add_argument("--skip-qr", action="store_true", help="ไม่สร้าง QR")
+    parser.add_argument("--skip-pages", action="store_true", help="ไม่สร้างหน้า HTML")
+    args = parser.parse_args(argv)
+
+    # โหลดข้อมูล
+    df = asset_data.load_data()
+    codes = asset_codes(df)
 
-    # สร้าง URL สำหรับ Streamlit Cloud
-    qr_url = STREAMLIT_URL + tool_code
+    if not args.skip_qr:
+        summary = build_qr(codes, args.out, jobs=args.jobs, full=args.full)
+        for tool_code in summary["built"]:
+            print(f"✔ QR สร้างแล้ว: {os.path.join(args.out, tool_code + '.png')}")
+        for tool_code in summary["removed"]:
+            print(f"🗑 ลบ QR ของรายการที่ไม่มีแล้ว: {tool_code}")
+        for tool_code in summary["skipped"]:
+            print(f"⚠️ ข้ามรหัสที่ใช้เป็นชื่อไฟล์ไม่ได้: {tool_code!r}")
 
-    # สร้าง QR
-    img = qrcode.make(qr_url)
+        print(
+            f"\n🎉 สร้าง QR Codes เสร็จสมบูรณ์แล้ว! "
+            f"(สร้างใหม่ {len(summary['built'])}, ไม่เปลี่ยน {summary['unchanged']}, ลบ {len(summary['removed'])})"
+        )
+        print(f"📌 ไปที่โฟลเดอร์ {args.out} เพื่อดูไฟล์ทั้งหมด")
 
-    file_name = f"{tool_code}.png"
-    save_path = os.path.join(OUTPUT_QR, file_name)
-    img.save(save_path)
+    if not args.skip_pages:
+        summary = build_pages(df, args.pages_out, full=args.full)
+        print(
+            f"🌐 หน้า HTML: สร้างใหม่ {len(summary['built'])}, ไม่เปลี่ยน {summary['unchanged']}, "
+            f"ลบ {len(summary['removed'])} → {os.path.join(args.pages_out, 'index.html')}"
+        )
+        for code in summary["skipped"]:
+            print(f"⚠️ ข้ามหน้า HTML ของรหัสที่ใช้เป็นชื่อไฟล์ไม่ได้ / ชื่อสงวน (index, search): {code!r}")
 
-    print(f"✔ QR สร้างแล้ว: {save_path}")
 
-print("\n🎉 สร้าง QR Codes เสร็จสมบูรณ์แล้ว!")
-print("📌 ไปที่โฟลเดอร์ qrcodes เพื่อดูไฟล์ทั้งหมด")
+if __name__ == "__main__":
+    main()
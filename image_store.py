@@ -0,0 +1,133 @@
+# image_store.py
+"""จัดเก็บรูปครุภัณฑ์ที่อัปโหลด
+
+- หมุนรูปตาม EXIF (รูปจากมือถือมักเก็บแนวตั้งไว้ใน EXIF) แล้วย่อด้านยาวไม่เกิน MAX_SIDE
+- เข้ารหัสใหม่เป็น WebP (ถ้า Pillow ไม่รองรับใช้ JPEG) พร้อมรูปย่อ (thumbnail) สำหรับหน้าแสดงผล
+- ตั้งชื่อไฟล์ตาม hash ของเนื้อไฟล์ที่อัปโหลด (asset_images/ab/abcd….webp) รูปเดียวกันเก็บครั้งเดียว
+- รูปเก่าที่ไม่ได้ผ่านขั้นตอนนี้ (เช่น asset_images/LAB-AS-001.jpg) จะสร้าง thumbnail ให้ครั้งแรกที่แสดง
+"""
+import hashlib
+import io
+import os
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+BASE_DIR = Path(__file__).resolve().parent
+IMAGE_DIR = BASE_DIR / "asset_images"
+THUMB_CACHE_DIR = IMAGE_DIR / ".thumbs"   # thumbnail ของรูปเก่า
+LEGACY_IMAGE_DIRS = (BASE_DIR / "Smart Asset Lab_Images",)   # รูปที่มากับไฟล์ Excel เดิม
+IMAGE_DIRS = (IMAGE_DIR,) + LEGACY_IMAGE_DIRS                # อ่านรูปได้เฉพาะในโฟลเดอร์เหล่านี้
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+
+MAX_SIDE = 1600      # px ด้านยาวของรูปเต็ม
+THUMB_SIDE = 320     # px ด้านยาวของ thumbnail
+QUALITY = 80
+THUMB_QUALITY = 70
+
+if features.check("webp"):
+    FORMAT, SUFFIX, MIME = "WEBP", ".webp", "image/webp"
+else:
+    FORMAT, SUFFIX, MIME = "JPEG", ".jpg", "image/jpeg"
+
+THUMB_SUFFIX = "_t" + SUFFIX
+
+
+def _open(data: bytes) -> Image.Image:
+    try:
+        img = Image.open(io.BytesIO(data))
+        # JPEG: ให้ตัวถอดรหัสย่อมาให้ตั้งแต่ตอนอ่าน (เร็วกว่าถอดเต็มแล้วค่อยย่อมาก)
+        scale = MAX_SIDE / max(img.size)
+        if scale < 1:
+            img.draft("RGB", (int(img.width * scale) + 1, int(img.height * scale) + 1))
+        img = ImageOps.exif_transpose(img)
+    except Exception as e:
+        raise ValueError(f"ไฟล์ที่อัปโหลดไม่ใช่รูปภาพที่อ่านได้: {e}") from e
+    if img.mode not in ("RGB", "RGBA") or (img.mode == "RGBA" and FORMAT == "JPEG"):
+        img = img.convert("RGB")
+    return img
+
+
+def _encode(img: Image.Image, side: int, quality: int) -> bytes:
+    img = img.copy()
+    img.thumbnail((side, side), Image.LANCZOS)
+    buf = io.BytesIO()
+    if FORMAT == "WEBP":
+        img.save(buf, format=FORMAT, quality=quality, method=4)
+    else:
+        img.save(buf, format=FORMAT, quality=quality, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def _write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _rel(path: Path) -> str:
+    """path แบบ relative จาก BASE_DIR (ใช้ / เสมอ ให้ค่าในฐานข้อมูลเหมือนกันทุกระบบ)"""
+    try:
+        return path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def ingest(data: bytes, image_dir=IMAGE_DIR) -> str:
+    """รับเนื้อไฟล์รูปที่อัปโหลด เก็บรูปเต็ม + thumbnail แล้วคืน path (relative) สำหรับคอลัมน์รูปภาพ"""
+    digest = hashlib.sha256(data).hexdigest()
+    full = Path(image_dir) / digest[:2] / f"{digest}{SUFFIX}"
+    thumb = full.with_name(f"{digest}{THUMB_SUFFIX}")
+    if full.exists() and thumb.exists():
+        return _rel(full)   # รูปนี้เคยอัปโหลดแล้ว
+
+    img = _open(data)
+    _write(full, _encode(img, MAX_SIDE, QUALITY))
+    _write(thumb, _encode(img, THUMB_SIDE, THUMB_QUALITY))
+    return _rel(full)
+
+
+def resolve(value):
+    """path จริงของรูปจากค่าในคอลัมน์รูปภาพ
+
+    คืน None ถ้าว่าง ไม่มีไฟล์ ไม่ใช่นามสกุลรูป หรืออยู่นอก IMAGE_DIRS
+    (ค่าในคอลัมน์แก้ได้จากฟอร์ม ห้ามชี้ไปไฟล์อื่นของระบบ เช่น ../.env.ini)
+    """
+    value = str(value or "").strip()
+    if not value:
+        return None
+    try:
+        path = (BASE_DIR / value).resolve()   # value เป็น absolute ก็ได้ผลเป็น value เอง
+    except (OSError, ValueError):
+        return None
+    if path.suffix.lower() not in IMAGE_SUFFIXES:
+        return None
+    if not any(path.is_relative_to(d.resolve()) for d in IMAGE_DIRS):
+        return None
+    return path if path.is_file() else None
+
+
+def thumbnail(value):
+    """path ของ thumbnail (ไฟล์ที่เข้ารหัสใหม่แล้วเสมอ ชนิดตาม MIME) สำหรับค่าในคอลัมน์รูปภาพ
+
+    รูปที่ผ่าน ingest มี thumbnail อยู่ข้าง ๆ แล้ว ส่วนรูปเก่าจะสร้างลง THUMB_CACHE_DIR
+    (ตั้งชื่อตาม path + mtime + ขนาด ถ้าไฟล์ถูกแทนที่จะได้ thumbnail ใหม่)
+    คืน None ถ้าไม่มีรูป หรือถอดรหัสรูปไม่ได้ (ไม่คืนไฟล์ต้นฉบับ)
+    """
+    full = resolve(value)
+    if full is None:
+        return None
+    thumb = full.with_name(full.stem + THUMB_SUFFIX)
+    if full.suffix == SUFFIX and thumb.is_file():
+        return thumb
+
+    st = full.stat()
+    key = hashlib.sha1(f"{full}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest()
+    thumb = THUMB_CACHE_DIR / f"{key}{THUMB_SUFFIX}"
+    if not thumb.is_file():
+        try:
+            _write(thumb, _encode(_open(full.read_bytes()), THUMB_SIDE, THUMB_QUALITY))
+        except (OSError, ValueError):
+            return None   # ไม่ใช่รูปที่อ่านได้ หรือเขียน cache ไม่ได้
+    return thumb
@@ -0,0 +1,222 @@
+# jobs.py
+"""งานหนักที่สั่งจากหน้าเว็บ (สร้าง QR / PDF ป้าย / หน้า HTML) รันเบื้องหลังใน process ของ Streamlit
+
+    job_id = jobs.submit("qr", jobs.qr_job, codes, label="สร้าง QR 120 รายการ", user="admin")
+    jobs.status(job_id)    # {"state": "running", "done": 40, "total": 120, "percent": 33, ...}
+
+- thread pool เดียวต่อ process (MAX_WORKERS งานพร้อมกัน) งานไม่ผูกกับ rerun จึงทำต่อแม้ผู้ใช้เปลี่ยนหน้า
+- ฟังก์ชันงานรับ progress(done, total, message=None) เป็นอาร์กิวเมนต์แรก
+- หน้าเว็บถามสถานะด้วย status() / list_jobs() (render_jobs() แสดงแผงที่อัปเดตตัวเองระหว่างมีงานค้าง)
+- เก็บงานที่จบแล้วไว้ KEEP_FINISHED งานล่าสุด (ผลลัพธ์ เช่น PDF อยู่ในหน่วยความจำ)
+"""
+import io
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+MAX_WORKERS = 2
+KEEP_FINISHED = 50
+POLL_SECONDS = 1.0
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+STATE_LABELS = {QUEUED: "⏳ รอคิว", RUNNING: "⚙️ กำลังทำ", DONE: "✅ เสร็จแล้ว", FAILED: "❌ ไม่สำเร็จ"}
+RESULT_LABELS = {"built": "สร้างใหม่", "unchanged": "ไม่เปลี่ยน", "removed": "ลบ", "skipped": "ข้าม (รหัสใช้เป็นชื่อไฟล์ไม่ได้)"}
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    label: str
+    user: str | None = None
+    state: str = QUEUED
+    done: int = 0
+    total: int | None = None
+    message: str = ""
+    result: object = None
+    error: str | None = None
+    submitted: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+
+    def snapshot(self) -> dict:
+        percent = None
+        if self.state == DONE:
+            percent = 100
+        elif self.total:
+            percent = min(100, int(self.done * 100 / self.total))
+        end = self.finished or time.time()
+        return {
+            "id": self.id, "kind": self.kind, "label": self.label, "user": self.user,
+            "state": self.state, "done": self.done, "total": self.total, "percent": percent,
+            "message": self.message, "error": self.error, "result": self.result,
+            "submitted": self.submitted, "started": self.started, "finished": self.finished,
+            "elapsed": end - self.started if self.started else 0.0,
+        }
+
+
+_lock = threading.Lock()
+_jobs = OrderedDict()   # {job_id: Job} เรียงตามเวลาที่สั่ง
+_executor = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="asset-job")
+        return _executor
+
+
+def _prune():
+    """ลบงานที่จบแล้วเก่าสุดเมื่อเกิน KEEP_FINISHED (ต้องถือ _lock อยู่)"""
+    finished = [j.id for j in _jobs.values() if j.state in (DONE, FAILED)]
+    for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+        del _jobs[job_id]
+
+
+def _run(job: Job, fn, args, kwargs):
+    def progress(done, total=None, message=None):
+        with _lock:
+            job.done = done
+            if total is not None:
+                job.total = total
+            if message is not None:
+                job.message = message
+
+    with _lock:
+        job.state, job.started = RUNNING, time.time()
+    try:
+        result = fn(progress, *args, **kwargs)
+    except Exception as e:
+        with _lock:
+            job.state, job.error = FAILED, f"{type(e).__name__}: {e}"
+            job.message = traceback.format_exc(limit=3)
+    else:
+        with _lock:
+            job.state, job.result = DONE, result
+    finally:
+        with _lock:
+            job.finished = time.time()
+            _prune()
+
+
+def submit(kind: str, fn, *args, label="", user=None, **kwargs) -> str:
+    """ส่งงานเข้าคิว คืน job_id ทันที (fn(progress, *args, **kwargs) รันใน thread pool)"""
+    job = Job(id=uuid.uuid4().hex[:12], kind=kind, label=label or kind, user=user)
+    with _lock:
+        _jobs[job.id] = job
+    _pool().submit(_run, job, fn, args, kwargs)
+    return job.id
+
+
+def status(job_id) -> dict | None:
+    """สถานะของงาน (dict) หรือ None ถ้าไม่มีงานนี้แล้ว"""
+    with _lock:
+        job = _jobs.get(job_id)
+        return job.snapshot() if job else None
+
+
+def list_jobs(ids=None, user=None) -> list:
+    """สถานะของหลายงาน (ใหม่สุดก่อน) กรองตาม ids และ/หรือ user"""
+    with _lock:
+        jobs = [
+            j.snapshot() for j in reversed(_jobs.values())
+            if (ids is None or j.id in ids) and (user is None or j.user == user)
+        ]
+    return jobs
+
+
+def is_active(job_id) -> bool:
+    with _lock:
+        job = _jobs.get(job_id)
+        return job is not None and job.state in (QUEUED, RUNNING)
+
+
+# ---------- งานที่หน้าเว็บสั่งได้ ----------
+_qr_lock = threading.Lock()   # สร้าง QR ได้ทีละงาน (งานถัดไปรอในคิว)
+
+
+def qr_job(progress, codes, out_dir=None, full=False) -> dict:
+    """สร้าง QR ของรหัสที่กำหนด (เฉพาะที่ใหม่/เปลี่ยน ไม่ลบไฟล์ของรหัสอื่น)"""
+    from build_pages_and_qr import OUTPUT_QR, build_qr
+
+    progress(0, len(codes), "รองานสร้าง QR ก่อนหน้า")
+    with _qr_lock:
+        progress(0, len(codes), "")
+        summary = build_qr(codes, out_dir or OUTPUT_QR, full=full, prune=False,
+                           progress=lambda done, total: progress(done, total, f"สร้างใหม่ {done}/{total}"))
+    progress(len(codes), len(codes))
+    return {"built": len(summary["built"]), "unchanged": summary["unchanged"], "skipped": len(summary["skipped"])}
+
+
+def labels_job(progress, codes=None, location=None, start=0) -> dict:
+    """PDF ป้าย QR ในหน่วยความจำ คืน {"pdf": bytes, "count": n}"""
+    import asset_data
+    from build_labels_pdf import build_labels, select_assets
+
+    assets = list(select_assets(asset_data.load_data(), codes, location))
+    progress(0, len(assets))
+    buf = io.BytesIO()
+    count = build_labels(assets, buf, start, progress=lambda done: progress(done, len(assets)))
+    progress(count, len(assets))
+    return {"pdf": buf.getvalue(), "count": count}
+
+
+def pages_job(progress, out_dir=None, full=False) -> dict:
+    """สร้างหน้า HTML ต่อรายการ + index.html + search.json จากข้อมูลปัจจุบัน"""
+    import asset_data
+    from build_pages_and_qr import OUTPUT_PAGES, build_pages
+
+    df = asset_data.load_data()
+    summary = build_pages(df, out_dir or OUTPUT_PAGES, full=full, progress=progress)
+    progress(len(df), len(df))
+    return {"built": len(summary["built"]), "unchanged": summary["unchanged"], "removed": len(summary["removed"]),
+            "skipped": len(summary["skipped"])}
+
+
+# ---------- แผงใน Streamlit ----------
+def track(job_id, key="job_ids"):
+    """จำ job_id ไว้ใน session (แผงงานแสดงเฉพาะงานของ session นี้)"""
+    import streamlit as st
+
+    st.session_state.setdefault(key, []).append(job_id)
+
+
+def render_jobs(key="job_ids"):
+    """แผงสถานะงานของ session นี้ ระหว่างมีงานค้างจะอัปเดตตัวเองทุก POLL_SECONDS (ไม่ rerun ทั้งหน้า)"""
+    import streamlit as st
+
+    ids = [i for i in st.session_state.get(key, []) if status(i) is not None]
+    st.session_state[key] = ids
+    if not ids:
+        return
+    polling = any(is_active(i) for i in ids)
+
+    @st.fragment(run_every=POLL_SECONDS if polling else None)
+    def panel():
+        for job in list_jobs(ids):
+            st.markdown(f"**{job['label']}** · {STATE_LABELS[job['state']]} · {job['elapsed']:.1f} วินาที")
+            if job["state"] in (QUEUED, RUNNING):
+                total = f"{job['done']:,}/{job['total']:,}" if job["total"] else ""
+                st.progress((job["percent"] or 0) / 100, text=total)
+            elif job["state"] == FAILED:
+                st.error(job["error"])
+            elif job["kind"] == "labels":
+                st.download_button(
+                    f"⬇️ ดาวน์โหลด PDF ({job['result']['count']} ป้าย)",
+                    data=job["result"]["pdf"],
+                    file_name="qr_labels_A4_pages.pdf",
+                    mime="application/pdf",
+                    key=f"job_download_{job['id']}",
+                )
+            else:
+                st.caption(" · ".join(f"{RESULT_LABELS.get(k, k)} {v:,}" for k, v in job["result"].items()))
+        if polling and not any(is_active(i) for i in ids):
+            st.rerun()   # งานจบครบแล้ว → rerun ทั้งหน้าหนึ่งครั้งเพื่อหยุด polling
+
+    panel()
@@ -0,0 +1,185 @@
+# perf.py
+"""จับเวลาแต่ละขั้นตอนของหน้า (โหลด / ค้นหา / บันทึก / รูปภาพ ฯลฯ) ต่อ rerun
+
+    perf.begin("dashboard")            # ต้นหน้า
+    with perf.timer("search"):         # หรือ @perf.timed("load") กับฟังก์ชัน
+        ...
+    perf.end()                         # ท้ายหน้า (บันทึกเวลารวมของ rerun)
+    perf.stop() / perf.rerun()         # แทน st.stop() / st.rerun() กลางหน้า (บันทึกเวลารวมก่อนออก)
+
+- เก็บเวลาล่าสุด WINDOW ครั้งต่อ (หน้า, ขั้นตอน) ในหน่วยความจำของ process
+- admin เห็นแผง "⏱ ประสิทธิภาพ" ใน sidebar (render_panel) แสดง p50 / p90 / p99
+- เขียนลงไฟล์ได้ (ตั้ง PERF_METRICS_FILE ใน environment หรือ .env): .jsonl = ต่อท้ายทีละ rerun,
+  .prom = ไฟล์ Prometheus text format (เขียนทับทุก rerun ใช้กับ textfile collector ของ node_exporter)
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+# ทุกหน้า import perf ก่อน auth → โหลด .env เองด้วย ไม่งั้น PERF_METRICS_FILE ใน .env ไม่มีผล
+load_dotenv()
+
+WINDOW = 200
+QUANTILES = (0.5, 0.9, 0.99)
+
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))   # (หน้า, ขั้นตอน) → เวลาล่าสุด (วินาที)
+_totals = defaultdict(lambda: [0, 0.0])                 # (หน้า, ขั้นตอน) → [จำนวนครั้ง, เวลารวม]
+_lock = threading.Lock()
+_local = threading.local()                              # rerun ปัจจุบันของ thread นี้ (Streamlit รันแต่ละ session ใน thread ของตัวเอง)
+
+
+def metrics_file() -> str:
+    """ไฟล์ metrics จาก PERF_METRICS_FILE (อ่านทุกครั้ง ไม่ผูกกับลำดับการ import) ว่าง = ไม่บันทึก"""
+    return os.getenv("PERF_METRICS_FILE", "").strip()
+
+
+def begin(page: str):
+    """เริ่มจับเวลา rerun ของหน้า page"""
+    _local.page = page
+    _local.start = time.perf_counter()
+    _local.steps = {}
+
+
+def record(step: str, seconds: float, page=None):
+    page = page or getattr(_local, "page", "-")
+    with _lock:
+        _samples[(page, step)].append(seconds)
+        total = _totals[(page, step)]
+        total[0] += 1
+        total[1] += seconds
+    steps = getattr(_local, "steps", None)
+    if steps is not None and getattr(_local, "page", None) == page:
+        steps[step] = steps.get(step, 0.0) + seconds
+
+
+@contextmanager
+def timer(step: str):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(step, time.perf_counter() - t)
+
+
+def timed(step: str):
+    """decorator: จับเวลาทุกครั้งที่เรียกฟังก์ชัน"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(step):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def end():
+    """จบ rerun: บันทึกเวลารวม (ขั้นตอน "rerun") แล้วเขียนไฟล์ metrics ถ้าเปิดไว้"""
+    start = getattr(_local, "start", None)
+    if start is None:
+        return
+    page = _local.page
+    record("rerun", time.perf_counter() - start, page)
+    steps = dict(_local.steps)
+    _local.start = None
+    path = metrics_file()
+    if path:
+        try:
+            if str(path).endswith(".prom"):
+                write_prometheus(path)
+            else:
+                _append_jsonl(path, page, steps)
+        except OSError:
+            pass  # เขียนไฟล์ไม่ได้ไม่ควรทำให้หน้าพัง
+
+
+def stop():
+    """end() แล้ว st.stop() (ออกจากหน้ากลางทางโดยไม่เสียตัวอย่างเวลาของ rerun นี้)"""
+    import streamlit as st
+
+    end()
+    st.stop()
+
+
+def rerun():
+    """end() แล้ว st.rerun()"""
+    import streamlit as st
+
+    end()
+    st.rerun()
+
+
+# ---------- สรุปผล ----------
+def summary(page=None) -> pd.DataFrame:
+    """ตารางสรุปเวลา (มิลลิวินาที) ต่อ (หน้า, ขั้นตอน) จากเวลาล่าสุด WINDOW ครั้ง"""
+    with _lock:
+        items = [(k, list(v)) for k, v in _samples.items() if page is None or k[0] == page]
+    rows = []
+    for (p, step), values in sorted(items):
+        arr = np.asarray(values) * 1000
+        row = {"หน้า": p, "ขั้นตอน": step, "ครั้ง": len(arr)}
+        for q in QUANTILES:
+            row[f"p{int(q * 100)}"] = round(float(np.quantile(arr, q)), 2)
+        row["max"] = round(float(arr.max()), 2)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _append_jsonl(path, page, steps):
+    line = {"ts": time.time(), "page": page, "steps": {k: round(v, 6) for k, v in steps.items()}}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus(path):
+    """เขียนไฟล์ Prometheus text format (summary: quantile + _sum + _count)"""
+    with _lock:
+        items = [(k, list(v), tuple(_totals[k])) for k, v in _samples.items()]
+    lines = [
+        "# HELP smart_asset_step_seconds Time spent per page step (recent reruns).",
+        "# TYPE smart_asset_step_seconds summary",
+    ]
+    for (page, step), values, (count, total) in sorted(items):
+        labels = f'page="{_label(page)}",step="{_label(step)}"'
+        for q in QUANTILES:
+            lines.append(f'smart_asset_step_seconds{{{labels},quantile="{q}"}} {np.quantile(values, q):.6f}')
+        lines.append(f"smart_asset_step_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"smart_asset_step_seconds_count{{{labels}}} {count}")
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ---------- แผงใน sidebar ----------
+def render_panel():
+    """แผงเวลาใน sidebar (เฉพาะ admin)"""
+    import streamlit as st
+    from auth import is_admin
+
+    if not is_admin():
+        return
+    with st.sidebar.expander("⏱ ประสิทธิภาพ (admin)"):
+        page = getattr(_local, "page", None)
+        only_page = st.checkbox("เฉพาะหน้านี้", value=True, key="perf_only_page")
+        table = summary(page if only_page else None)
+        if table.empty:
+            st.caption("ยังไม่มีข้อมูล (จะมีหลัง rerun แรก)")
+        else:
+            st.dataframe(table, hide_index=True, use_container_width=True)
+            st.caption(f"หน่วย: มิลลิวินาที จาก {WINDOW} ครั้งล่าสุดต่อขั้นตอน")
+        # path ตั้งได้เฉพาะจาก PERF_METRICS_FILE (ไม่รับ path จากหน้าเว็บ)
+        path = metrics_file()
+        st.caption(f"บันทึกลงไฟล์: `{path}`" if path else "ไม่บันทึกลงไฟล์ (ตั้ง PERF_METRICS_FILE ใน .env)")
@@ -0,0 +1,100 @@
+# qr_render.py
+"""สร้างรูป QR ตอนเปิดหน้า (ไม่ต้องรอรัน build_pages_and_qr.py)
+
+- ถ้าไฟล์ใน qrcodes/ ยังตรงกับ URL ปัจจุบัน (ตรวจจาก hash ใน manifest ของ build) ใช้ไฟล์นั้น
+  manifest อ่านครั้งเดียวแล้วจำไว้ตาม mtime (อ่านใหม่เมื่อ build เขียนทับ) ไม่ต้อง parse ทั้งไฟล์ทุก rerun
+- ถ้าไม่มีไฟล์หรือไฟล์เก่า render ในหน่วยความจำ เก็บไว้ใน LRU cache ตาม URL
+- เลือกเขียนไฟล์กลับลง qrcodes/ ได้ (พร้อมอัปเดต manifest ให้ build รอบหน้าไม่ต้องสร้างซ้ำ)
+"""
+import io
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from build_pages_and_qr import (
+    MANIFEST_NAME, QR_SETTINGS, content_hash, file_stem, load_manifest, make_qr_image, manifest_lock, save_manifest,
+)
+
+CACHE_SIZE = 256
+
+_manifest_lock = threading.Lock()
+_manifest_memo = {}   # {qr_dir: (mtime_ns, manifest)} ห้ามแก้ dict ที่จำไว้ตรง ๆ
+
+
+def _mtime(qr_dir):
+    try:
+        return (Path(qr_dir) / MANIFEST_NAME).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def cached_manifest(qr_dir) -> dict:
+    """manifest ของ qr_dir (อ่านใหม่เมื่อไฟล์เปลี่ยน) ใช้อ่านอย่างเดียว"""
+    mtime = _mtime(qr_dir)
+    if mtime is None:
+        return {}
+    with _manifest_lock:
+        cached = _manifest_memo.get(str(qr_dir))
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_manifest(qr_dir))
+            _manifest_memo[str(qr_dir)] = cached
+        return cached[1]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_qr_png(url: str) -> bytes:
+    """PNG ของ QR สำหรับ url (จำไว้ล่าสุด CACHE_SIZE รายการ)"""
+    buf = io.BytesIO()
+    make_qr_image(url, QR_SETTINGS).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def qr_path(code, qr_dir):
+    """path ของไฟล์ QR ของรหัสใน qr_dir หรือ None ถ้ารหัสใช้เป็นชื่อไฟล์ไม่ได้ / path ออกนอก qr_dir
+
+    code มาจากฟอร์มแก้ไข (ผู้ใช้พิมพ์เอง) เช่น "../escaped" ต้องไม่เขียนไฟล์นอก qr_dir
+    """
+    stem = file_stem(code)
+    if stem is None:
+        return None
+    qr_dir = Path(qr_dir)
+    path = qr_dir / f"{stem}.png"
+    if not path.resolve().is_relative_to(qr_dir.resolve()):
+        return None
+    return path
+
+
+def qr_image(code: str, url: str, qr_dir, write_back=False):
+    """คืน (รูป, แหล่งที่มา) ใช้ส่งให้ st.image ได้ทันที
+
+    แหล่งที่มา: "file" = ไฟล์ใน qr_dir ที่ยังตรงกับ url, "memory" = render ใหม่ (และเขียนกลับถ้า write_back)
+    รหัสที่ใช้เป็นชื่อไฟล์ไม่ได้ (qr_path เป็น None) render ในหน่วยความจำเสมอ ไม่อ่าน/เขียนไฟล์และ manifest
+    """
+    qr_dir = Path(qr_dir)
+    path = qr_path(code, qr_dir)
+    if path is None:
+        return render_qr_png(url), "memory"
+    file_name = path.name
+    h = content_hash(code, url)
+    manifest = cached_manifest(qr_dir)
+    if path.exists() and manifest.get(code, {}).get("hash") == h:
+        return str(path), "file"
+
+    png = render_qr_png(url)
+    if write_back:
+        try:
+            qr_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(png)
+            os.replace(tmp, path)
+            with manifest_lock(qr_dir):
+                # สำเนาของ manifest ล่าสุด + รายการนี้ แล้วจำฉบับที่เขียนไว้เลย (ไม่ต้อง parse ใหม่ rerun ถัดไป)
+                manifest = dict(cached_manifest(qr_dir))
+                manifest[code] = {"hash": h, "file": file_name}
+                save_manifest(manifest, qr_dir)
+                with _manifest_lock:
+                    _manifest_memo[str(qr_dir)] = (_mtime(qr_dir), manifest)
+        except (OSError, TimeoutError):
+            pass  # โฟลเดอร์อ่านอย่างเดียว → แสดงจากหน่วยความจำไปก่อน
+    return png, "memory"
@@ -1,4 +1,5 @@
 @echo off
 pip install pandas openpyxl "qrcode[pil]" reportlab Pillow
 python build_pages_and_qr.py
+python build_labels_pdf.py
 pause
@@ -0,0 +1,236 @@
+# scan_server.py
+"""หน้ารายละเอียดครุภัณฑ์แบบอ่านอย่างเดียวสำหรับการสแกน QR (ไม่ต้องเปิด session ของ Streamlit)
+
+    python scan_server.py --port 8502
+
+- GET /LAB-AS-001.html หรือ /?code=LAB-AS-001 → หน้ารายละเอียด (template เดียวกับ build_pages_and_qr.py)
+  (/<รหัส>.html เฉพาะรหัสที่มีหน้า HTML ตาม page_stem: รหัสอย่าง index / search / A/B ใช้ ?code= และ QR ของรหัสนั้นชี้ไป Streamlit)
+- GET /index.html, /search.json             → รายการทั้งหมด + ค้นหาในเบราว์เซอร์ (เหมือนโฟลเดอร์ pages/)
+- GET /image?code=LAB-AS-001                → รูปย่อของรายการ (เฉพาะรูปย่อที่สร้างจากรูปใน image_store.IMAGE_DIRS)
+- GET /healthz
+
+อ่านข้อมูลจาก memo ของ asset_data (ตาม revision ของฐานข้อมูล ไม่อ่านใหม่ทุกครั้ง)
+ถ้าฐานข้อมูลถูกแบ่งตามคำนำหน้ารหัส (asset_partitions.py) การสแกนหนึ่งรหัสโหลดเฉพาะ partition ของรหัสนั้น
+ทุกคำตอบมี ETag / Last-Modified: สแกนซ้ำโดยที่ข้อมูลไม่เปลี่ยนได้ 304 ไม่ต้องส่งหน้าใหม่
+ปุ่ม "แก้ไขข้อมูล" ยังไปที่ฟอร์มใน Streamlit (EDIT_URL) เหมือนหน้า HTML ที่ build_pages_and_qr.py สร้าง
+
+ให้ QR ชี้มาที่ server นี้: ตั้ง BASE_URL ใน build_pages_and_qr.py เป็น URL ของ server
+เช่น "https://scan.example.org/" แล้วรัน build_pages_and_qr.py ใหม่ (QR จะเป็น .../<รหัส>.html)
+"""
+import argparse
+import hashlib
+import html
+import json
+import sys
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import asset_data
+import image_store
+from asset_db import DB_PATH
+from build_pages_and_qr import (
+    COL_CODE, COL_IMAGE, INDEX_HTML, SEARCH_FIELDS, _cell, page_columns, page_hash, page_stem, render_page,
+)
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json; charset=utf-8"
+
+# ตรวจกับ server ทุกครั้ง (ได้ 304 ถ้าไม่เปลี่ยน) หน้าที่แก้แล้วจึงไม่ค้างในมือถือ
+CACHE_CONTROL = "no-cache"
+
+NOT_FOUND_HTML = """<!doctype html>
+<html lang="th"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1"><title>ไม่พบข้อมูล</title></head>
+<body style="font-family:system-ui,sans-serif;max-width:720px;margin:auto;padding:16px">
+<h1>ไม่พบข้อมูล</h1><p>{message}</p><p><a href="/index.html">📋 รายการทั้งหมด</a></p>
+</body></html>
+"""
+
+_search_lock = threading.Lock()
+_search_cache = {}   # {db_path: (revision, body, etag)}
+
+
+def _etag(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return '"' + hashlib.sha1(data).hexdigest() + '"'
+
+
+_INDEX_ETAG = _etag(INDEX_HTML)
+
+
+def _search_json(db_path):
+    """search.json ของข้อมูลชุดปัจจุบัน (สร้างครั้งเดียวต่อ revision)"""
+    revision = asset_data.revision(db_path)
+    with _search_lock:
+        cached = _search_cache.get(str(db_path))
+        if cached is None or cached[0] != revision:
+            df = asset_data.load_data(db_path)
+            fields = [c for c in SEARCH_FIELDS if c in df.columns]
+            rows, seen = [], set()
+            for values in df[fields].itertuples(index=False, name=None):
+                row = [_cell(v) for v in values]
+                # index.html ลิงก์ไป /<รหัส>.html → เฉพาะรหัสที่มีหน้า (เหมือน search.json ของ build_pages)
+                if row[0] and row[0] not in seen and page_stem(row[0]) is not None:
+                    seen.add(row[0])
+                    rows.append(row)
+            body = json.dumps({"fields": fields, "rows": rows}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            cached = (revision, body, _etag(body))
+            _search_cache[str(db_path)] = cached
+        return cached[1], cached[2]
+
+
+class ScanHandler(BaseHTTPRequestHandler):
+    server_version = "SmartAssetScan/1.0"
+    protocol_version = "HTTP/1.1"   # keep-alive: มือถือที่เปิดหลายรายการใช้การเชื่อมต่อเดิม
+    disable_nagle_algorithm = True  # header กับ body ส่งแยกกัน ไม่ให้ค้างรอ delayed ACK (~40 ms)
+    db_path = DB_PATH
+    verbose = False
+
+    def do_GET(self):
+        self._route(send_body=True)
+
+    def do_HEAD(self):
+        self._route(send_body=False)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    # ---------- routing ----------
+    def _route(self, send_body):
+        self.send_body = send_body
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        code = query.get("code", [""])[0].strip()
+        try:
+            if path in ("/", "/asset") and code:
+                self._detail(code)
+            elif path in ("/", "/index.html"):
+                if not self._not_modified(_INDEX_ETAG, None):
+                    self._send(HTTPStatus.OK, INDEX_HTML.encode("utf-8"), HTML, etag=_INDEX_ETAG)
+            elif path == "/search.json":
+                body, etag = _search_json(self.db_path)
+                if not self._not_modified(etag, None):
+                    self._send(HTTPStatus.OK, body, JSON, etag=etag)
+            elif path == "/image" and code:
+                self._image(code)
+            elif path == "/healthz":
+                body = json.dumps({"revision": asset_data.revision(self.db_path)}, ensure_ascii=False)
+                self._send(HTTPStatus.OK, body.encode("utf-8"), JSON, cache="no-store")
+            elif path.endswith(".html") and path.count("/") == 1 and page_stem(path[1:-len(".html")]) is not None:
+                self._detail(path[1:-len(".html")])
+            else:
+                self._not_found("ไม่พบหน้าที่ต้องการ")
+        except FileNotFoundError as e:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, str(e).encode("utf-8"), "text/plain; charset=utf-8",
+                       cache="no-store")
+
+    def _detail(self, code):
+        found = asset_data.load_row(code, self.db_path)
+        if found is None:
+            self._not_found(f"ไม่พบข้อมูลสำหรับรหัส <b>{html.escape(code)}</b>")
+            return
+        rowid, values = found
+        record = {str(c): _cell(v) for c, v in values.items()}
+        columns = page_columns(list(record))
+        # ETag จากเนื้อหาหน้า (hash เดียวกับ manifest ของ build_pages) → ตรวจได้โดยไม่ต้อง render
+        etag = '"' + page_hash(record, columns) + '"'
+        last_modified = asset_data.last_modified(rowid, self.db_path)
+        if self._not_modified(etag, last_modified):
+            return
+        image_src = "/image?code=" + quote(record.get(COL_CODE, code)) if record.get(COL_IMAGE) else None
+        body = render_page(record, columns, image_src=image_src).replace('href="index.html"', 'href="/index.html"')
+        self._send(HTTPStatus.OK, body.encode("utf-8"), HTML, etag=etag, last_modified=last_modified)
+
+    def _image(self, code):
+        # ส่งเฉพาะรูปย่อที่ image_store เข้ารหัสใหม่แล้ว (ไม่ส่งไฟล์ตามค่าในคอลัมน์ตรง ๆ)
+        found = asset_data.load_row(code, self.db_path)
+        thumb = image_store.thumbnail(found[1].get(COL_IMAGE)) if found else None
+        if thumb is None:
+            self._not_found(f"ไม่มีรูปภาพของรหัส <b>{html.escape(code)}</b>")
+            return
+        st = thumb.stat()
+        etag = '"' + hashlib.sha1(f"{thumb}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest() + '"'
+        if self._not_modified(etag, st.st_mtime):
+            return
+        self._send(HTTPStatus.OK, thumb.read_bytes(), image_store.MIME, etag=etag, last_modified=st.st_mtime)
+
+    def _not_found(self, message):
+        body = NOT_FOUND_HTML.format(message=message).encode("utf-8")
+        self._send(HTTPStatus.NOT_FOUND, body, HTML, cache="no-store")
+
+    # ---------- HTTP caching ----------
+    def _not_modified(self, etag, last_modified) -> bool:
+        """ตอบ 304 ถ้าเบราว์เซอร์มีฉบับเดียวกันอยู่แล้ว (If-None-Match ก่อน แล้วค่อย If-Modified-Since)"""
+        match = self.headers.get("If-None-Match")
+        if match is not None:
+            tags = {t.strip().removeprefix("W/") for t in match.split(",")}
+            fresh = "*" in tags or etag in tags
+        else:
+            since = self.headers.get("If-Modified-Since")
+            fresh = False
+            if since and last_modified is not None:
+                try:
+                    fresh = int(last_modified) <= parsedate_to_datetime(since).timestamp()
+                except (TypeError, ValueError):
+                    fresh = False
+        if fresh:
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, etag=etag, last_modified=last_modified)
+        return fresh
+
+    def _send(self, status, body: bytes, content_type, etag=None, last_modified=None, cache=CACHE_CONTROL):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        if last_modified is not None:
+            self.send_header("Last-Modified", formatdate(last_modified, usegmt=True))
+        self.send_header("Cache-Control", cache)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.send_body and body and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+
+
+def make_server(host="0.0.0.0", port=8502, db_path=DB_PATH, verbose=False) -> ThreadingHTTPServer:
+    handler = type("Handler", (ScanHandler,), {"db_path": db_path, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="หน้ารายละเอียดครุภัณฑ์แบบอ่านอย่างเดียว สำหรับการสแกน QR")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", default=str(DB_PATH))
+    parser.add_argument("--verbose", action="store_true", help="แสดง log ทุก request")
+    args = parser.parse_args(argv)
+
+    # ไฟล์เดียว: โหลดข้อมูลและดัชนีไว้ก่อน การสแกนครั้งแรกจะไม่ช้า
+    # แบ่ง partition แล้ว: โหลดเมื่อมีการสแกนรหัสของ partition นั้นครั้งแรก
+    try:
+        asset_data.revision(args.db)
+        if asset_data.load_map(args.db) is None:
+            asset_data.load_index(args.db)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    server = make_server(args.host, args.port, args.db, args.verbose)
+    print(f"✔ scan server: http://{args.host}:{args.port}/index.html (Ctrl+C เพื่อหยุด)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
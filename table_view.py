@@ -0,0 +1,111 @@
+# table_view.py
+"""ตารางครุภัณฑ์แบบแบ่งหน้า (ใช้ใน Dashboard และ QR Assets)
+
+ตัดข้อมูลเฉพาะหน้าปัจจุบัน + คอลัมน์ที่เลือกก่อนส่งให้ st.dataframe
+(ไม่ส่งทั้งตารางไปเบราว์เซอร์ทุก rerun) การเรียงใช้อันดับที่คำนวณไว้ต่อ revision (asset_data.load_sort_rank)
+จึงเปลี่ยนหน้า/เรียงใหม่ได้โดยไม่ต้อง sort หรือกรองทั้งตารางซ้ำ
+"""
+import numpy as np
+import streamlit as st
+
+import asset_data
+import asset_export
+
+PAGE_SIZES = (25, 50, 100, 200)
+NO_SORT = "(ไม่เรียง)"
+
+
+def sorted_positions(n_rows, positions=None, sort_col=None, descending=False, db_path=asset_data.DB_PATH):
+    """ตำแหน่งแถวตามลำดับที่จะแสดง
+
+    - positions : ตำแหน่งแถวที่ผ่านการกรอง (None = ทุกแถว, ลำดับเดิมเช่นความตรงของผลค้นหาจะคงไว้ถ้าไม่เรียง)
+    - sort_col  : คอลัมน์ที่ใช้เรียง (None = ไม่เรียง)
+    """
+    if sort_col is None:
+        return np.arange(n_rows) if positions is None else np.asarray(positions, dtype=np.int64)
+
+    rank = asset_data.load_sort_rank(sort_col, db_path)
+    if positions is None:
+        order = np.empty(len(rank), dtype=np.int64)
+        order[rank] = np.arange(len(rank))   # inverse ของ rank = ลำดับการเรียงของทุกแถว
+    else:
+        positions = np.asarray(positions, dtype=np.int64)
+        order = positions[np.argsort(rank[positions], kind="stable")]
+    return order[::-1] if descending else order
+
+
+def render_table(df, positions=None, key="table", columns=None, filter_key="", height=None):
+    """แสดงตารางแบบแบ่งหน้า
+
+    - df         : DataFrame ของหน้า (ตำแหน่งแถวตรงกับข้อมูลกลางจาก asset_data.load_data)
+    - positions  : ตำแหน่งแถวที่ผ่านการกรอง (None = ทุกแถว)
+    - columns    : คอลัมน์ที่แสดงเริ่มต้น (None = ทุกคอลัมน์)
+    - filter_key : ค่าที่ใช้กรอง (เช่นคำค้น) ถ้าเปลี่ยนจะกลับไปหน้า 1
+    คืนตำแหน่งแถวของหน้าที่แสดงอยู่
+    """
+    total = len(df) if positions is None else len(positions)
+    all_columns = list(df.columns)
+
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_filter") != filter_key:
+        st.session_state[f"{key}_filter"] = filter_key
+        st.session_state[page_key] = 1
+
+    c_cols, c_sort, c_dir, c_size = st.columns([4, 2, 1, 1])
+    with c_cols:
+        shown = st.multiselect(
+            "คอลัมน์ที่แสดง",
+            all_columns,
+            default=[c for c in (columns or all_columns) if c in all_columns],
+            key=f"{key}_columns",
+        )
+    with c_sort:
+        sort_col = st.selectbox("เรียงตาม", [NO_SORT] + all_columns, key=f"{key}_sort")
+    with c_dir:
+        descending = st.toggle("มาก→น้อย", key=f"{key}_desc")
+    with c_size:
+        page_size = st.selectbox("ต่อหน้า", PAGE_SIZES, key=f"{key}_size")
+
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+
+    order = sorted_positions(len(df), positions, None if sort_col == NO_SORT else sort_col, descending)
+    page = st.number_input("หน้า", min_value=1, max_value=pages, step=1, key=page_key)
+    start = (page - 1) * page_size
+    page_pos = order[start:start + page_size]
+
+    col_idx = [df.columns.get_loc(c) for c in (shown or all_columns)]
+    size = {"height": height} if height else {}
+    st.dataframe(df.iloc[page_pos, col_idx], use_container_width=True, **size)
+    if total:
+        st.caption(f"แสดง {start + 1:,}–{start + len(page_pos):,} จาก {total:,} รายการ (หน้า {page}/{pages})")
+    return page_pos
+
+
+def render_export(df, positions=None, key="table", file_stem="assets"):
+    """ปุ่มดาวน์โหลดรายการที่กรองอยู่ (ลำดับ/คอลัมน์ตามตาราง key) เป็น CSV / JSON-lines / Excel
+
+    ไฟล์ถูกสร้างตอนกดปุ่มเท่านั้น (st.download_button รับ callable) และเขียนทีละก้อนลงไฟล์ชั่วคราว
+    """
+    total = len(df) if positions is None else len(positions)
+    shown = st.session_state.get(f"{key}_columns") or list(df.columns)
+    sort_col = st.session_state.get(f"{key}_sort", NO_SORT)
+    descending = st.session_state.get(f"{key}_desc", False)
+
+    c_fmt, c_btn = st.columns([1, 3])
+    with c_fmt:
+        fmt = st.selectbox("รูปแบบไฟล์", list(asset_export.FORMATS), key=f"{key}_export_fmt")
+    with c_btn:
+        def build():
+            order = sorted_positions(len(df), positions, None if sort_col == NO_SORT else sort_col, descending)
+            return asset_export.export_file(df, order, shown, fmt)
+
+        st.download_button(
+            f"⬇️ ส่งออก {total:,} รายการ ({fmt})",
+            data=build,
+            file_name=f"{file_stem}.{fmt}",
+            mime=asset_export.FORMATS[fmt],
+            disabled=not total,
+            key=f"{key}_export",
+        )
@@ -0,0 +1,38 @@
+# tests/conftest.py
+"""fixture ร่วม: ฐานข้อมูลเล็ก ๆ ใน tmp_path (ไม่แตะ smart_asset.db / Excel จริงของโปรเจกต์)"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))   # โมดูลอยู่ที่รากโปรเจกต์
+
+import asset_data  # noqa: E402
+from asset_db import AssetDB  # noqa: E402
+
+COL_CODE = "รหัสเครื่องมือห้องปฏิบัติการ"
+COL_NAME = "ชื่อ"
+COL_LOC = "สถานที่ใช้งาน (ปัจจุบัน)"
+
+
+def sample_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        COL_CODE: ["LAB-AS-001", "LAB-AS-002", "LAB-AS-010", "MT-CH-001", "MT-CH-002"],
+        "AssetID": ["A-1", "A-2", "A-10", "M-1", "M-2"],
+        COL_NAME: ["กล้องจุลทรรศน์", "เครื่องปั่นเหวี่ยง", "ตู้อบ", "ปิเปต", "เครื่องชั่ง"],
+        COL_LOC: ["ห้อง 101", "ห้อง 101", "ห้อง 102", "ห้อง 201", "ห้อง 201"],
+    })
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """ไฟล์ฐานข้อมูลที่นำเข้า sample_frame() แล้ว ปิด writer/การเชื่อมต่อเมื่อจบ test"""
+    path = tmp_path / "smart_asset.db"
+    db = AssetDB(path)
+    db.import_frame(sample_frame(), user="test")
+    db.close()
+    yield path
+    paths = [path] + sorted(tmp_path.glob("smart_asset.*.db"))
+    asset_data.release(paths)
+    asset_data.clear_cache()
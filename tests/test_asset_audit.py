@@ -0,0 +1,52 @@
+# tests/test_asset_audit.py
+"""ตรวจนับ: แยกสถานะของรหัสที่สแกนทั้งห้อง และย้ายสถานที่ของรายการที่ผิดห้องโดยไม่ทับการแก้ของคนอื่น"""
+import asset_audit
+import asset_data
+from asset_audit import FOUND, MISSING, UNKNOWN, WRONG_LOCATION
+from conftest import COL_CODE, COL_LOC, sample_frame
+
+
+def test_code_from_scan_reads_qr_urls():
+    assert asset_audit.code_from_scan(" LAB-AS-001 ") == "LAB-AS-001"
+    assert asset_audit.code_from_scan("http://host:8501/?code=LAB-AS-002") == "LAB-AS-002"
+    assert asset_audit.code_from_scan("https://host/pages/MT-CH-001.html") == "MT-CH-001"
+    assert asset_audit.parse_codes("A-1, A-2;\nA-1  ") == ["A-1", "A-2", "A-1"]
+
+
+def test_reconcile_statuses():
+    scans = [
+        "lab-as-001", "http://host/?code=LAB-AS-001",    # ซ้ำ: นับเป็นรหัสเดียว 2 ครั้ง
+        "https://host/pages/MT-CH-001.html",             # อยู่ห้อง 201 ตามระบบ
+        "XX-999",
+    ]
+    report = asset_audit.reconcile(sample_frame(), scans, " ห้อง 101 ")
+
+    got = {row.code: (row.status, row.scans) for row in report.itertuples(index=False)}
+    assert got == {"MT-CH-001": (WRONG_LOCATION, 1), "XX-999": (UNKNOWN, 1), "LAB-AS-002": (MISSING, 0), "lab-as-001": (FOUND, 2)}
+    assert report["location"].tolist()[::2] == ["ห้อง 201", "ห้อง 101"]
+    assert report["rowid"].isna().tolist() == [False, True, False, False]
+    assert report["status"].tolist() == [WRONG_LOCATION, UNKNOWN, MISSING, FOUND]
+    assert asset_audit.counts(report) == {WRONG_LOCATION: 1, UNKNOWN: 1, MISSING: 1, FOUND: 1}
+
+
+def test_reconcile_without_location_only_checks_existence():
+    report = asset_audit.reconcile(sample_frame(), ["MT-CH-002", "nope"])
+    assert dict(zip(report["code"], report["status"])) == {"nope": UNKNOWN, "MT-CH-002": FOUND}
+
+
+def test_relocate_saves_wrong_location_rows_and_keeps_conflicts(db_path):
+    df = asset_data.load_data(db_path)
+    versions = asset_data.row_versions(df.index, db_path)
+    report = asset_audit.reconcile(df, ["LAB-AS-001", "MT-CH-001", "MT-CH-002"], "ห้อง 101")
+    rowid = {code: r for r, code in zip(df.index, df[COL_CODE])}
+    # มีคนย้าย MT-CH-002 ไปห้องอื่นระหว่างตรวจ → ต้องไม่ถูกเขียนทับ
+    asset_data.save_row(df, df.index.get_loc(rowid["MT-CH-002"]), {COL_LOC: "ห้อง 202"}, db_path=db_path)
+
+    result = asset_audit.relocate(df, report, "ห้อง 101", versions, user="auditor", db_path=db_path)
+    assert result["saved"] == [rowid["MT-CH-001"]]
+    assert list(result["conflicts"]) == [rowid["MT-CH-002"]]
+
+    locations = asset_data.load_data(db_path).set_index(COL_CODE)[COL_LOC]
+    assert (locations["MT-CH-001"], locations["MT-CH-002"]) == ("ห้อง 101", "ห้อง 202")
+    history = asset_data.load_history("MT-CH-001", db_path)
+    assert ((history["col"] == COL_LOC) & (history["user"] == "auditor")).any()
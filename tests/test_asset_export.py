@@ -0,0 +1,53 @@
+# tests/test_asset_export.py
+"""ส่งออกทีละก้อน: ผลต้องเหมือนกันไม่ว่าก้อนจะเล็กแค่ไหน และตามลำดับ positions"""
+import io
+import json
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+import asset_export
+from conftest import COL_CODE, COL_LOC, sample_frame
+
+
+def _frame():
+    df = sample_frame()
+    df["วันที่"] = pd.to_datetime(["2024-01-02", None, "2024-03-04", "2024-05-06", None])
+    df["ราคา"] = [1500, np.nan, 20, 3, 99]
+    return df
+
+
+def test_iter_csv_same_for_any_chunk_size():
+    df = _frame()
+    positions = np.array([4, 0, 2])
+    whole = b"".join(asset_export.iter_csv(df, positions, [COL_CODE, COL_LOC], chunk_rows=100))
+    chunks = list(asset_export.iter_csv(df, positions, [COL_CODE, COL_LOC], chunk_rows=1))
+
+    assert len(chunks) == 1 + len(positions)   # หัวตาราง + หนึ่งก้อนต่อแถว
+    assert b"".join(chunks) == whole
+    got = pd.read_csv(io.BytesIO(whole), encoding="utf-8-sig")
+    assert got.columns.tolist() == [COL_CODE, COL_LOC]
+    assert got[COL_CODE].tolist() == ["MT-CH-002", "LAB-AS-001", "LAB-AS-010"]
+
+
+def test_iter_jsonl_one_object_per_row():
+    df = _frame()
+    lines = b"".join(asset_export.iter_jsonl(df, chunk_rows=2)).decode("utf-8").splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [r[COL_CODE] for r in rows] == df[COL_CODE].tolist()
+    assert rows[0]["วันที่"] == "2024-01-02T00:00:00"
+    assert rows[1]["วันที่"] is None and rows[1]["ราคา"] is None
+
+
+def test_write_xlsx_chunked_matches_frame(tmp_path):
+    df = _frame()
+    path = asset_export.export(tmp_path / "out.xlsx", df, chunk_rows=2)
+    assert not path.with_name("out.xlsx.tmp").exists()
+
+    ws = load_workbook(path)[asset_export.SHEET_NAME]
+    rows = list(ws.iter_rows(values_only=True))
+    assert list(rows[0]) == [str(c) for c in df.columns]
+    assert [r[0] for r in rows[1:]] == df[COL_CODE].tolist()
+    assert rows[2][df.columns.get_loc("ราคา")] is None
+    assert rows[1][df.columns.get_loc("ราคา")] == 1500
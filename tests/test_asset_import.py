@@ -0,0 +1,53 @@
+# tests/test_asset_import.py
+"""นำเข้า/รวมไฟล์ตามรหัส: จัดกลุ่มเพิ่ม/เปลี่ยน/ไม่เปลี่ยน, --replace, ตรวจรหัสซ้ำ และนำเข้าซ้ำไม่เปลี่ยนอะไร"""
+import pytest
+
+import asset_data
+import asset_import
+from conftest import COL_CODE, COL_LOC, sample_frame
+
+
+def _write(df, path):
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+def test_import_classifies_and_merges(db_path, tmp_path):
+    incoming = sample_frame().iloc[:3].copy()
+    incoming.loc[incoming[COL_CODE] == "LAB-AS-002", COL_LOC] = "ห้อง 105"
+    incoming.loc[len(incoming)] = ["LAB-AS-011", "A-11", "ตู้เย็น", "ห้อง 102"]
+    result = asset_import.import_file(_write(incoming, tmp_path / "items.csv"), db_path=db_path)
+
+    assert result["codes"] == {"added": ["LAB-AS-011"], "changed": ["LAB-AS-002"], "removed": []}
+    assert (result["unchanged"], result["not_in_file"]) == (2, 2)
+    df = asset_data.load_data(db_path)
+    assert len(df) == 6   # รายการที่ไม่อยู่ในไฟล์คงไว้
+    assert df.loc[df[COL_CODE] == "LAB-AS-002", COL_LOC].item() == "ห้อง 105"
+
+
+def test_replace_removes_codes_not_in_file(db_path, tmp_path):
+    source = _write(sample_frame().iloc[:3], tmp_path / "all.csv")
+    result = asset_import.import_file(source, replace=True, db_path=db_path)
+    assert result["codes"]["removed"] == ["MT-CH-001", "MT-CH-002"]
+    assert asset_data.load_data(db_path)[COL_CODE].tolist() == ["LAB-AS-001", "LAB-AS-002", "LAB-AS-010"]
+
+
+def test_duplicate_codes_are_rejected(db_path, tmp_path):
+    incoming = sample_frame()
+    incoming.loc[len(incoming)] = ["LAB-AS-001", "A-99", "ซ้ำ", "ห้อง 101"]
+    before = asset_data.revision(db_path)
+    with pytest.raises(asset_import.ImportValidationError):
+        asset_import.import_file(_write(incoming, tmp_path / "dup.csv"), db_path=db_path)
+    assert asset_data.revision(db_path) == before
+
+
+def test_import_same_file_twice_is_noop(db_path, tmp_path):
+    incoming = sample_frame()
+    incoming.loc[len(incoming)] = ["LAB-AS-011", "A-11", "ตู้เย็น", "ห้อง 102"]
+    source = _write(incoming, tmp_path / "items.csv")
+
+    assert asset_import.import_file(source, db_path=db_path)["codes"]["added"] == ["LAB-AS-011"]
+    revision = asset_data.revision(db_path)
+    second = asset_import.import_file(source, db_path=db_path)
+    assert (len(second["added"]), second["changed"], second["unchanged"]) == (0, {}, len(incoming))
+    assert asset_data.revision(db_path) == revision
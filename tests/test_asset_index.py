@@ -0,0 +1,26 @@
+# tests/test_asset_index.py
+"""AssetIndex: หาแถวจากรหัส / AssetID และย้าย key เมื่อบันทึกแถว"""
+from asset_index import AssetIndex
+from conftest import COL_CODE, sample_frame
+
+
+def test_find_code_and_asset():
+    index = AssetIndex(sample_frame())
+    assert index.find_code(" LAB-AS-010 ") == 2   # ค่าจาก URL อาจมีช่องว่าง
+    assert index.find_asset("M-2") == 4
+    assert index.find_code("LAB-AS-999") is None
+
+
+def test_duplicates_point_to_first_row():
+    df = sample_frame()
+    df.loc[len(df)] = ["LAB-AS-001", "A-99", "ซ้ำ", "ห้อง 101"]
+    index = AssetIndex(df)
+    assert index.find_code("LAB-AS-001") == 0
+    assert index.duplicates() == {"LAB-AS-001": [0, len(df) - 1]}
+
+
+def test_update_row_moves_key():
+    index = AssetIndex(sample_frame())
+    index.update_row(1, {COL_CODE: "LAB-AS-002"}, {COL_CODE: "LAB-AS-020"})
+    assert index.find_code("LAB-AS-002") is None
+    assert index.find_code("LAB-AS-020") == 1
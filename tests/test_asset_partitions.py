@@ -0,0 +1,45 @@
+# tests/test_asset_partitions.py
+"""แบ่ง/รวม partition ไปกลับหลายรอบ แล้วข้อมูล/rowid/ประวัติยังถูกต้อง"""
+import asset_data
+import asset_partitions
+from conftest import COL_CODE, COL_LOC, sample_frame
+
+
+def _assert_rowids_in_partition(db_path):
+    partitions = asset_partitions.load_map(db_path)
+    df = asset_data.load_data(db_path)
+    for rowid, code in zip(df.index, df[COL_CODE]):
+        key = asset_partitions.partition_key(code)
+        assert partitions.path_for_rowid(rowid) == partitions.path(key)
+        assert rowid - partitions.rowid_base(key) < asset_partitions.SPAN
+
+
+def test_split_join_round_trip_keeps_routing(db_path):
+    expected = sample_frame().sort_values(COL_CODE, ignore_index=True)
+    for cycle in range(3):
+        partitions = asset_partitions.split(db_path)
+        assert partitions.keys() == ["LAB-AS", "MT-CH"]
+        _assert_rowids_in_partition(db_path)
+
+        # แก้แถวหลัง split → เขียนลง partition ของแถวนั้น และหา partition ได้จาก rowid
+        df = asset_data.load_data(db_path)
+        pos = df.index.get_loc(df.index[df[COL_CODE] == "MT-CH-002"][0])
+        asset_data.save_row(df, pos, {COL_LOC: f"ห้อง {300 + cycle}"}, db_path=db_path, user="test")
+        expected.loc[expected[COL_CODE] == "MT-CH-002", COL_LOC] = f"ห้อง {300 + cycle}"
+
+        assert asset_partitions.join(db_path) == len(expected)
+        assert asset_partitions.load_map(db_path) is None
+        df = asset_data.load_data(db_path)
+        assert (df.index < asset_partitions.SPAN).all()
+        got = df[expected.columns].sort_values(COL_CODE, ignore_index=True)
+        assert got.astype(str).equals(expected.astype(str))
+
+    history = asset_data.load_history("MT-CH-002", db_path)
+    assert (history["col"] == COL_LOC).sum() == 3
+
+
+def test_load_history_with_empty_manifest(db_path):
+    asset_partitions._write_manifest(db_path, {})
+    history = asset_data.load_history("LAB-AS-001", db_path)
+    assert history.empty
+    assert list(history.columns) == ["ts", "op", "row", "code", "col", "old", "new", "user"]
@@ -0,0 +1,52 @@
+# tests/test_asset_picker.py
+"""PrefixIndex / suggest: ต้นรหัสก่อน แล้วเติมจากดัชนีค้นหา กรองด้วย within ได้"""
+import asset_data
+from asset_picker import PrefixIndex, suggest
+from asset_search import SearchIndex
+from conftest import COL_CODE, COL_NAME, sample_frame
+
+
+def _frame():
+    df = sample_frame()
+    df.loc[len(df)] = ["ZZ-001", "Z-1", "ชุดสำรอง lab-as-0", "ห้อง 301"]
+    return df
+
+
+def test_complete_code_then_asset():
+    picker = PrefixIndex(sample_frame())
+    assert picker.complete(" LAB-AS-0") == [0, 1, 2]
+    assert picker.complete("lab-as-0", k=2) == [0, 1]
+    assert picker.complete("a-1") == [0, 2]            # AssetID A-1, A-10
+    assert picker.complete("lab", within={2, 4}) == [2]
+    assert picker.complete("xx") == []
+
+
+def test_update_row_matches_rebuild():
+    df = sample_frame()
+    picker = PrefixIndex(df)
+    old = df.iloc[4].to_dict()
+    df.iat[4, df.columns.get_loc(COL_CODE)] = "LAB-AS-003"
+    picker.update_row(4, old, {COL_CODE: "LAB-AS-003"})
+    for prefix in ("lab-as-00", "mt-ch", "m-", ""):
+        assert picker.complete(prefix) == PrefixIndex(df).complete(prefix)
+    assert picker.complete("lab-as-00") == [0, 1, 4]
+
+
+def test_suggest_prefix_first_then_search():
+    df = _frame()
+    picker, search = PrefixIndex(df), SearchIndex(df)
+    assert suggest(picker, search, "lab-as-0") == [0, 1, 2, 5]   # แถว 5 ตรงที่ชื่อ มาหลังต้นรหัส
+    assert suggest(picker, search, "lab-as-0", k=2) == [0, 1]
+    assert suggest(picker, search, "สำรอง") == [5]
+    assert suggest(picker, search, "lab-as-0", within=[5, 1]) == [1, 5]
+    assert suggest(picker, search, "", k=3) == [0, 1, 2]
+    assert suggest(picker, search, " ", within=[4, 3]) == [4, 3]
+
+
+def test_load_picker_follows_saved_rows(db_path):
+    picker = asset_data.load_picker(db_path)
+    df = asset_data.load_data(db_path)
+    asset_data.save_row(df, 3, {COL_CODE: "LAB-AS-011", COL_NAME: "ปิเปต"}, db_path=db_path)
+    assert asset_data.load_picker(db_path) is picker
+    codes = asset_data.load_data(db_path)[COL_CODE]
+    assert codes.iloc[picker.complete("lab-as-01")].tolist() == ["LAB-AS-010", "LAB-AS-011"]
@@ -0,0 +1,29 @@
+# tests/test_asset_search.py
+"""SearchIndex: ลำดับผลค้นหา, คำค้นหลายคำ/สั้น และการอัปเดตทีละแถวได้ผลเหมือนสร้างใหม่"""
+from asset_search import SearchIndex
+from conftest import COL_NAME, sample_frame
+
+
+def test_ranks_exact_then_prefix_then_contains():
+    df = sample_frame()
+    df.loc[len(df)] = ["XX-LAB-AS-001", "X-1", "อื่น ๆ", "ห้อง 101"]
+    index = SearchIndex(df)
+    assert index.search("lab-as-001")[:2] == [0, len(df) - 1]   # รหัสตรงทั้งหมดก่อน แล้วจึงรหัสที่มีข้อความนี้อยู่ข้างใน
+    assert index.search("lab-as-01") == [2]                      # ขึ้นต้นด้วย (LAB-AS-010)
+
+
+def test_all_terms_must_match_and_short_terms_work():
+    index = SearchIndex(sample_frame())
+    assert index.search("เครื่อง mt-ch") == [4]
+    assert index.search("m-") == [3, 4]   # สั้นกว่า trigram: ไล่ตรวจข้อความ
+    assert index.search("   ") == []
+
+
+def test_update_row_matches_rebuild():
+    df = sample_frame()
+    index = SearchIndex(df)
+    row = df.iloc[3].to_dict() | {COL_NAME: "ปิเปตอัตโนมัติ"}
+    index.update_row(3, row)
+    df.iloc[3] = list(row.values())
+    for query in ("ปิเปต", "อัตโนมัติ", "mt-ch", "ห้อง"):
+        assert index.search(query) == SearchIndex(df).search(query)
@@ -0,0 +1,47 @@
+# tests/test_asset_summary.py
+"""AssetSummary.update_row ต้องได้ตัวนับเท่ากับการสร้างใหม่จากตารางที่แก้แล้ว"""
+import asset_data
+from asset_summary import COL_IMAGE, COL_OWNER, AssetSummary
+from conftest import COL_CODE, COL_LOC, sample_frame
+
+
+def _state(summary):
+    return (
+        summary.total, summary.counts, summary.codes, summary.missing_code, summary.missing_photo,
+        {col: summary.table(col).to_dict("list") for col in summary.columns},
+    )
+
+
+def test_update_row_matches_rebuild():
+    df = sample_frame()
+    df[COL_OWNER] = ["สมชาย", "สมชาย", None, "สมหญิง", ""]
+    df[COL_IMAGE] = ["a.jpg", "", None, "b.jpg", "c.jpg"]
+    summary = AssetSummary(df)
+    summary.table(COL_LOC)   # ให้มีตารางที่จำไว้ก่อนแก้ ต้องคิดใหม่หลัง update_row
+
+    edits = [
+        (0, {COL_LOC: "ห้อง 102", COL_OWNER: ""}),
+        (2, {COL_OWNER: " สมหญิง ", COL_IMAGE: "d.jpg"}),
+        (3, {COL_CODE: "", COL_IMAGE: None}),
+        (4, {COL_CODE: "MT-CH-001", COL_LOC: None}),   # รหัสซ้ำกับแถวอื่น
+        (3, {COL_CODE: "MT-CH-003"}),
+    ]
+    for pos, new_values in edits:
+        old_values = df.iloc[pos].to_dict()
+        for col, value in new_values.items():
+            df.iat[pos, df.columns.get_loc(col)] = value
+        summary.update_row(pos, old_values, new_values)
+        assert _state(summary) == _state(AssetSummary(df))
+
+
+def test_save_row_keeps_cached_summary_in_sync(db_path):
+    summary = asset_data.load_summary(db_path)
+    df = asset_data.load_data(db_path)
+    pos = df.index.get_loc(df.index[df[COL_CODE] == "LAB-AS-001"][0])
+    asset_data.save_row(df, pos, {COL_LOC: "ห้อง 201", COL_CODE: ""}, db_path=db_path)
+
+    assert asset_data.load_summary(db_path) is summary
+    rebuilt = AssetSummary(asset_data.load_data(db_path))
+    assert summary.counts == rebuilt.counts
+    assert (summary.missing_code, summary.codes) == (1, rebuilt.codes)
+    assert summary.counts[COL_LOC]["ห้อง 201"] == 3
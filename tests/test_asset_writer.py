@@ -0,0 +1,66 @@
+# tests/test_asset_writer.py
+"""บันทึกผ่าน writer: ตรวจการแก้ชนกันในคอลัมน์เดียวกัน และรวมการแก้คนละคอลัมน์ของแถวเดียวกัน"""
+import pytest
+
+import asset_data
+from asset_db import ConflictError
+from conftest import COL_CODE, COL_LOC, COL_NAME
+
+
+def _pos(df, code):
+    return df.index.get_loc(df.index[df[COL_CODE] == code][0])
+
+
+def _values(df, code):
+    return df.loc[df[COL_CODE] == code].iloc[0]
+
+
+def test_save_row_updates_shared_data_and_history(db_path):
+    df = asset_data.load_data(db_path)
+    pos = _pos(df, "LAB-AS-001")
+    base = asset_data.edit_base(df, pos, db_path)
+    asset_data.save_row(df, pos, {COL_NAME: "กล้องจุลทรรศน์ใหม่"}, base=base, db_path=db_path, user="alice")
+
+    assert _values(asset_data.load_data(db_path), "LAB-AS-001")[COL_NAME] == "กล้องจุลทรรศน์ใหม่"
+    history = asset_data.load_history("LAB-AS-001", db_path)
+    assert ((history["col"] == COL_NAME) & (history["user"] == "alice")).any()
+
+
+def test_save_row_conflict_on_same_column(db_path):
+    df = asset_data.load_data(db_path)
+    pos = _pos(df, "LAB-AS-002")
+    base_a = asset_data.edit_base(df, pos, db_path)
+    base_b = asset_data.edit_base(df, pos, db_path)
+    asset_data.save_row(df, pos, {COL_NAME: "ของ B"}, base=base_b, db_path=db_path, user="b")
+
+    with pytest.raises(ConflictError):
+        asset_data.save_row(df, pos, {COL_NAME: "ของ A"}, base=base_a, db_path=db_path, user="a")
+    assert _values(asset_data.load_data(db_path), "LAB-AS-002")[COL_NAME] == "ของ B"
+
+
+def test_save_row_merges_edits_to_other_columns(db_path):
+    df = asset_data.load_data(db_path)
+    pos = _pos(df, "LAB-AS-010")
+    base_a = asset_data.edit_base(df, pos, db_path)
+    base_b = asset_data.edit_base(df, pos, db_path)
+    asset_data.save_row(df, pos, {COL_NAME: "ตู้อบลมร้อน"}, base=base_b, db_path=db_path, user="b")
+    # A เปิดฟอร์มก่อน B บันทึก แต่แก้คนละคอลัมน์ → บันทึกได้ และไม่ทับชื่อที่ B แก้
+    asset_data.save_row(df, pos, {COL_NAME: "ตู้อบ", COL_LOC: "ห้อง 103"}, base=base_a, db_path=db_path, user="a")
+
+    row = _values(asset_data.load_data(db_path), "LAB-AS-010")
+    assert (row[COL_NAME], row[COL_LOC]) == ("ตู้อบลมร้อน", "ห้อง 103")
+
+
+def test_save_rows_reports_conflicts_per_row(db_path):
+    df = asset_data.load_data(db_path)
+    rowids = df.index[:2].tolist()
+    base = df.loc[rowids, [COL_LOC]]
+    versions = asset_data.row_versions(rowids, db_path)
+    first = _pos(df, df.at[rowids[0], COL_CODE])
+    asset_data.save_row(df, first, {COL_LOC: "ห้องอื่น"}, db_path=db_path)
+
+    result = asset_data.save_rows({r: {COL_LOC: "ห้อง 999"} for r in rowids}, base, versions, db_path=db_path)
+    assert result["saved"] == [rowids[1]]
+    assert list(result["conflicts"]) == [rowids[0]]
+    locations = asset_data.load_data(db_path).loc[rowids, COL_LOC].tolist()
+    assert locations == ["ห้องอื่น", "ห้อง 999"]
@@ -0,0 +1,46 @@
+# tests/test_build_pages.py
+"""build_pages: เขียนเฉพาะหน้าที่เปลี่ยนตาม manifest และข้ามรหัสที่ไม่มีหน้า (ชื่อไฟล์ไม่ได้ / index / search)"""
+import json
+
+import pandas as pd
+
+import build_pages_and_qr as bq
+from conftest import COL_CODE, COL_NAME, sample_frame
+
+
+def test_pages_are_incremental(tmp_path):
+    out = tmp_path / "pages"
+    df = sample_frame()
+    first = bq.build_pages(df, out)
+    assert len(first["built"]) == len(df)
+    assert (out / "index.html").read_text(encoding="utf-8") == bq.INDEX_HTML
+
+    again = bq.build_pages(df, out)
+    assert (again["built"], again["unchanged"]) == ([], len(df))
+
+    df.loc[df[COL_CODE] == "LAB-AS-002", COL_NAME] = "เครื่องปั่นเหวี่ยงใหม่"
+    assert bq.build_pages(df, out)["built"] == ["LAB-AS-002"]
+    assert "เครื่องปั่นเหวี่ยงใหม่" in (out / "LAB-AS-002.html").read_text(encoding="utf-8")
+
+    pruned = bq.build_pages(df[df[COL_CODE] != "MT-CH-001"], out)
+    assert pruned["removed"] == ["MT-CH-001"]
+    assert not (out / "MT-CH-001.html").exists()
+
+
+def test_unsafe_and_reserved_codes_are_skipped(tmp_path):
+    out = tmp_path / "pages"
+    bad = ["A/B", "../escaped", "index", "Search"]
+    df = pd.concat([sample_frame(), pd.DataFrame({COL_CODE: bad, COL_NAME: "x"})], ignore_index=True)
+    summary = bq.build_pages(df, out)
+    assert summary["skipped"] == bad
+    assert (out / "index.html").read_text(encoding="utf-8") == bq.INDEX_HTML
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pages"]
+    codes = [row[0] for row in json.loads((out / "search.json").read_text(encoding="utf-8"))["rows"]]
+    assert codes == sample_frame()[COL_CODE].tolist()
+
+
+def test_qr_url_falls_back_for_codes_without_page(monkeypatch):
+    monkeypatch.setattr(bq, "BASE_URL", "https://scan.example.org/")
+    assert bq.qr_url("LAB-AS-001") == "https://scan.example.org/LAB-AS-001.html"
+    assert bq.qr_url("index").startswith(bq.STREAMLIT_URL)
+    assert bq.qr_url("A/B").startswith(bq.STREAMLIT_URL)
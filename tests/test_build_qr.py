@@ -0,0 +1,46 @@
+# tests/test_build_qr.py
+"""build_qr: สร้างเฉพาะรายการใหม่/เปลี่ยนตาม manifest และข้ามรหัสที่ใช้เป็นชื่อไฟล์ไม่ได้"""
+import build_pages_and_qr as bq
+
+
+def test_build_is_incremental(tmp_path):
+    out = tmp_path / "qrcodes"
+    codes = ["LAB-AS-001", "LAB-AS-002", "MT-CH-001"]
+    assert sorted(bq.build_qr(codes, out, jobs=1)["built"]) == sorted(codes)
+
+    again = bq.build_qr(codes, out, jobs=1)
+    assert (again["built"], again["unchanged"]) == ([], 3)
+
+    (out / "LAB-AS-002.png").unlink()   # ไฟล์หาย → สร้างใหม่เฉพาะไฟล์นั้น
+    assert bq.build_qr(codes, out, jobs=1)["built"] == ["LAB-AS-002"]
+
+    pruned = bq.build_qr(codes[:2], out, jobs=1)
+    assert pruned["removed"] == ["MT-CH-001"]
+    assert not (out / "MT-CH-001.png").exists()
+    assert set(bq.load_manifest(out)) == set(codes[:2])
+
+
+def test_url_change_rebuilds_everything(tmp_path, monkeypatch):
+    out = tmp_path / "qrcodes"
+    codes = ["LAB-AS-001", "LAB-AS-002"]
+    bq.build_qr(codes, out, jobs=1)
+    monkeypatch.setattr(bq, "BASE_URL", "https://scan.example.org/")
+    assert sorted(bq.build_qr(codes, out, jobs=1)["built"]) == codes
+
+
+def test_unsafe_codes_are_skipped(tmp_path):
+    out = tmp_path / "qrcodes"
+    bad = ["A/B", "../escaped", ".hidden", "C:D", "a\\b"]
+    summary = bq.build_qr(bad + ["LAB-AS-001"], out, jobs=1)
+    assert summary["built"] == ["LAB-AS-001"]
+    assert summary["skipped"] == bad
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["qrcodes"]
+    assert sorted(p.name for p in out.glob("*.png")) == ["LAB-AS-001.png"]
+    assert bq.remove_qr(bad, out) == []
+
+
+def test_file_stem():
+    assert bq.file_stem("LAB-AS-001") == "LAB-AS-001"
+    assert bq.file_stem("ตู้อบ 01") == "ตู้อบ 01"
+    for code in ("", None, " X", "..", "../x", "A/B", "x" * 300):
+        assert bq.file_stem(code) is None
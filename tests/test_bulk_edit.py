@@ -0,0 +1,35 @@
+# tests/test_bulk_edit.py
+"""แก้หลายแถวในตาราง: diff_frames หาเฉพาะช่องที่เปลี่ยนจริง แล้ว save_rows เขียนใน transaction เดียว"""
+import numpy as np
+import pandas as pd
+
+import asset_data
+from conftest import COL_LOC, COL_NAME
+
+
+def test_diff_frames_ignores_invisible_changes():
+    original = pd.DataFrame({"x": [5, None, "", np.nan, "a"]})
+    edited = pd.DataFrame({"x": [5.0, "", None, "", "b"]})
+    assert asset_data.diff_frames(original, edited) == {4: {"x": "b"}}
+
+
+def test_diff_frames_reports_changed_cells_only(db_path):
+    df = asset_data.load_data(db_path)
+    edited = asset_data.editable_frame(df)
+    edited.iloc[0, edited.columns.get_loc(COL_LOC)] = "ห้อง 9"
+    edited.iloc[3, edited.columns.get_loc(COL_NAME)] = "ปิเปตใหม่"
+    assert asset_data.diff_frames(df, edited) == {
+        df.index[0]: {COL_LOC: "ห้อง 9"},
+        df.index[3]: {COL_NAME: "ปิเปตใหม่"},
+    }
+
+
+def test_save_rows_is_one_transaction(db_path):
+    df = asset_data.load_data(db_path)
+    changes = {rowid: {COL_LOC: "ห้องรวม"} for rowid in df.index}
+    before = asset_data.revision(db_path)
+    result = asset_data.save_rows(changes, df, asset_data.row_versions(df.index, db_path), db_path=db_path)
+
+    assert sorted(result["saved"]) == sorted(df.index) and result["conflicts"] == {}
+    assert asset_data.revision(db_path) == before + 1   # ทุกแถวใน commit เดียว
+    assert (asset_data.load_data(db_path)[COL_LOC] == "ห้องรวม").all()
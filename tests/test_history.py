@@ -0,0 +1,60 @@
+# tests/test_history.py
+"""ประวัติแบบต่อท้าย: ย้อนดูข้อมูล ณ เวลาใดก็ได้ (state_as_of) และส่งออก Excel --as-of"""
+import datetime as dt
+import time
+
+import pandas as pd
+import pytest
+
+import asset_data
+import asset_db
+from conftest import COL_CODE, COL_LOC, COL_NAME, sample_frame
+
+
+def _tick():
+    """เวลาระหว่างการบันทึกสองครั้ง (ให้ ts ของประวัติอยู่คนละฝั่งแน่นอน)"""
+    time.sleep(0.02)
+    when = time.time()
+    time.sleep(0.02)
+    return when
+
+
+def _rows(df):
+    return df[sample_frame().columns].sort_values(COL_CODE, ignore_index=True).astype(str)
+
+
+def test_state_as_of_rewinds_updates_inserts_and_deletes(db_path):
+    t0 = _tick()
+    df = asset_data.load_data(db_path)
+    asset_data.save_row(df, 0, {COL_NAME: "ชื่อใหม่"}, db_path=db_path, user="a")
+    t1 = _tick()
+    df = asset_data.load_data(db_path)
+    asset_data.save_row(df, 0, {COL_NAME: "ชื่อล่าสุด", COL_LOC: "ห้อง 9"}, db_path=db_path, user="b")
+    added = pd.DataFrame([["LAB-AS-011", "A-11", "ตู้เย็น", "ห้อง 102"]], columns=sample_frame().columns)
+    with asset_data.store_lock(db_path):
+        asset_data.apply_import(added, deletes=[df.index[4]], db_path=db_path)
+
+    assert _rows(asset_data.state_as_of(t0, db_path)).equals(_rows(sample_frame()))
+    at_t1 = asset_data.state_as_of(t1, db_path)
+    first = at_t1[at_t1[COL_CODE] == "LAB-AS-001"].iloc[0]
+    assert (first[COL_NAME], first[COL_LOC]) == ("ชื่อใหม่", "ห้อง 101")
+    assert "MT-CH-002" in set(at_t1[COL_CODE]) and "LAB-AS-011" not in set(at_t1[COL_CODE])
+
+    history = asset_data.load_history("LAB-AS-001", db_path)
+    assert history.loc[history["col"] == COL_NAME, "new"].tolist() == ["ชื่อล่าสุด", "ชื่อใหม่"]   # ใหม่สุดก่อน
+
+
+def test_state_before_full_import_is_refused(db_path):
+    with pytest.raises(ValueError):
+        asset_data.state_as_of(time.time() - 3600, db_path)
+
+
+def test_export_as_of_cli(db_path, tmp_path):
+    t0 = _tick()
+    df = asset_data.load_data(db_path)
+    asset_data.save_row(df, 1, {COL_LOC: "ห้อง 9"}, db_path=db_path)
+    out = tmp_path / "old.xlsx"
+    asset_db.main(["export", str(out), "--db", str(db_path), "--as-of", dt.datetime.fromtimestamp(t0).isoformat()])
+    assert _rows(pd.read_excel(out)).equals(_rows(sample_frame()))
+    asset_db.main(["export", str(out), "--db", str(db_path)])
+    assert "ห้อง 9" in set(pd.read_excel(out)[COL_LOC])
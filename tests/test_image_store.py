@@ -0,0 +1,56 @@
+# tests/test_image_store.py
+"""resolve() อ่านได้เฉพาะไฟล์รูปภายในโฟลเดอร์รูป (ค่าในคอลัมน์รูปภาพแก้ได้จากฟอร์ม)"""
+import io
+
+import pytest
+from PIL import Image
+
+import image_store
+
+
+@pytest.fixture
+def image_dir(tmp_path, monkeypatch):
+    folder = tmp_path / "asset_images"
+    folder.mkdir()
+    monkeypatch.setattr(image_store, "IMAGE_DIRS", (folder,))
+    monkeypatch.setattr(image_store, "THUMB_CACHE_DIR", folder / ".thumbs")
+    return folder
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 30), "red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_resolve_accepts_ingested_image(image_dir):
+    value = image_store.ingest(_png(), image_dir)
+    path = image_store.resolve(value)
+    assert path is not None and path.is_relative_to(image_dir)
+    thumb = image_store.thumbnail(value)
+    assert thumb is not None and thumb.name.endswith(image_store.THUMB_SUFFIX)
+
+
+@pytest.mark.parametrize("value", [
+    "", None, "/etc/passwd", "../.env.ini", ".env.ini", "asset_images/../README.txt",
+])
+def test_resolve_rejects_paths_outside_image_dirs(image_dir, value):
+    assert image_store.resolve(value) is None
+
+
+def test_resolve_rejects_traversal_and_symlink_escape(image_dir, tmp_path):
+    outside = tmp_path / "secret.jpg"
+    outside.write_bytes(_png())
+    assert image_store.resolve(str(image_dir / ".." / "secret.jpg")) is None
+    (image_dir / "link.jpg").symlink_to(outside)
+    assert image_store.resolve(str(image_dir / "link.jpg")) is None
+
+
+def test_resolve_rejects_non_image_inside_image_dir(image_dir):
+    (image_dir / "notes.txt").write_text("x")
+    assert image_store.resolve(str(image_dir / "notes.txt")) is None
+
+
+def test_thumbnail_is_none_for_undecodable_file(image_dir):
+    (image_dir / "broken.jpg").write_bytes(b"not an image")
+    assert image_store.thumbnail(str(image_dir / "broken.jpg")) is None
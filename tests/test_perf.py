@@ -0,0 +1,39 @@
+# tests/test_perf.py
+"""perf: จับเวลาต่อ rerun และเขียนไฟล์ metrics ตาม PERF_METRICS_FILE ที่ตั้งหลัง import ก็ได้"""
+import json
+
+import perf
+
+
+def _rerun(page):
+    perf.begin(page)
+    with perf.timer("load"):
+        pass
+    perf.end()
+
+
+def test_end_appends_jsonl_from_env(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setenv("PERF_METRICS_FILE", str(path))
+    _rerun("test_jsonl")
+    _rerun("test_jsonl")
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["page"] for line in lines] == ["test_jsonl", "test_jsonl"]
+    assert "load" in lines[0]["steps"]
+    table = perf.summary("test_jsonl")
+    assert set(table["ขั้นตอน"]) == {"load", "rerun"}
+
+
+def test_end_writes_prometheus(tmp_path, monkeypatch):
+    path = tmp_path / "smart_asset.prom"
+    monkeypatch.setenv("PERF_METRICS_FILE", str(path))
+    _rerun("test_prom")
+    text = path.read_text(encoding="utf-8")
+    assert 'smart_asset_step_seconds_count{page="test_prom",step="rerun"} 1' in text
+
+
+def test_no_file_without_env(tmp_path, monkeypatch):
+    monkeypatch.delenv("PERF_METRICS_FILE", raising=False)
+    monkeypatch.chdir(tmp_path)
+    _rerun("test_off")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,26 @@
+# tests/test_qr_render.py
+"""qr_image: ใช้ไฟล์ใน qr_dir ที่ยังตรงกับ URL, เขียนกลับพร้อม manifest และไม่เขียนนอก qr_dir"""
+import build_pages_and_qr as bq
+import qr_render
+
+
+def test_write_back_then_serve_file(tmp_path):
+    out = tmp_path / "qrcodes"
+    url = bq.qr_url("LAB-AS-001")
+    png, source = qr_render.qr_image("LAB-AS-001", url, out, write_back=True)
+    assert source == "memory" and png.startswith(b"\x89PNG")
+    assert bq.load_manifest(out)["LAB-AS-001"]["file"] == "LAB-AS-001.png"
+
+    path, source = qr_render.qr_image("LAB-AS-001", url, out)
+    assert (path, source) == (str(out / "LAB-AS-001.png"), "file")
+    # URL เปลี่ยน → ไฟล์เดิมใช้ไม่ได้
+    assert qr_render.qr_image("LAB-AS-001", url + "&v=2", out)[1] == "memory"
+
+
+def test_unsafe_code_is_never_written(tmp_path):
+    out = tmp_path / "qrcodes"
+    for code in ("../escaped", "A/B", ".manifest"):
+        png, source = qr_render.qr_image(code, bq.qr_url(code), out, write_back=True)
+        assert source == "memory" and png.startswith(b"\x89PNG")
+    assert not (tmp_path / "escaped.png").exists()
+    assert not out.exists() or not any(out.iterdir())
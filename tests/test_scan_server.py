@@ -0,0 +1,69 @@
+# tests/test_scan_server.py
+"""scan_server: หน้ารายละเอียด / search.json ตอบ 304 เมื่อ ETag ตรง และได้ฉบับใหม่หลังบันทึก"""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import asset_data
+import scan_server
+from conftest import COL_CODE, COL_LOC
+
+
+@pytest.fixture
+def server(db_path):
+    srv = scan_server.make_server("127.0.0.1", 0, db_path)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _get(url, etag=None):
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_detail_page_etag(server, db_path):
+    status, headers, body = _get(server + "/LAB-AS-001.html")
+    assert status == 200 and "LAB-AS-001" in body.decode("utf-8")
+    etag = headers["ETag"]
+    assert _get(server + "/?code=LAB-AS-001", etag)[0] == 304
+    assert _get(server + "/LAB-AS-001.html", "W/" + etag)[0] == 304
+
+    df = asset_data.load_data(db_path)
+    pos = df.index.get_loc(df.index[df[COL_CODE] == "LAB-AS-001"][0])
+    asset_data.save_row(df, pos, {COL_LOC: "ห้อง 9"}, db_path=db_path)
+    status, headers, body = _get(server + "/LAB-AS-001.html", etag)
+    assert status == 200 and headers["ETag"] != etag and "ห้อง 9" in body.decode("utf-8")
+
+
+def test_search_json_etag_follows_revision(server, db_path):
+    status, headers, body = _get(server + "/search.json")
+    assert status == 200
+    assert [row[0] for row in json.loads(body)["rows"]][:2] == ["LAB-AS-001", "LAB-AS-002"]
+    etag = headers["ETag"]
+    assert _get(server + "/search.json", etag)[0] == 304
+
+    df = asset_data.load_data(db_path)
+    asset_data.save_row(df, 0, {COL_CODE: "LAB-AS-100"}, db_path=db_path)
+    status, headers, body = _get(server + "/search.json", etag)
+    assert status == 200 and "LAB-AS-100" in body.decode("utf-8")
+
+
+def test_index_html_etag(server):
+    status, headers, _ = _get(server + "/index.html")
+    assert status == 200
+    assert _get(server + "/index.html", headers["ETag"])[0] == 304
+
+
+def test_unknown_code_and_image_are_404(server):
+    assert _get(server + "/NOPE-1.html")[0] == 404
+    assert _get(server + "/image?code=LAB-AS-001")[0] == 404   # ไม่มีรูป
+    assert _get(server + "/../.env.ini")[0] == 404